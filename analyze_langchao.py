@@ -2,6 +2,8 @@
 # analyze_langchao.py - 浪潮信息趋势分析脚本
 import sys
 import os
+import functools
+import io
 sys.path.insert(0, os.path.dirname(__file__))
 
 from datetime import datetime
@@ -19,35 +21,39 @@ def analyze_stock(stock_code: str = "000977.SZ"):
     """分析股票趋势"""
     print(f"\n{'='*60}")
     print(f"浪潮信息({stock_code})综合趋势分析")
-    print(f"{'='*60}\n")
+    print(f"{'='*60}\n", flush=True)
+
+    # Buffer the report and write it in one go once all sections are ready
+    buf = io.StringIO()
+    out = functools.partial(print, file=buf)
 
     # 1. 获取实时行情
-    print("【实时行情】")
+    out("【实时行情】")
     sina = fetch_sina_realtime_sync(stock_code)
     if sina:
-        print(f"  股票名称: {sina['company_name']}")
-        print(f"  当前价格: ¥{sina['current_price']:.2f}")
-        print(f"  昨日收盘: ¥{sina['previous_close']:.2f}")
+        out(f"  股票名称: {sina['company_name']}")
+        out(f"  当前价格: ¥{sina['current_price']:.2f}")
+        out(f"  昨日收盘: ¥{sina['previous_close']:.2f}")
         change_pct = ((sina['current_price'] - sina['previous_close']) / sina['previous_close'] * 100) if sina['previous_close'] else 0
-        print(f"  涨跌幅: {change_pct:+.2f}%")
-        print(f"  今日开盘: ¥{sina['open_price']:.2f}")
-        print(f"  最高价: ¥{sina['high_price']:.2f}")
-        print(f"  最低价: ¥{sina['low_price']:.2f}")
-        print(f"  成交量: {sina['volume']:,}手")
-        print(f"  成交额: ¥{sina['turnover']/100000000:.2f}亿")
+        out(f"  涨跌幅: {change_pct:+.2f}%")
+        out(f"  今日开盘: ¥{sina['open_price']:.2f}")
+        out(f"  最高价: ¥{sina['high_price']:.2f}")
+        out(f"  最低价: ¥{sina['low_price']:.2f}")
+        out(f"  成交量: {sina['volume']:,}手")
+        out(f"  成交额: ¥{sina['turnover']/100000000:.2f}亿")
         current_price = sina['current_price']
         company_name = sina['company_name']
     else:
-        print("  ⚠️  实时行情获取失败")
+        out("  ⚠️  实时行情获取失败")
         current_price = None
         company_name = stock_code
 
     # 2. 获取历史数据并计算技术指标
-    print(f"\n【技术分析】(基于120日历史数据)")
+    out(f"\n【技术分析】(基于120日历史数据)")
     hist = fetch_history_df(stock_code, days=120)
     if hist is not None and not hist.empty:
-        print(f"  数据范围: {hist['date'].iloc[0]} ~ {hist['date'].iloc[-1]}")
-        print(f"  数据点数: {len(hist)}个交易日")
+        out(f"  数据范围: {hist['date'].iloc[0]} ~ {hist['date'].iloc[-1]}")
+        out(f"  数据点数: {len(hist)}个交易日")
 
         # 计算技术指标
         inds = compute_indicators(hist)
@@ -56,13 +62,13 @@ def analyze_stock(stock_code: str = "000977.SZ"):
         if current_price is None and 'close' in hist.columns:
             current_price = float(hist['close'].iloc[-1])
 
-        print(f"\n  移动平均线:")
+        out(f"\n  移动平均线:")
         ma5 = inds.get('ma5')
         ma20 = inds.get('ma20')
         ma60 = inds.get('ma60')
-        if ma5: print(f"    MA5:  ¥{ma5:.2f}")
-        if ma20: print(f"    MA20: ¥{ma20:.2f}")
-        if ma60: print(f"    MA60: ¥{ma60:.2f}")
+        if ma5: out(f"    MA5:  ¥{ma5:.2f}")
+        if ma20: out(f"    MA20: ¥{ma20:.2f}")
+        if ma60: out(f"    MA60: ¥{ma60:.2f}")
 
         # 趋势判断
         trend = "中性"
@@ -79,39 +85,39 @@ def analyze_stock(stock_code: str = "000977.SZ"):
             else:
                 trend = "震荡偏弱"
 
-        print(f"\n  趋势判断: {trend}")
+        out(f"\n  趋势判断: {trend}")
         if trend_desc:
             for desc in trend_desc:
-                print(f"    • {desc}")
+                out(f"    • {desc}")
 
         # RSI指标
         rsi = inds.get('rsi14')
         if rsi:
-            print(f"\n  RSI(14): {rsi:.2f}")
+            out(f"\n  RSI(14): {rsi:.2f}")
             if rsi > 70:
-                print(f"    → 超买区域,有回调风险")
+                out(f"    → 超买区域,有回调风险")
             elif rsi < 30:
-                print(f"    → 超卖区域,可能反弹")
+                out(f"    → 超卖区域,可能反弹")
             elif 40 <= rsi <= 60:
-                print(f"    → 中性区域")
+                out(f"    → 中性区域")
             else:
-                print(f"    → 正常波动范围")
+                out(f"    → 正常波动范围")
 
         # MACD指标
         macd = inds.get('macd')
         macd_signal = inds.get('macd_signal')
         macd_hist = inds.get('macd_hist')
         if macd is not None and macd_signal is not None:
-            print(f"\n  MACD指标:")
-            print(f"    MACD线: {macd:.4f}")
-            print(f"    信号线: {macd_signal:.4f}")
-            print(f"    柱状图: {macd_hist:.4f}")
+            out(f"\n  MACD指标:")
+            out(f"    MACD线: {macd:.4f}")
+            out(f"    信号线: {macd_signal:.4f}")
+            out(f"    柱状图: {macd_hist:.4f}")
             if macd > macd_signal:
-                print(f"    → 多头信号(MACD在信号线上方)")
+                out(f"    → 多头信号(MACD在信号线上方)")
             else:
-                print(f"    → 空头信号(MACD在信号线下方)")
+                out(f"    → 空头信号(MACD在信号线下方)")
             if abs(macd_hist) < 0.05:
-                print(f"    → 即将金叉/死叉,注意方向变化")
+                out(f"    → 即将金叉/死叉,注意方向变化")
 
         # 支撑与压力位
         if current_price:
@@ -119,16 +125,16 @@ def analyze_stock(stock_code: str = "000977.SZ"):
             support2 = current_price * 0.90
             resistance1 = current_price * 1.05
             resistance2 = current_price * 1.10
-            print(f"\n  支撑与压力位:")
-            print(f"    支撑1: ¥{support1:.2f} (-5%)")
-            print(f"    支撑2: ¥{support2:.2f} (-10%)")
-            print(f"    压力1: ¥{resistance1:.2f} (+5%)")
-            print(f"    压力2: ¥{resistance2:.2f} (+10%)")
+            out(f"\n  支撑与压力位:")
+            out(f"    支撑1: ¥{support1:.2f} (-5%)")
+            out(f"    支撑2: ¥{support2:.2f} (-10%)")
+            out(f"    压力1: ¥{resistance1:.2f} (+5%)")
+            out(f"    压力2: ¥{resistance2:.2f} (+10%)")
     else:
-        print("  ⚠️  历史数据获取失败")
+        out("  ⚠️  历史数据获取失败")
 
     # 3. 基本面分析
-    print(f"\n【基本面分析】")
+    out(f"\n【基本面分析】")
     fundamentals = fundamental_data_provider.get_fundamental_analysis(
         stock_code, price_hint=current_price
     )
@@ -137,54 +143,54 @@ def analyze_stock(stock_code: str = "000977.SZ"):
         profitability = fundamentals.get('profitability', {})
         growth = fundamentals.get('growth', {})
 
-        print(f"  估值指标:")
+        out(f"  估值指标:")
         if valuation.get('pe_ratio'):
-            print(f"    市盈率(PE): {valuation['pe_ratio']:.2f}")
+            out(f"    市盈率(PE): {valuation['pe_ratio']:.2f}")
         if valuation.get('pb_ratio'):
-            print(f"    市净率(PB): {valuation['pb_ratio']:.2f}")
+            out(f"    市净率(PB): {valuation['pb_ratio']:.2f}")
         if valuation.get('ps_ratio'):
-            print(f"    市销率(PS): {valuation['ps_ratio']:.2f}")
+            out(f"    市销率(PS): {valuation['ps_ratio']:.2f}")
 
-        print(f"\n  盈利能力:")
+        out(f"\n  盈利能力:")
         if profitability.get('roe'):
-            print(f"    净资产收益率(ROE): {profitability['roe']*100:.2f}%")
+            out(f"    净资产收益率(ROE): {profitability['roe']*100:.2f}%")
         if profitability.get('net_margin'):
-            print(f"    净利润率: {profitability['net_margin']*100:.2f}%")
+            out(f"    净利润率: {profitability['net_margin']*100:.2f}%")
         if profitability.get('gross_margin'):
-            print(f"    毛利率: {profitability['gross_margin']*100:.2f}%")
+            out(f"    毛利率: {profitability['gross_margin']*100:.2f}%")
 
-        print(f"\n  成长性:")
+        out(f"\n  成长性:")
         if growth.get('revenue_growth'):
-            print(f"    营收增长率: {growth['revenue_growth']*100:+.2f}%")
+            out(f"    营收增长率: {growth['revenue_growth']*100:+.2f}%")
         if growth.get('profit_growth'):
-            print(f"    净利润增长率: {growth['profit_growth']*100:+.2f}%")
+            out(f"    净利润增长率: {growth['profit_growth']*100:+.2f}%")
     else:
-        print("  ⚠️  基本面数据未接入")
+        out("  ⚠️  基本面数据未接入")
 
     # 4. 市场情绪
-    print(f"\n【市场情绪】")
+    out(f"\n【市场情绪】")
     sentiment = sentiment_data_provider.get_sentiment_analysis(stock_code)
     if sentiment and not sentiment.get('degraded'):
         overall = sentiment.get('overall_sentiment')
         if overall is not None:
             sentiment_label = "积极" if overall > 0.6 else "中性" if overall > 0.4 else "消极"
-            print(f"  综合情绪: {sentiment_label} ({overall:.2f})")
+            out(f"  综合情绪: {sentiment_label} ({overall:.2f})")
 
         news = sentiment.get('news_sentiment')
         social = sentiment.get('social_sentiment')
         if news and isinstance(news, (int, float)):
-            print(f"  新闻舆论: {news:.2f}")
+            out(f"  新闻舆论: {news:.2f}")
         if social and isinstance(social, (int, float)):
-            print(f"  社交媒体: {social:.2f}")
+            out(f"  社交媒体: {social:.2f}")
 
         keywords = sentiment.get('keywords', [])
         if keywords:
-            print(f"  热门关键词: {', '.join(keywords[:5])}")
+            out(f"  热门关键词: {', '.join(keywords[:5])}")
     else:
-        print("  ⚠️  情绪数据未接入")
+        out("  ⚠️  情绪数据未接入")
 
     # 5. 综合评分与建议
-    print(f"\n【综合评分与建议】")
+    out(f"\n【综合评分与建议】")
 
     # 技术评分
     tech_score = 5.0
@@ -205,7 +211,7 @@ def analyze_stock(stock_code: str = "000977.SZ"):
             elif macd < macd_signal and macd < 0:
                 tech_score -= 0.5
 
-    print(f"  技术面评分: {tech_score:.1f}/10")
+    out(f"  技术面评分: {tech_score:.1f}/10")
 
     # 基本面评分
     if fundamentals and not fundamentals.get('degraded'):
@@ -230,19 +236,19 @@ def analyze_stock(stock_code: str = "000977.SZ"):
             fund_score += max(-1.0, min(1.5, revenue_growth * 10))
 
         fund_score = round(min(max(fund_score, 0.0), 10.0), 1)
-        print(f"  基本面评分: {fund_score:.1f}/10")
+        out(f"  基本面评分: {fund_score:.1f}/10")
     else:
         fund_score = None
-        print(f"  基本面评分: 未接入数据")
+        out(f"  基本面评分: 未接入数据")
 
     # 情绪评分
     if sentiment and not sentiment.get('degraded'):
         overall = sentiment.get('overall_sentiment')
         sent_score = round(overall * 10, 1) if overall else 5.0
-        print(f"  市场情绪评分: {sent_score:.1f}/10")
+        out(f"  市场情绪评分: {sent_score:.1f}/10")
     else:
         sent_score = None
-        print(f"  市场情绪评分: 未接入数据")
+        out(f"  市场情绪评分: 未接入数据")
 
     # 综合评分
     scores = [tech_score]
@@ -252,7 +258,7 @@ def analyze_stock(stock_code: str = "000977.SZ"):
         scores.append(sent_score)
 
     final_score = sum(scores) / len(scores)
-    print(f"\n  🎯 综合评分: {final_score:.1f}/10")
+    out(f"\n  🎯 综合评分: {final_score:.1f}/10")
 
     # 投资建议
     if final_score >= 7:
@@ -268,13 +274,14 @@ def analyze_stock(stock_code: str = "000977.SZ"):
         risk = "高风险"
         color = "🔴"
 
-    print(f"  {color} 投资建议: {action}")
-    print(f"  风险等级: {risk}")
-    print(f"  置信度: {min(1.0, final_score/10.0):.0%}")
+    out(f"  {color} 投资建议: {action}")
+    out(f"  风险等级: {risk}")
+    out(f"  置信度: {min(1.0, final_score/10.0):.0%}")
 
-    print(f"\n{'='*60}")
-    print(f"分析时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"{'='*60}\n")
+    out(f"\n{'='*60}")
+    out(f"分析时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    out(f"{'='*60}\n")
+    sys.stdout.write(buf.getvalue())
 
 if __name__ == "__main__":
     analyze_stock("000977.SZ")
@@ -4,15 +4,21 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(__file__))
 
+import asyncio
+import functools
+import io
+import statistics
+from collections import Counter
 from datetime import datetime
-from src.api.stock_api import (
-    fetch_sina_realtime_sync,
-    fetch_history_df,
-    compute_indicators,
-)
-from src.services.fundamental_provider import fundamental_data_provider
-from src.services.sentiment_provider import sentiment_data_provider
-import pandas as pd
+from operator import itemgetter
+
+# Indicators read by quick_analyze_stock_async
+QUICK_INDICATORS = frozenset({'ma5', 'ma20', 'rsi14', 'macd'})
+
+# Seconds allowed per stock for fetching and for the whole sector scan; each
+# stock also gets the Guba throttle's max_crawl_wait on top of STOCK_TIMEOUT
+STOCK_TIMEOUT = 10
+SCAN_TIMEOUT = 15
 
 # Define non-ferrous metals sector stocks
 NONFERROUS_STOCKS = {
@@ -30,27 +36,36 @@ NONFERROUS_STOCKS = {
     '000807.SZ': '云铝股份',  # 铝
 }
 
-def quick_analyze_stock(stock_code: str, stock_name: str):
-    """Quick analysis for single stock"""
-    result = {
-        'code': stock_code,
-        'name': stock_name,
-        'price': None,
-        'change_pct': None,
-        'tech_score': 5.0,
-        'fund_score': None,
-        'sentiment_score': None,
-        'final_score': 5.0,
-        'recommendation': '观望',
-        'trend': '中性',
-        'rsi': None,
-        'volume': None,
-        'error': None
+def _empty_result(stock_code: str, stock_name: str, error=None):
+    """Default result, returned as-is when an analysis step fails"""
+    return {
+        'code': stock_code, 'name': stock_name, 'price': None, 'change_pct': None,
+        'tech_score': 5.0, 'fund_score': None, 'sentiment_score': None,
+        'final_score': 5.0, 'recommendation': '观望', 'trend': '中性',
+        'rsi': None, 'volume': None, 'error': error,
     }
 
+async def quick_analyze_stock_async(stock_code: str, stock_name: str):
+    """Quick analysis for single stock
+
+    Blocking provider calls run in worker threads; once the realtime quote is
+    in, history, fundamentals and sentiment are fetched concurrently.
+    """
+    # Deferred so the script starts without loading the API/provider stack
+    from src.api.stock_api import (
+        fetch_sina_realtime_sync,
+        fetch_history_arrays,
+        compute_indicators,
+    )
+    from src.services.fundamental_provider import fundamental_data_provider
+    from src.services.sentiment_provider import sentiment_data_provider
+    from src.services.stock_scoring import score_stock
+
+    result = _empty_result(stock_code, stock_name)
+
     try:
         # Get real-time data
-        sina = fetch_sina_realtime_sync(stock_code)
+        sina = await asyncio.to_thread(fetch_sina_realtime_sync, stock_code)
         if not sina:
             result['error'] = '实时数据获取失败'
             return result
@@ -59,113 +74,128 @@ def quick_analyze_stock(stock_code: str, stock_name: str):
         result['volume'] = sina['volume']
         change_pct = ((sina['current_price'] - sina['previous_close']) / sina['previous_close'] * 100) if sina['previous_close'] else 0
         result['change_pct'] = change_pct
+        current_price = sina['current_price']
+
+        # History, fundamentals and sentiment are independent of each other
+        hist, fundamentals, sentiment = await asyncio.gather(
+            asyncio.to_thread(fetch_history_arrays, stock_code, days=120),
+            asyncio.to_thread(
+                fundamental_data_provider.get_fundamental_analysis,
+                stock_code, price_hint=current_price
+            ),
+            asyncio.to_thread(sentiment_data_provider.get_sentiment_analysis, stock_code),
+        )
 
-        # Get historical data and compute indicators
-        hist = fetch_history_df(stock_code, days=120)
+        # Compute indicators from historical data
         if hist is None or hist.empty:
             result['error'] = '历史数据获取失败'
             return result
 
-        inds = compute_indicators(hist)
-        current_price = sina['current_price']
+        inds = compute_indicators(hist, indicators=QUICK_INDICATORS)
+        result['rsi'] = inds.get('rsi14')
 
-        # Extract key indicators
-        ma5 = inds.get('ma5')
-        ma20 = inds.get('ma20')
-        ma60 = inds.get('ma60')
-        rsi = inds.get('rsi14')
-        macd = inds.get('macd')
-        macd_signal = inds.get('macd_signal')
-
-        result['rsi'] = rsi
-
-        # Trend analysis
-        trend = "中性"
-        if current_price and ma5 and ma20:
-            if current_price > ma5 > ma20:
-                trend = "多头排列"
-            elif current_price < ma5 < ma20:
-                trend = "空头排列"
-            elif current_price > ma20:
-                trend = "震荡偏强"
-            else:
-                trend = "震荡偏弱"
-        result['trend'] = trend
-
-        # Technical score
-        tech_score = 5.0
-        if trend == "多头排列":
-            tech_score = 7.5 if (rsi and rsi < 70) else 6.5
-        elif trend == "震荡偏强":
-            tech_score = 6.0
-        elif trend == "震荡偏弱":
-            tech_score = 4.5
-        elif trend == "空头排列":
-            tech_score = 3.0 if (rsi and rsi < 30) else 2.5
-
-        if macd and macd_signal:
-            if macd > macd_signal and macd > 0:
-                tech_score += 0.5
-            elif macd < macd_signal and macd < 0:
-                tech_score -= 0.5
-
-        result['tech_score'] = round(tech_score, 1)
-
-        # Fundamental score
-        fundamentals = fundamental_data_provider.get_fundamental_analysis(
-            stock_code, price_hint=current_price
-        )
-        if fundamentals and not fundamentals.get('degraded'):
-            fund_score = 5.0
-            valuation = fundamentals.get('valuation', {})
-            profitability = fundamentals.get('profitability', {})
-            growth = fundamentals.get('growth', {})
-
-            pe = valuation.get('pe_ratio')
-            if pe:
-                if pe <= 15:
-                    fund_score += 1.0
-                elif pe >= 40:
-                    fund_score -= 1.0
-
-            roe = profitability.get('roe')
-            if roe:
-                fund_score += max(-1.5, min(1.5, (roe - 0.1) * 30))
-
-            revenue_growth = growth.get('revenue_growth')
-            if revenue_growth:
-                fund_score += max(-1.0, min(1.5, revenue_growth * 10))
-
-            result['fund_score'] = round(min(max(fund_score, 0.0), 10.0), 1)
-
-        # Sentiment score
-        sentiment = sentiment_data_provider.get_sentiment_analysis(stock_code)
-        if sentiment and not sentiment.get('degraded'):
-            overall = sentiment.get('overall_sentiment')
-            result['sentiment_score'] = round(overall * 10, 1) if overall else 5.0
-
-        # Final score
-        scores = [result['tech_score']]
-        if result['fund_score'] is not None:
-            scores.append(result['fund_score'])
-        if result['sentiment_score'] is not None:
-            scores.append(result['sentiment_score'])
-
-        result['final_score'] = round(sum(scores) / len(scores), 1)
-
-        # Recommendation
-        if result['final_score'] >= 7:
-            result['recommendation'] = '买入'
-        elif result['final_score'] >= 5:
-            result['recommendation'] = '持有'
-        else:
-            result['recommendation'] = '观望'
+        score = score_stock(current_price, inds, fundamentals, sentiment)
+        result['trend'] = score.trend
+        result['tech_score'] = score.tech_score
+        result['fund_score'] = score.fund_score
+        result['sentiment_score'] = score.sentiment_score
+        result['final_score'] = score.final_score
+        result['recommendation'] = score.recommendation
 
     except Exception as e:
         result['error'] = str(e)
 
     return result
 
+def quick_analyze_stock(stock_code: str, stock_name: str):
+    """Synchronous entry point for a single-stock quick analysis"""
+    from src.utils.async_runner import run
+    return run(quick_analyze_stock_async(stock_code, stock_name))
+
+async def _analyze_with_timeout(stock_code: str, stock_name: str):
+    """Run quick_analyze_stock_async, turning a per-stock timeout into an error result
+
+    The deadline is STOCK_TIMEOUT plus the longest the sentiment provider will
+    hold a worker thread for a global crawl slot. Busier slots are skipped
+    rather than queued, so the deadline does not grow with the stock count.
+    """
+    from src.services.sentiment_provider import sentiment_data_provider
+
+    timeout = STOCK_TIMEOUT + sentiment_data_provider.max_crawl_wait
+    try:
+        return await asyncio.wait_for(
+            quick_analyze_stock_async(stock_code, stock_name), timeout=timeout
+        )
+    except asyncio.TimeoutError:
+        return _empty_result(stock_code, stock_name, f'分析超时(>{timeout:g}s)')
+
+async def analyze_all_stocks(on_result=None):
+    """Analyze every stock in NONFERROUS_STOCKS concurrently, preserving input order
+
+    Args:
+        on_result: Optional callback invoked with each result as it completes
+
+    Each stock is bounded by STOCK_TIMEOUT (plus the crawl-slot wait) and the
+    whole scan by SCAN_TIMEOUT; stocks that miss either deadline come back as
+    error results.
+
+    A timeout cancels the coroutine but not a worker thread that is already
+    inside a blocking call: that thread runs on until its HTTP timeout fires,
+    and asyncio.run() waits for it at shutdown. Such threads never sleep for
+    a far-off Guba crawl slot, so the leftover wait is bounded by the
+    providers' request timeouts.
+    """
+    tasks = {
+        asyncio.create_task(_analyze_with_timeout(code, name)): (code, name)
+        for code, name in NONFERROUS_STOCKS.items()
+    }
+    reported = set()
+    try:
+        for fut in asyncio.as_completed(tasks, timeout=SCAN_TIMEOUT):
+            result = await fut
+            reported.add(result['code'])
+            if on_result:
+                on_result(result)
+    except asyncio.TimeoutError:
+        for task in tasks:
+            task.cancel()
+
+    results = []
+    for task, (code, name) in tasks.items():
+        if task.done() and not task.cancelled():
+            result = task.result()
+        else:
+            result = _empty_result(code, name, f'板块分析超时(>{SCAN_TIMEOUT}s)')
+        if on_result and code not in reported:
+            on_result(result)
+        results.append(result)
+    return results
+
+# Color coding for recommendation
+REC_SYMBOLS = {
+    '买入': '🟢',
+    '持有': '🟡',
+    '观望': '🔴'
+}
+
+def format_row(row):
+    """Format one ranked result as a line of the summary table"""
+    price_str = f"¥{row['price']:.2f}" if row['price'] else '-'
+    change_str = f"{row['change_pct']:+.2f}%" if row['change_pct'] else '-'
+    rsi_str = f"{row['rsi']:.1f}" if row['rsi'] else '-'
+    fund_str = f"{row['fund_score']:.1f}" if row['fund_score'] else '-'
+    rec_symbol = REC_SYMBOLS.get(row['recommendation'], '')
+    return (
+        f"{row['rank']:<4} {row['code']:<12} {row['name']:<12} {price_str:<8} {change_str:<8} "
+        f"{row['trend']:<12} {rsi_str:<6} {row['tech_score']:<6.1f} {fund_str:<6} "
+        f"{row['final_score']:<6.1f} {rec_symbol}{row['recommendation']}"
+    )
+
+def print_progress(result):
+    """Print one progress line as soon as a stock's analysis finishes"""
+    status = f"❌ {result['error']}" if result['error'] else "✓"
+    print(f"  分析 {result['name']} ({result['code']})... {status}", flush=True)
+
 def analyze_nonferrous_sector():
     """Analyze non-ferrous metals sector"""
     print(f"\n{'='*80}")
@@ -174,109 +204,103 @@ def analyze_nonferrous_sector():
     print(f"分析时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"分析股票数: {len(NONFERROUS_STOCKS)}只\n")
 
-    results = []
+    print("正在分析...", flush=True)
+    from src.utils.async_runner import run
+    results = run(analyze_all_stocks(on_result=print_progress))
 
-    print("正在分析...")
-    for code, name in NONFERROUS_STOCKS.items():
-        print(f"  分析 {name} ({code})...", end='', flush=True)
-        result = quick_analyze_stock(code, name)
-        results.append(result)
-        if result['error']:
-            print(f" ❌ {result['error']}")
-        else:
-            print(f" ✓")
+    # Buffer the report and write it in one go
+    buf = io.StringIO()
+    out = functools.partial(print, file=buf)
 
-    print("\n" + "="*80)
-    print("分析结果汇总")
-    print("="*80 + "\n")
+    out("\n" + "="*80)
+    out("分析结果汇总")
+    out("="*80 + "\n")
 
-    # Create DataFrame for better display
-    df = pd.DataFrame(results)
-    df = df[df['error'].isna()]  # Filter out errors
+    # Keep successful analyses only
+    rows = [r for r in results if not r['error']]
 
-    if df.empty:
-        print("❌ 所有股票分析失败")
+    if not rows:
+        out("❌ 所有股票分析失败")
+        sys.stdout.write(buf.getvalue())
         return
 
-    # Sort by final score
-    df = df.sort_values('final_score', ascending=False)
+    # Sort by final score; ties share the same (minimum) rank
+    rows.sort(key=itemgetter('final_score'), reverse=True)
+    prev_score = None
+    for position, row in enumerate(rows, start=1):
+        if row['final_score'] != prev_score:
+            rank = position
+            prev_score = row['final_score']
+        row['rank'] = rank
 
     # Display results table
-    print(f"{'排名':<4} {'代码':<12} {'名称':<12} {'价格':<8} {'涨跌幅':<8} {'趋势':<12} {'RSI':<6} {'技术':<6} {'基本':<6} {'综合':<6} {'建议':<6}")
-    print("-" * 100)
-
-    for idx, row in df.iterrows():
-        rank = len([r for r in df.itertuples() if r.final_score > row['final_score']]) + 1
-        price_str = f"¥{row['price']:.2f}" if row['price'] else '-'
-        change_str = f"{row['change_pct']:+.2f}%" if row['change_pct'] else '-'
-        rsi_str = f"{row['rsi']:.1f}" if row['rsi'] else '-'
-        fund_str = f"{row['fund_score']:.1f}" if row['fund_score'] else '-'
+    out(f"{'排名':<4} {'代码':<12} {'名称':<12} {'价格':<8} {'涨跌幅':<8} {'趋势':<12} {'RSI':<6} {'技术':<6} {'基本':<6} {'综合':<6} {'建议':<6}")
+    out("-" * 100)
 
-        # Color coding for recommendation
-        rec_symbol = {
-            '买入': '🟢',
-            '持有': '🟡',
-            '观望': '🔴'
-        }.get(row['recommendation'], '')
+    out("\n".join(format_row(row) for row in rows))
 
-        print(f"{rank:<4} {row['code']:<12} {row['name']:<12} {price_str:<8} {change_str:<8} {row['trend']:<12} {rsi_str:<6} {row['tech_score']:<6.1f} {fund_str:<6} {row['final_score']:<6.1f} {rec_symbol}{row['recommendation']}")
+    # Group by recommendation once; each group keeps the ranked order
+    by_rec = {}
+    for row in rows:
+        by_rec.setdefault(row['recommendation'], []).append(row)
 
     # Top recommendations
-    print("\n" + "="*80)
-    print("📊 投资建议")
-    print("="*80 + "\n")
-
-    top_buy = df[df['recommendation'] == '买入'].head(3)
-    if not top_buy.empty:
-        print("🟢 推荐买入 (综合评分≥7分):")
-        for idx, row in top_buy.iterrows():
+    out("\n" + "="*80)
+    out("📊 投资建议")
+    out("="*80 + "\n")
+
+    top_buy = by_rec.get('买入', [])[:3]
+    if top_buy:
+        out("🟢 推荐买入 (综合评分≥7分):")
+        for row in top_buy:
             rsi_display = f"{row['rsi']:.1f}" if row['rsi'] else '-'
-            print(f"  • {row['name']} ({row['code']})")
-            print(f"    价格: ¥{row['price']:.2f} | 综合评分: {row['final_score']:.1f}/10")
-            print(f"    趋势: {row['trend']} | RSI: {rsi_display}")
-            print()
+            out(f"  • {row['name']} ({row['code']})")
+            out(f"    价格: ¥{row['price']:.2f} | 综合评分: {row['final_score']:.1f}/10")
+            out(f"    趋势: {row['trend']} | RSI: {rsi_display}")
+            out()
     else:
-        print("🟢 推荐买入: 当前板块无强烈买入信号\n")
+        out("🟢 推荐买入: 当前板块无强烈买入信号\n")
 
-    top_hold = df[df['recommendation'] == '持有'].head(3)
-    if not top_hold.empty:
-        print("🟡 可以持有 (综合评分5-7分):")
-        for idx, row in top_hold.iterrows():
-            print(f"  • {row['name']} ({row['code']})")
-            print(f"    价格: ¥{row['price']:.2f} | 综合评分: {row['final_score']:.1f}/10")
-            print()
+    top_hold = by_rec.get('持有', [])[:3]
+    if top_hold:
+        out("🟡 可以持有 (综合评分5-7分):")
+        for row in top_hold:
+            out(f"  • {row['name']} ({row['code']})")
+            out(f"    价格: ¥{row['price']:.2f} | 综合评分: {row['final_score']:.1f}/10")
+            out()
 
     # Sector statistics
-    print("="*80)
-    print("📈 板块统计")
-    print("="*80 + "\n")
+    out("="*80)
+    out("📈 板块统计")
+    out("="*80 + "\n")
 
-    avg_score = df['final_score'].mean()
-    avg_change = df['change_pct'].mean()
+    avg_score = statistics.mean(r['final_score'] for r in rows)
+    avg_change = statistics.mean(r['change_pct'] for r in rows)
 
-    print(f"平均综合评分: {avg_score:.1f}/10")
-    print(f"平均涨跌幅: {avg_change:+.2f}%")
-    print(f"推荐买入: {len(df[df['recommendation'] == '买入'])}只")
-    print(f"建议持有: {len(df[df['recommendation'] == '持有'])}只")
-    print(f"建议观望: {len(df[df['recommendation'] == '观望'])}只")
+    out(f"平均综合评分: {avg_score:.1f}/10")
+    out(f"平均涨跌幅: {avg_change:+.2f}%")
+    out(f"推荐买入: {len(by_rec.get('买入', []))}只")
+    out(f"建议持有: {len(by_rec.get('持有', []))}只")
+    out(f"建议观望: {len(by_rec.get('观望', []))}只")
 
     # Trend distribution
-    trend_counts = df['trend'].value_counts()
-    print(f"\n趋势分布:")
-    for trend, count in trend_counts.items():
-        print(f"  {trend}: {count}只 ({count/len(df)*100:.0f}%)")
+    trend_counts = Counter(r['trend'] for r in rows)
+    out(f"\n趋势分布:")
+    for trend, count in trend_counts.most_common():
+        out(f"  {trend}: {count}只 ({count/len(rows)*100:.0f}%)")
 
     # Risk warning
-    print("\n" + "="*80)
-    print("⚠️  风险提示")
-    print("="*80 + "\n")
-    print("1. 有色板块受宏观经济和大宗商品价格影响大，波动性较高")
-    print("2. 建议分散投资，不要集中于单一品种")
-    print("3. 关注全球经济形势、美元指数、工业需求等因素")
-    print("4. 注意个股基本面变化，特别是成本控制和矿产储量")
-    print("5. 本分析仅供参考，不构成投资建议，投资有风险，入市需谨慎")
-
-    print("\n" + "="*80 + "\n")
+    out("\n" + "="*80)
+    out("⚠️  风险提示")
+    out("="*80 + "\n")
+    out("1. 有色板块受宏观经济和大宗商品价格影响大，波动性较高")
+    out("2. 建议分散投资，不要集中于单一品种")
+    out("3. 关注全球经济形势、美元指数、工业需求等因素")
+    out("4. 注意个股基本面变化，特别是成本控制和矿产储量")
+    out("5. 本分析仅供参考，不构成投资建议，投资有风险，入市需谨慎")
+
+    out("\n" + "="*80 + "\n")
+    sys.stdout.write(buf.getvalue())
 
 if __name__ == "__main__":
     analyze_nonferrous_sector()
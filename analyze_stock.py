@@ -2,117 +2,126 @@
 # analyze_stock.py - 通用股票分析脚本
 import sys
 import os
+import functools
+import io
 sys.path.insert(0, os.path.dirname(__file__))
 
 from datetime import datetime
-from src.api.stock_api import (
-    fetch_sina_realtime_sync,
-    fetch_history_df,
-    compute_indicators,
-    is_offline_mode
-)
-from src.services.fundamental_provider import fundamental_data_provider
-from src.services.sentiment_provider import sentiment_data_provider
-from src.services.etf_analyzer import etf_analyzer
-import json
+
+# Indicators shown in the technical analysis section
+REPORT_INDICATORS = frozenset({'ma5', 'ma20', 'ma60', 'rsi14', 'macd'})
+
+# Extra explanation printed under the trend label
+TREND_DESC = {
+    "多头排列": "价格位于短期均线上方",
+    "空头排列": "价格位于短期均线下方",
+}
+
+REC_COLORS = {"买入": "🟢", "持有": "🟡", "观望": "🔴"}
+
+# ETF fund flow direction icons and labels
+FUND_FLOW_ICONS = {'inflow': "📈", 'outflow': "📉"}
+FUND_FLOW_LABELS = {'inflow': '净流入', 'outflow': '净流出', 'neutral': '平衡'}
 
 def analyze_stock(stock_code: str):
     """分析股票趋势"""
+    # Deferred so the script starts without loading the API/provider stack
+    from src.api.stock_api import (
+        fetch_sina_realtime_sync,
+        fetch_history_df,
+        compute_indicators,
+    )
+    from src.services.fundamental_provider import fundamental_data_provider
+    from src.services.sentiment_provider import sentiment_data_provider
+    from src.services.etf_analyzer import etf_analyzer
+    from src.services.stock_scoring import classify_trend, score_stock
+
     print(f"\n{'='*60}")
     print(f"股票综合趋势分析 - {stock_code}")
-    print(f"{'='*60}\n")
+    print(f"{'='*60}\n", flush=True)
+
+    # Buffer the report and write it in one go once all sections are ready
+    buf = io.StringIO()
+    out = functools.partial(print, file=buf)
 
     # 1. 获取实时行情
-    print("【实时行情】")
+    out("【实时行情】")
     sina = fetch_sina_realtime_sync(stock_code)
     if sina:
-        print(f"  股票名称: {sina['company_name']}")
-        print(f"  当前价格: ¥{sina['current_price']:.2f}")
-        print(f"  昨日收盘: ¥{sina['previous_close']:.2f}")
+        out(f"  股票名称: {sina['company_name']}")
+        out(f"  当前价格: ¥{sina['current_price']:.2f}")
+        out(f"  昨日收盘: ¥{sina['previous_close']:.2f}")
         change_pct = ((sina['current_price'] - sina['previous_close']) / sina['previous_close'] * 100) if sina['previous_close'] else 0
-        print(f"  涨跌幅: {change_pct:+.2f}%")
-        print(f"  今日开盘: ¥{sina['open_price']:.2f}")
-        print(f"  最高价: ¥{sina['high_price']:.2f}")
-        print(f"  最低价: ¥{sina['low_price']:.2f}")
-        print(f"  成交量: {sina['volume']:,}手")
-        print(f"  成交额: ¥{sina['turnover']/100000000:.2f}亿")
+        out(f"  涨跌幅: {change_pct:+.2f}%")
+        out(f"  今日开盘: ¥{sina['open_price']:.2f}")
+        out(f"  最高价: ¥{sina['high_price']:.2f}")
+        out(f"  最低价: ¥{sina['low_price']:.2f}")
+        out(f"  成交量: {sina['volume']:,}手")
+        out(f"  成交额: ¥{sina['turnover']/100000000:.2f}亿")
         current_price = sina['current_price']
         company_name = sina['company_name']
     else:
-        print("  ⚠️  实时行情获取失败")
+        out("  ⚠️  实时行情获取失败")
         current_price = None
         company_name = stock_code
 
     # 2. 获取历史数据并计算技术指标
-    print(f"\n【技术分析】(基于120日历史数据)")
+    out(f"\n【技术分析】(基于120日历史数据)")
     hist = fetch_history_df(stock_code, days=120)
     if hist is not None and not hist.empty:
-        print(f"  数据范围: {hist['date'].iloc[0]} ~ {hist['date'].iloc[-1]}")
-        print(f"  数据点数: {len(hist)}个交易日")
+        out(f"  数据范围: {hist['date'].iloc[0]} ~ {hist['date'].iloc[-1]}")
+        out(f"  数据点数: {len(hist)}个交易日")
 
         # 计算技术指标
-        inds = compute_indicators(hist)
+        inds = compute_indicators(hist, indicators=REPORT_INDICATORS)
 
         # 价格与均线
         if current_price is None and 'close' in hist.columns:
             current_price = float(hist['close'].iloc[-1])
 
-        print(f"\n  移动平均线:")
+        out(f"\n  移动平均线:")
         ma5 = inds.get('ma5')
         ma20 = inds.get('ma20')
         ma60 = inds.get('ma60')
-        if ma5: print(f"    MA5:  ¥{ma5:.2f}")
-        if ma20: print(f"    MA20: ¥{ma20:.2f}")
-        if ma60: print(f"    MA60: ¥{ma60:.2f}")
+        if ma5: out(f"    MA5:  ¥{ma5:.2f}")
+        if ma20: out(f"    MA20: ¥{ma20:.2f}")
+        if ma60: out(f"    MA60: ¥{ma60:.2f}")
 
         # 趋势判断
-        trend = "中性"
-        trend_desc = []
-        if current_price and ma5 and ma20:
-            if current_price > ma5 > ma20:
-                trend = "多头排列"
-                trend_desc.append("价格位于短期均线上方")
-            elif current_price < ma5 < ma20:
-                trend = "空头排列"
-                trend_desc.append("价格位于短期均线下方")
-            elif current_price > ma20:
-                trend = "震荡偏强"
-            else:
-                trend = "震荡偏弱"
-
-        print(f"\n  趋势判断: {trend}")
+        trend = classify_trend(current_price, ma5, ma20)
+        trend_desc = TREND_DESC.get(trend)
+        out(f"\n  趋势判断: {trend}")
         if trend_desc:
-            for desc in trend_desc:
-                print(f"    • {desc}")
+            out(f"    • {trend_desc}")
 
         # RSI指标
         rsi = inds.get('rsi14')
         if rsi:
-            print(f"\n  RSI(14): {rsi:.2f}")
+            out(f"\n  RSI(14): {rsi:.2f}")
             if rsi > 70:
-                print(f"    → 超买区域,有回调风险")
+                out(f"    → 超买区域,有回调风险")
             elif rsi < 30:
-                print(f"    → 超卖区域,可能反弹")
+                out(f"    → 超卖区域,可能反弹")
             elif 40 <= rsi <= 60:
-                print(f"    → 中性区域")
+                out(f"    → 中性区域")
             else:
-                print(f"    → 正常波动范围")
+                out(f"    → 正常波动范围")
 
         # MACD指标
         macd = inds.get('macd')
         macd_signal = inds.get('macd_signal')
         macd_hist = inds.get('macd_hist')
         if macd is not None and macd_signal is not None:
-            print(f"\n  MACD指标:")
-            print(f"    MACD线: {macd:.4f}")
-            print(f"    信号线: {macd_signal:.4f}")
-            print(f"    柱状图: {macd_hist:.4f}")
+            out(f"\n  MACD指标:")
+            out(f"    MACD线: {macd:.4f}")
+            out(f"    信号线: {macd_signal:.4f}")
+            out(f"    柱状图: {macd_hist:.4f}")
             if macd > macd_signal:
-                print(f"    → 多头信号(MACD在信号线上方)")
+                out(f"    → 多头信号(MACD在信号线上方)")
             else:
-                print(f"    → 空头信号(MACD在信号线下方)")
+                out(f"    → 空头信号(MACD在信号线下方)")
             if abs(macd_hist) < 0.05:
-                print(f"    → 即将金叉/死叉,注意方向变化")
+                out(f"    → 即将金叉/死叉,注意方向变化")
 
         # 支撑与压力位
         if current_price:
@@ -120,69 +129,67 @@ def analyze_stock(stock_code: str):
             support2 = current_price * 0.90
             resistance1 = current_price * 1.05
             resistance2 = current_price * 1.10
-            print(f"\n  支撑与压力位:")
-            print(f"    支撑1: ¥{support1:.2f} (-5%)")
-            print(f"    支撑2: ¥{support2:.2f} (-10%)")
-            print(f"    压力1: ¥{resistance1:.2f} (+5%)")
-            print(f"    压力2: ¥{resistance2:.2f} (+10%)")
+            out(f"\n  支撑与压力位:")
+            out(f"    支撑1: ¥{support1:.2f} (-5%)")
+            out(f"    支撑2: ¥{support2:.2f} (-10%)")
+            out(f"    压力1: ¥{resistance1:.2f} (+5%)")
+            out(f"    压力2: ¥{resistance2:.2f} (+10%)")
     else:
-        print("  ⚠️  历史数据获取失败")
-        rsi = None
-        macd = None
-        macd_signal = None
+        out("  ⚠️  历史数据获取失败")
+        inds = {}
 
     # 2.5 ETF专项分析 (如果是ETF)
     is_etf = etf_analyzer.is_etf(stock_code, company_name)
     if is_etf:
-        print(f"\n【ETF专项分析】")
+        out(f"\n【ETF专项分析】")
 
         # ETF基本信息
         etf_info = etf_analyzer.get_etf_info(stock_code)
         if etf_info:
-            print(f"  ETF信息:")
+            out(f"  ETF信息:")
             if etf_info.get('etf_name'):
-                print(f"    名称: {etf_info['etf_name']}")
+                out(f"    名称: {etf_info['etf_name']}")
             if etf_info.get('fund_company'):
-                print(f"    基金公司: {etf_info['fund_company']}")
+                out(f"    基金公司: {etf_info['fund_company']}")
             if etf_info.get('tracking_index'):
-                print(f"    跟踪指数: {etf_info['tracking_index']}")
+                out(f"    跟踪指数: {etf_info['tracking_index']}")
             if etf_info.get('fund_size'):
-                print(f"    基金规模: {etf_info['fund_size']:.2f}亿元")
+                out(f"    基金规模: {etf_info['fund_size']:.2f}亿元")
             if etf_info.get('establishment_date'):
-                print(f"    成立日期: {etf_info['establishment_date']}")
+                out(f"    成立日期: {etf_info['establishment_date']}")
             if etf_info.get('management_fee'):
-                print(f"    管理费率: {etf_info['management_fee']*100:.2f}%")
+                out(f"    管理费率: {etf_info['management_fee']*100:.2f}%")
 
         # ETF溢价率
         premium = etf_analyzer.get_premium_discount(stock_code)
         if premium:
-            print(f"\n  溢价率分析:")
-            print(f"    市场价格: ¥{premium['market_price']:.3f}")
+            out(f"\n  溢价率分析:")
+            out(f"    市场价格: ¥{premium['market_price']:.3f}")
             if premium.get('nav'):
-                print(f"    单位净值: ¥{premium['nav']:.3f}")
-                print(f"    溢价率: {premium['premium_rate']:+.2f}%")
+                out(f"    单位净值: ¥{premium['nav']:.3f}")
+                out(f"    溢价率: {premium['premium_rate']:+.2f}%")
                 status_icon = "⚠️ " if abs(premium['premium_rate']) > 2 else "✓ "
                 status_map = {
                     'premium': f"{status_icon}溢价交易 (市价>净值)",
                     'discount': f"{status_icon}折价交易 (市价<净值)",
                     'fair': "✓ 合理定价 (接近净值)"
                 }
-                print(f"    状态: {status_map.get(premium['status'], premium['status'])}")
+                out(f"    状态: {status_map.get(premium['status'], premium['status'])}")
             else:
-                print(f"    单位净值: 未获取")
-                print(f"    注: NAV数据可能需要盘后更新")
+                out(f"    单位净值: 未获取")
+                out(f"    注: NAV数据可能需要盘后更新")
 
         # 资金流向
         fund_flow = etf_analyzer.get_fund_flow(stock_code, days=5)
         if fund_flow:
-            print(f"\n  资金流向 (近{fund_flow['period_days']}日):")
-            print(f"    净流向: ¥{fund_flow['net_flow']/100000000:.2f}亿")
-            trend_icon = "📈" if fund_flow['trend'] == 'inflow' else "📉" if fund_flow['trend'] == 'outflow' else "➡️"
-            trend_map = {'inflow': '净流入', 'outflow': '净流出', 'neutral': '平衡'}
-            print(f"    趋势: {trend_icon} {trend_map.get(fund_flow['trend'], fund_flow['trend'])}")
+            out(f"\n  资金流向 (近{fund_flow['period_days']}日):")
+            out(f"    净流向: ¥{fund_flow['net_flow']/100000000:.2f}亿")
+            flow_trend = fund_flow['trend']
+            trend_icon = FUND_FLOW_ICONS.get(flow_trend, "➡️")
+            out(f"    趋势: {trend_icon} {FUND_FLOW_LABELS.get(flow_trend, flow_trend)}")
 
     # 3. 基本面分析
-    print(f"\n【基本面分析】")
+    out(f"\n【基本面分析】")
     fundamentals = fundamental_data_provider.get_fundamental_analysis(
         stock_code, price_hint=current_price
     )
@@ -191,147 +198,85 @@ def analyze_stock(stock_code: str):
         profitability = fundamentals.get('profitability', {})
         growth = fundamentals.get('growth', {})
 
-        print(f"  估值指标:")
+        out(f"  估值指标:")
         if valuation.get('pe_ratio'):
-            print(f"    市盈率(PE): {valuation['pe_ratio']:.2f}")
+            out(f"    市盈率(PE): {valuation['pe_ratio']:.2f}")
         if valuation.get('pb_ratio'):
-            print(f"    市净率(PB): {valuation['pb_ratio']:.2f}")
+            out(f"    市净率(PB): {valuation['pb_ratio']:.2f}")
         if valuation.get('ps_ratio'):
-            print(f"    市销率(PS): {valuation['ps_ratio']:.2f}")
+            out(f"    市销率(PS): {valuation['ps_ratio']:.2f}")
 
-        print(f"\n  盈利能力:")
+        out(f"\n  盈利能力:")
         if profitability.get('roe'):
-            print(f"    净资产收益率(ROE): {profitability['roe']*100:.2f}%")
+            out(f"    净资产收益率(ROE): {profitability['roe']*100:.2f}%")
         if profitability.get('net_margin'):
-            print(f"    净利润率: {profitability['net_margin']*100:.2f}%")
+            out(f"    净利润率: {profitability['net_margin']*100:.2f}%")
         if profitability.get('gross_margin'):
-            print(f"    毛利率: {profitability['gross_margin']*100:.2f}%")
+            out(f"    毛利率: {profitability['gross_margin']*100:.2f}%")
 
-        print(f"\n  成长性:")
+        out(f"\n  成长性:")
         if growth.get('revenue_growth'):
-            print(f"    营收增长率: {growth['revenue_growth']*100:+.2f}%")
+            out(f"    营收增长率: {growth['revenue_growth']*100:+.2f}%")
         if growth.get('profit_growth'):
-            print(f"    净利润增长率: {growth['profit_growth']*100:+.2f}%")
+            out(f"    净利润增长率: {growth['profit_growth']*100:+.2f}%")
     else:
-        print("  ⚠️  基本面数据未接入")
+        out("  ⚠️  基本面数据未接入")
 
     # 4. 市场情绪
-    print(f"\n【市场情绪】")
+    out(f"\n【市场情绪】")
     sentiment = sentiment_data_provider.get_sentiment_analysis(stock_code)
     if sentiment and not sentiment.get('degraded'):
         overall = sentiment.get('overall_sentiment')
         if overall is not None:
             sentiment_label = "积极" if overall > 0.6 else "中性" if overall > 0.4 else "消极"
-            print(f"  综合情绪: {sentiment_label} ({overall:.2f})")
+            out(f"  综合情绪: {sentiment_label} ({overall:.2f})")
 
         source = sentiment.get('source', 'unknown')
         if source == 'eastmoney_guba':
-            print(f"  数据来源: 东方财富股吧 (实时爬取)")
+            out(f"  数据来源: 东方财富股吧 (实时爬取)")
             social = sentiment.get('social_sentiment', {})
             post_count = sentiment.get('post_count', 0)
             engagement = social.get('total_engagement', 0)
-            print(f"  帖子数量: {post_count}条")
-            print(f"  互动热度: {engagement:,}")
+            out(f"  帖子数量: {post_count}条")
+            out(f"  互动热度: {engagement:,}")
             keywords = social.get('keywords', [])
             if keywords:
-                print(f"  热门关键词: {', '.join(keywords)}")
+                out(f"  热门关键词: {', '.join(keywords)}")
         elif source == 'technical_derived':
-            print(f"  数据来源: 技术指标推导")
+            out(f"  数据来源: 技术指标推导")
     else:
-        print("  ⚠️  情绪数据未接入")
+        out("  ⚠️  情绪数据未接入")
 
     # 5. 综合评分与建议
-    print(f"\n【综合评分与建议】")
-
-    # 技术评分
-    tech_score = 5.0
-    if hist is not None and not hist.empty and current_price:
-        if trend == "多头排列":
-            tech_score = 7.5 if (rsi and rsi < 70) else 6.5
-        elif trend == "震荡偏强":
-            tech_score = 6.0
-        elif trend == "震荡偏弱":
-            tech_score = 4.5
-        elif trend == "空头排列":
-            tech_score = 3.0 if (rsi and rsi < 30) else 2.5
-
-        # MACD调整
-        if macd and macd_signal:
-            if macd > macd_signal and macd > 0:
-                tech_score += 0.5
-            elif macd < macd_signal and macd < 0:
-                tech_score -= 0.5
-
-    print(f"  技术面评分: {tech_score:.1f}/10")
-
-    # 基本面评分
-    if fundamentals and not fundamentals.get('degraded'):
-        fund_score = 5.0
-        valuation = fundamentals.get('valuation', {})
-        profitability = fundamentals.get('profitability', {})
-        growth = fundamentals.get('growth', {})
-
-        pe = valuation.get('pe_ratio')
-        if pe:
-            if pe <= 15:
-                fund_score += 1.0
-            elif pe >= 40:
-                fund_score -= 1.0
-
-        roe = profitability.get('roe')
-        if roe:
-            fund_score += max(-1.5, min(1.5, (roe - 0.1) * 30))
+    out(f"\n【综合评分与建议】")
 
-        revenue_growth = growth.get('revenue_growth')
-        if revenue_growth:
-            fund_score += max(-1.0, min(1.5, revenue_growth * 10))
-
-        fund_score = round(min(max(fund_score, 0.0), 10.0), 1)
-        print(f"  基本面评分: {fund_score:.1f}/10")
+    score = score_stock(current_price, inds, fundamentals, sentiment)
+    out(f"  技术面评分: {score.tech_score:.1f}/10")
+    if score.fund_score is not None:
+        out(f"  基本面评分: {score.fund_score:.1f}/10")
     else:
-        fund_score = None
-        print(f"  基本面评分: 未接入数据")
-
-    # 情绪评分
-    if sentiment and not sentiment.get('degraded'):
-        overall = sentiment.get('overall_sentiment')
-        sent_score = round(overall * 10, 1) if overall else 5.0
-        print(f"  市场情绪评分: {sent_score:.1f}/10")
+        out(f"  基本面评分: 未接入数据")
+    if score.sentiment_score is not None:
+        out(f"  市场情绪评分: {score.sentiment_score:.1f}/10")
     else:
-        sent_score = None
-        print(f"  市场情绪评分: 未接入数据")
-
-    # 综合评分
-    scores = [tech_score]
-    if fund_score is not None:
-        scores.append(fund_score)
-    if sent_score is not None:
-        scores.append(sent_score)
+        out(f"  市场情绪评分: 未接入数据")
 
-    final_score = sum(scores) / len(scores)
-    print(f"\n  🎯 综合评分: {final_score:.1f}/10")
+    final_score = score.final_score
+    out(f"\n  🎯 综合评分: {final_score:.1f}/10")
 
     # 投资建议
-    if final_score >= 7:
-        action = "买入"
-        risk = "低风险"
-        color = "🟢"
-    elif final_score >= 5:
-        action = "持有"
-        risk = "中等风险"
-        color = "🟡"
-    else:
-        action = "观望"
-        risk = "高风险"
-        color = "🔴"
-
-    print(f"  {color} 投资建议: {action}")
-    print(f"  风险等级: {risk}")
-    print(f"  置信度: {min(1.0, final_score/10.0):.0%}")
-
-    print(f"\n{'='*60}")
-    print(f"分析时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"{'='*60}\n")
+    action = score.recommendation
+    risk = score.risk_level
+    color = REC_COLORS[action]
+
+    out(f"  {color} 投资建议: {action}")
+    out(f"  风险等级: {risk}")
+    out(f"  置信度: {min(1.0, final_score/10.0):.0%}")
+
+    out(f"\n{'='*60}")
+    out(f"分析时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    out(f"{'='*60}\n")
+    sys.stdout.write(buf.getvalue())
 
 if __name__ == "__main__":
     if len(sys.argv) > 1:
@@ -6,16 +6,10 @@ Usage:
     python backtest_t_trading.py 513090.SH --mode regular_t --t_ratio 0.3
 """
 import argparse
-import asyncio
 import logging
 from datetime import datetime, timedelta, date
 from typing import Dict
 
-from src.backtest.engine import BacktestEngine
-from src.strategies.etf_t_trading import ETFTTradingStrategy
-from src.api.stock_api import fetch_history_df
-from src.models.trading import OrderStatus, OrderSide
-
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -25,6 +19,12 @@ logging.basicConfig(
 
 async def run_backtest(etf_code: str, config: Dict):
     """Run backtest for ETF T-trading strategy"""
+    # Deferred so `--help` renders without loading the backtest stack
+    import numpy as np
+    from src.backtest.engine import BacktestEngine
+    from src.strategies.etf_t_trading import ETFTTradingStrategy
+    from src.api.stock_api import fetch_history_df
+    from src.models.trading import OrderStatus, OrderSide
 
     print(f"{'=' * 70}")
     print(f"ETF做T策略回测 - {etf_code}")
@@ -144,56 +144,61 @@ async def run_backtest(etf_code: str, config: Dict):
     print(f"  总收益率: {total_return_pct:.2f}%")
     print(f"  年化收益率: {annualized_return:.2f}%\n")
 
-    # Trade statistics
-    all_orders = list(portfolio.orders.values())
-    filled_orders = [o for o in all_orders if o.status == OrderStatus.FILLED]
+    # Trade statistics - one pass over orders: count, status breakdown,
+    # and per-symbol (buys, sells) of filled orders for trade pairing
+    from collections import Counter
+    n_all = 0
+    filled_orders = []
+    status_count = Counter()
+    trades_by_symbol = {}
+    filled, buy_side, sell_side = OrderStatus.FILLED, OrderSide.BUY, OrderSide.SELL
+    for o in portfolio.orders.values():
+        n_all += 1
+        if o.status == filled:
+            filled_orders.append(o)
+            buys, sells = trades_by_symbol.setdefault(o.symbol, ([], []))
+            if o.side == buy_side:
+                buys.append(o)
+            elif o.side == sell_side:
+                sells.append(o)
+        else:
+            status_count[o.status.name] += 1
     total_trades = len(filled_orders)
 
     print(f"【订单统计】")
-    print(f"  总订单数: {len(all_orders)}")
-    print(f"  已成交: {len(filled_orders)}")
-    print(f"  其他状态: {len(all_orders) - len(filled_orders)}")
+    print(f"  总订单数: {n_all}")
+    print(f"  已成交: {total_trades}")
+    print(f"  其他状态: {n_all - total_trades}")
 
-    if len(all_orders) > len(filled_orders):
+    if status_count:
         print(f"\n  未成交订单状态分布:")
-        from collections import Counter
-        status_count = Counter(str(o.status) for o in all_orders if o.status != OrderStatus.FILLED)
         for status, count in status_count.items():
             print(f"    {status}: {count}")
     print()
 
-    # Calculate wins/losses (simplified - pair buy/sell orders)
-    trades_by_symbol = {}
-    for order in filled_orders:
-        symbol = order.symbol
-        if symbol not in trades_by_symbol:
-            trades_by_symbol[symbol] = []
-        trades_by_symbol[symbol].append(order)
-
     winning_trades = 0
     losing_trades = 0
     total_profit = 0
     total_loss = 0
 
-    for symbol, orders in trades_by_symbol.items():
-        # Pair buy and sell orders
-        buys = [o for o in orders if o.side == OrderSide.BUY]
-        sells = [o for o in orders if o.side == OrderSide.SELL]
-
-        for i in range(min(len(buys), len(sells))):
-            buy_order = buys[i]
-            sell_order = sells[i]
-            # Use avg_fill_price for filled orders
-            buy_price = float(buy_order.avg_fill_price) if hasattr(buy_order, 'avg_fill_price') and buy_order.avg_fill_price else 0
-            sell_price = float(sell_order.avg_fill_price) if hasattr(sell_order, 'avg_fill_price') and sell_order.avg_fill_price else 0
-            profit = (sell_price - buy_price) * buy_order.quantity
-
-            if profit > 0:
-                winning_trades += 1
-                total_profit += profit
-            else:
-                losing_trades += 1
-                total_loss += abs(profit)
+    # Calculate wins/losses (simplified - pair buy/sell orders)
+    for symbol, (buys, sells) in trades_by_symbol.items():
+        n = min(len(buys), len(sells))
+        if n == 0:
+            continue
+
+        # Use avg_fill_price for filled orders (None until a fill is recorded)
+        buy_px = np.fromiter((float(o.avg_fill_price or 0) for o in buys[:n]), dtype=np.float64, count=n)
+        sell_px = np.fromiter((float(o.avg_fill_price or 0) for o in sells[:n]), dtype=np.float64, count=n)
+        qty = np.fromiter((o.quantity for o in buys[:n]), dtype=np.float64, count=n)
+        profits = (sell_px - buy_px) * qty
+
+        wins = profits > 0
+        n_wins = int(wins.sum())
+        winning_trades += n_wins
+        losing_trades += n - n_wins
+        total_profit += float(profits[wins].sum())
+        total_loss += float(-profits[~wins].sum())
 
     win_rate = (winning_trades / (winning_trades + losing_trades) * 100) if (winning_trades + losing_trades) > 0 else 0
     avg_win = total_profit / winning_trades if winning_trades > 0 else 0
@@ -214,12 +219,12 @@ async def run_backtest(etf_code: str, config: Dict):
         print('-' * 70)
 
         for order in filled_orders[-10:]:
-            order_id = order.order_id[:12] if hasattr(order, 'order_id') else 'N/A'
-            side = str(order.side).split('.')[-1]  # Extract 'BUY' or 'SELL' from 'OrderSide.BUY'
+            order_id = order.order_id[:12]
+            side = order.side.name
             quantity = order.quantity
-            price = float(order.avg_fill_price) if hasattr(order, 'avg_fill_price') and order.avg_fill_price else 0
+            price = float(order.avg_fill_price or 0)
             amount = quantity * price
-            status = str(order.status).split('.')[-1]  # Extract status name
+            status = order.status.name
 
             print(f"{order_id:<12} {side:<10} {quantity:<8} ¥{price:<9.3f} ¥{amount:<11,.2f} {status:<10}")
 
@@ -265,7 +270,8 @@ def main():
         'rsi_overbought': args.rsi_overbought
     }
 
-    asyncio.run(run_backtest(args.etf_code, config))
+    from src.utils.async_runner import run
+    run(run_backtest(args.etf_code, config))
 
 
 if __name__ == '__main__':
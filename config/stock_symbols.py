@@ -1,5 +1,6 @@
 # config/stock_symbols.py
 """Stock symbols configuration - centralized stock list management"""
+from collections import defaultdict
 from typing import Dict, List
 
 # A-share hot stocks
@@ -126,22 +127,29 @@ HK_STOCKS: List[Dict[str, str]] = [
 ALL_STOCKS: List[Dict[str, str]] = A_SHARE_STOCKS + HK_STOCKS
 
 
+# Lookup indices built once at import
+_BY_CODE: Dict[str, Dict[str, str]] = {s["code"]: s for s in ALL_STOCKS}
+_BY_EXCHANGE: Dict[str, List[Dict[str, str]]] = defaultdict(list)
+_BY_INDUSTRY: Dict[str, List[Dict[str, str]]] = defaultdict(list)
+for _stock in ALL_STOCKS:
+    _BY_EXCHANGE[_stock["exchange"]].append(_stock)
+    _BY_INDUSTRY[_stock["industry"]].append(_stock)
+del _stock
+
+
 def get_stock_by_code(code: str) -> Dict[str, str]:
     """Get stock info by code"""
-    for stock in ALL_STOCKS:
-        if stock["code"] == code:
-            return stock
-    return None
+    return _BY_CODE.get(code)
 
 
 def get_stocks_by_exchange(exchange: str) -> List[Dict[str, str]]:
     """Get stocks by exchange"""
-    return [s for s in ALL_STOCKS if s["exchange"] == exchange]
+    return list(_BY_EXCHANGE.get(exchange, ()))
 
 
 def get_stocks_by_industry(industry: str) -> List[Dict[str, str]]:
     """Get stocks by industry"""
-    return [s for s in ALL_STOCKS if s["industry"] == industry]
+    return list(_BY_INDUSTRY.get(industry, ()))
 
 # Backward compatibility: simple dict mapping
 STOCK_SYMBOLS = {stock["code"]: stock["name"] for stock in A_SHARE_STOCKS}
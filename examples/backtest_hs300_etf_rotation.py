@@ -7,22 +7,27 @@ Usage:
 
 import argparse
 import asyncio
-import random
-import time
+import hashlib
+import logging
+import os
 import sys
 from datetime import date, timedelta
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 import akshare as ak
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from config.settings import settings
 from config.stock_symbols import A_SHARE_STOCKS
 from src.backtest.engine import BacktestEngine
 from src.strategies.hs300_etf_rotation import HS300EtfRotation, DEFAULT_ETF_UNIVERSE
 
+logger = logging.getLogger(__name__)
+
 
 def _load_symbol_list(path: str) -> List[str]:
     symbols = []
@@ -49,8 +54,11 @@ def _normalize_em_df(df: pd.DataFrame) -> pd.DataFrame:
     df = df.rename(columns=rename_map)
     needed = ["date", "open", "high", "low", "close", "volume"]
     df = df[[col for col in needed if col in df.columns]]
-    df["date"] = pd.to_datetime(df["date"])
-    return df
+    dates = df["date"]
+    # akshare returns either "YYYY-MM-DD" strings or datetime.date objects;
+    # an explicit format lets pandas skip per-row inference for strings
+    fmt = "%Y-%m-%d" if isinstance(dates.iloc[0], str) else None
+    return df.assign(date=pd.to_datetime(dates, format=fmt))
 
 
 def _fetch_akshare(
@@ -89,26 +97,117 @@ def _fetch_akshare(
     return _normalize_em_df(df)
 
 
+def _cache_path(symbol: str, start_date: date, end_date: date) -> Path:
+    return Path(settings.HISTORY_CACHE_DIR) / (
+        f"akshare_{symbol}_{start_date.isoformat()}_{end_date.isoformat()}.parquet"
+    )
+
+
+def _read_history_cache(symbol: str, start_date: date) -> Optional[Tuple[pd.DataFrame, date]]:
+    """Return the cached bars for symbol and the day the cache was last
+    refreshed, if the cached window covers start_date."""
+    prefix = f"akshare_{symbol}_"
+    for path in Path(settings.HISTORY_CACHE_DIR).glob(f"{prefix}*.parquet"):
+        try:
+            cached_start, cached_end = map(date.fromisoformat, path.stem[len(prefix):].split("_"))
+        except ValueError:
+            continue
+        if cached_start > start_date:
+            # A longer window than the cached one needs a full download
+            return None
+        try:
+            return pd.read_parquet(path), cached_end
+        except Exception as e:
+            logger.debug(f"History cache read failed for {symbol}: {e}")
+            return None
+    return None
+
+
+def _write_history_cache(symbol: str, df: pd.DataFrame, start_date: date, end_date: date) -> None:
+    path = _cache_path(symbol, start_date, end_date)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(tmp_path, compression="zstd", index=False)
+        os.replace(tmp_path, path)
+        # Drop windows cached on previous runs for the same symbol
+        for stale in path.parent.glob(f"akshare_{symbol}_*.parquet"):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+    except Exception as e:
+        tmp_path.unlink(missing_ok=True)
+        logger.debug(f"History cache write skipped for {symbol}: {e}")
+
+
+def _fetch_akshare_cached(
+    symbol: str,
+    start_date: date,
+    end_date: date,
+    etf_symbols: set,
+    index_symbol: str,
+) -> pd.DataFrame:
+    """_fetch_akshare with the zstd parquet history cache used by the API.
+
+    A cache from an earlier day is topped up by fetching only the bars since
+    its last trading day. That day is fetched again: if its qfq close has
+    changed (a dividend re-adjusted history) the whole window is downloaded
+    instead. Requires pyarrow; without it (or on any I/O error) the cache is
+    bypassed.
+    """
+    window_start = pd.Timestamp(start_date)
+    df = None
+    cached = _read_history_cache(symbol, start_date)
+    if cached is not None:
+        df, cached_end = cached
+        if cached_end >= end_date or df.empty:
+            return df[df["date"] >= window_start].reset_index(drop=True)
+
+        last_bar = df["date"].iloc[-1]
+        tail = _fetch_akshare(symbol, last_bar.date(), end_date, etf_symbols, index_symbol)
+        if tail.empty:
+            # Nothing new yet; keep the cache as is and retry on the next run
+            return df[df["date"] >= window_start].reset_index(drop=True)
+        overlap = tail.loc[tail["date"] == last_bar, "close"]
+        if len(overlap) == 1 and np.isclose(overlap.iloc[0], df["close"].iloc[-1]):
+            df = pd.concat([df[df["date"] < last_bar], tail], ignore_index=True)
+        else:
+            df = None
+
+    if df is None:
+        df = _fetch_akshare(symbol, start_date, end_date, etf_symbols, index_symbol)
+        if df.empty:
+            return df
+
+    df = df[df["date"] >= window_start].reset_index(drop=True)
+    _write_history_cache(symbol, df, start_date, end_date)
+    return df
+
+
+def _symbol_seed(symbol: str) -> int:
+    # hash() is salted per process; blake2b gives the same seed on every run
+    return int.from_bytes(hashlib.blake2b(symbol.encode(), digest_size=8).digest(), "little")
+
+
 def _simulate_data(symbol: str, start_date: date, days: int) -> pd.DataFrame:
-    rng = random.Random(abs(hash(symbol)) % 100000)
-    price = 20 + (abs(hash(symbol)) % 1000) / 50.0
-    data = []
-    for i in range(days):
-        current_date = start_date + timedelta(days=i)
-        drift = 0.0005
-        shock = rng.uniform(-0.02, 0.02)
-        price = max(1.0, price * (1 + drift + shock))
-        data.append(
-            {
-                "date": current_date,
-                "open": price * (1 - rng.uniform(0, 0.01)),
-                "high": price * (1 + rng.uniform(0, 0.01)),
-                "low": price * (1 - rng.uniform(0, 0.01)),
-                "close": price,
-                "volume": 1_000_000 + rng.randint(0, 500_000),
-            }
-        )
-    return pd.DataFrame(data)
+    seed = _symbol_seed(symbol)
+    rng = np.random.default_rng(seed)
+    start_price = 20 + (seed % 1000) / 50.0
+    drift = 0.0005
+    shocks = rng.uniform(-0.02, 0.02, days)
+    # price = max(1.0, prev * (1 + drift + shock)) restarts the walk at the
+    # floor; dividing by the running minimum (capped at 1) does the same
+    raw = start_price * np.cumprod(1 + drift + shocks)
+    close = raw / np.minimum(1.0, np.minimum.accumulate(raw))
+    return pd.DataFrame(
+        {
+            "date": pd.date_range(start_date, periods=days),
+            "open": close * (1 - rng.uniform(0, 0.01, days)),
+            "high": close * (1 + rng.uniform(0, 0.01, days)),
+            "low": close * (1 - rng.uniform(0, 0.01, days)),
+            "close": close,
+            "volume": 1_000_000 + rng.integers(0, 500_000, days, endpoint=True),
+        }
+    )
 
 
 async def main():
@@ -120,7 +219,9 @@ async def main():
     parser.add_argument("--index", type=str, default="000300.SH", help="Market index symbol")
     parser.add_argument("--max-dd", type=float, default=0.15, help="Max drawdown threshold")
     parser.add_argument("--use-simulated", action="store_true", help="Use simulated data if fetch fails")
-    parser.add_argument("--throttle", type=float, default=0.05, help="Sleep between requests (seconds)")
+    parser.add_argument("--throttle", type=float, default=0.05, help="Sleep between requests per worker (seconds)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent data requests")
+    parser.add_argument("--no-cache", action="store_true", help="Always re-download market data")
     args = parser.parse_args()
 
     stocks = _load_symbol_list(args.stock_list)
@@ -131,21 +232,36 @@ async def main():
     if not etfs:
         etfs = list(DEFAULT_ETF_UNIVERSE)
 
+    # Order-preserving dedup; dict.fromkeys beats pd.Index.unique at any universe size
     symbols = list(dict.fromkeys(stocks + etfs + [args.index, "511010.SH"]))
 
     end_date = date.today()
     start_date = end_date - timedelta(days=args.days)
 
     etf_symbols = set(etfs + ["511010.SH"])
+    sem = asyncio.Semaphore(max(1, args.concurrency))
+    use_cache = settings.HISTORY_CACHE_ENABLED and not args.no_cache
+    fetch = _fetch_akshare_cached if use_cache else _fetch_akshare
+
+    async def fetch_one(symbol: str) -> pd.DataFrame:
+        async with sem:
+            try:
+                df = await asyncio.to_thread(
+                    fetch, symbol, start_date, end_date, etf_symbols, args.index
+                )
+            except Exception:
+                df = pd.DataFrame()
+            if args.throttle:
+                # Hold the slot so each worker still spaces out its requests
+                await asyncio.sleep(args.throttle)
+            return df
+
+    frames = await asyncio.gather(*(fetch_one(symbol) for symbol in symbols))
+
     symbol_data = {}
     fetched = 0
     simulated = 0
-    for symbol in symbols:
-        try:
-            df = _fetch_akshare(symbol, start_date, end_date, etf_symbols, args.index)
-        except Exception:
-            df = pd.DataFrame()
-
+    for symbol, df in zip(symbols, frames):
         if df is None or df.empty:
             if args.use_simulated:
                 df = _simulate_data(symbol, start_date, args.days + 10)
@@ -160,8 +276,6 @@ async def main():
         df = df.sort_values("date").reset_index(drop=True)
         df = df.tail(args.days)
         symbol_data[symbol] = df
-        if args.throttle:
-            time.sleep(args.throttle)
 
     if args.index not in symbol_data:
         print(f"Missing index data for {args.index}.")
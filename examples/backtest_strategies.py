@@ -10,12 +10,22 @@ Usage:
 """
 
 import asyncio
+import io
+import os
 import sys
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 from datetime import date, timedelta
 from pathlib import Path
+import numpy as np
 import pandas as pd
 
+# Engines keep the shared market-data frame by reference; copy-on-write
+# (always on from pandas 3) gives each one isolation without eager copies
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -23,14 +33,38 @@ from src.backtest.engine import BacktestEngine
 from src.strategies.strategy_loader import StrategyLoader
 
 
-async def run_backtest(strategy, symbol: str, days: int = 60, use_real_data: bool = True):
+def load_real_data(symbol: str, days: int):
+    """Fetch the last `days` days of real market data for a symbol.
+
+    Returns:
+        DataFrame sorted by date, or None if the fetch failed
+    """
+    try:
+        from src.api.stock_api import fetch_history_df
+        print("Fetching real market data...")
+        test_df = fetch_history_df(symbol, days=days + 30)  # Fetch extra for buffer
+
+        if test_df is not None and not test_df.empty:
+            # fetch_history_df returns datetime64 dates in ascending order
+            test_df = test_df.tail(days)
+            print(f"✓ Successfully loaded {len(test_df)} days of real data")
+            return test_df
+
+        print("⚠ Failed to fetch real data, falling back to simulated data")
+    except Exception as e:
+        print(f"⚠ Error fetching real data: {e}")
+        print("  Falling back to simulated data")
+    return None
+
+
+async def run_backtest(strategy, symbol: str, days: int = 60, test_df: pd.DataFrame = None):
     """Run backtest for a strategy.
 
     Args:
         strategy: Strategy instance
         symbol: Stock symbol
         days: Number of days to backtest
-        use_real_data: Whether to use real market data (default: True)
+        test_df: Market data shared by all strategies (default: simulated data)
     """
     end_date = date.today()
     start_date = end_date - timedelta(days=days)
@@ -41,65 +75,35 @@ async def run_backtest(strategy, symbol: str, days: int = 60, use_real_data: boo
     print(f"Period: {start_date} to {end_date} ({days} days)")
     print(f"{'='*60}\n")
 
-    # Try to fetch real historical data
-    test_df = None
-    if use_real_data:
-        try:
-            from src.api.stock_api import fetch_history_df
-            print("Fetching real market data...")
-            test_df = fetch_history_df(symbol, days=days + 30)  # Fetch extra for buffer
-
-            if test_df is not None and not test_df.empty:
-                # Ensure date column is datetime
-                test_df['date'] = pd.to_datetime(test_df['date'])
-                # Sort by date
-                test_df = test_df.sort_values('date').reset_index(drop=True)
-                # Take last N days
-                test_df = test_df.tail(days)
-                print(f"✓ Successfully loaded {len(test_df)} days of real data")
-            else:
-                print("⚠ Failed to fetch real data, falling back to simulated data")
-                test_df = None
-        except Exception as e:
-            print(f"⚠ Error fetching real data: {e}")
-            print("  Falling back to simulated data")
-            test_df = None
-
     # Fallback: Generate simulated test data
     if test_df is None:
         print("Using simulated market data...")
         base_price = 40.0
-        test_data = []
-
-        for i in range(days):
-            current_date = start_date + timedelta(days=i)
-
-            # Simulate different price patterns for different strategies
-            if "moving_average" in strategy.name:
-                # Trending market
-                price = base_price + (i * 0.1) + (i % 5) * 0.5
-            elif "mean_reversion" in strategy.name:
-                # Oscillating market
-                import math
-                price = base_price + 5 * math.sin(i * 0.3)
-            elif "momentum" in strategy.name:
-                # Strong trend with pullbacks
-                trend = i * 0.15
-                volatility = (i % 7 - 3) * 0.3
-                price = base_price + trend + volatility
-            else:
-                price = base_price + (i * 0.05)
-
-            test_data.append({
-                'date': current_date,
-                'open': price - 0.2,
-                'high': price + 0.3,
-                'low': price - 0.3,
-                'close': price,
-                'volume': 8500000 + i * 100000
-            })
-
-        test_df = pd.DataFrame(test_data)
+        i = np.arange(days)
+
+        # Simulate different price patterns for different strategies
+        if "moving_average" in strategy.name:
+            # Trending market
+            price = base_price + (i * 0.1) + (i % 5) * 0.5
+        elif "mean_reversion" in strategy.name:
+            # Oscillating market
+            price = base_price + 5 * np.sin(i * 0.3)
+        elif "momentum" in strategy.name:
+            # Strong trend with pullbacks
+            trend = i * 0.15
+            volatility = (i % 7 - 3) * 0.3
+            price = base_price + trend + volatility
+        else:
+            price = base_price + (i * 0.05)
+
+        test_df = pd.DataFrame({
+            'date': pd.date_range(start_date, periods=days),
+            'open': price - 0.2,
+            'high': price + 0.3,
+            'low': price - 0.3,
+            'close': price,
+            'volume': 8500000 + i * 100000
+        })
 
     # Create backtest engine
     config = {
@@ -135,20 +139,31 @@ async def run_backtest(strategy, symbol: str, days: int = 60, use_real_data: boo
     # Display strategy indicators (MA values, etc.)
     print("\nSTRATEGY INDICATORS (last 5 days):")
     print("-" * 60)
-    for i in range(max(0, len(test_df) - 5), len(test_df)):
-        row = test_df.iloc[i]
-        date_str = row['date'].strftime('%Y-%m-%d') if hasattr(row['date'], 'strftime') else str(row['date'])[:10]
-        print(f"{date_str}: Close=¥{float(row['close']):.2f}, High=¥{float(row['high']):.2f}, Low=¥{float(row['low']):.2f}")
-
-        # Show MA values if strategy has them
-        indicators = strategy.get_indicators(symbol)
-        if indicators:
-            if 'fast_ma' in indicators and 'slow_ma' in indicators:
-                print(f"  MA({strategy.fast_period})=¥{indicators['fast_ma']:.2f}, MA({strategy.slow_period})=¥{indicators['slow_ma']:.2f}")
-            elif 'bb_upper' in indicators:
-                print(f"  BB_Upper=¥{indicators['bb_upper']:.2f}, BB_Lower=¥{indicators['bb_lower']:.2f}, RSI={indicators.get('rsi', 0):.2f}")
-            elif 'momentum' in indicators:
-                print(f"  Momentum={indicators['momentum']:.2f}%")
+    # Show MA values if strategy has them (final state, the same for every row)
+    indicators = strategy.get_indicators(symbol)
+    indicator_line = None
+    if indicators:
+        if 'fast_ma' in indicators and 'slow_ma' in indicators:
+            indicator_line = f"  MA({strategy.fast_period})=¥{indicators['fast_ma']:.2f}, MA({strategy.slow_period})=¥{indicators['slow_ma']:.2f}"
+        elif 'bb_upper' in indicators:
+            indicator_line = f"  BB_Upper=¥{indicators['bb_upper']:.2f}, BB_Lower=¥{indicators['bb_lower']:.2f}, RSI={indicators.get('rsi', 0):.2f}"
+        elif 'momentum' in indicators:
+            indicator_line = f"  Momentum={indicators['momentum']:.2f}%"
+
+    # Collect the rows and write them with a single print
+    tail = test_df.tail(5)
+    lines = []
+    for date_str, close, high, low in zip(
+        tail['date'].dt.strftime('%Y-%m-%d'),
+        tail['close'].to_numpy(dtype=float),
+        tail['high'].to_numpy(dtype=float),
+        tail['low'].to_numpy(dtype=float)
+    ):
+        lines.append(f"{date_str}: Close=¥{close:.2f}, High=¥{high:.2f}, Low=¥{low:.2f}")
+        if indicator_line:
+            lines.append(indicator_line)
+    if lines:
+        print("\n".join(lines))
 
     # Display results
     print("\n" + "="*60)
@@ -165,30 +180,43 @@ async def run_backtest(strategy, symbol: str, days: int = 60, use_real_data: boo
 
     # Display trades
     if results['trades']:
-        print(f"\nTRADE HISTORY:")
-        print("-" * 60)
-        for i, trade in enumerate(results['trades'][:10], 1):  # Show first 10
-            print(
-                f"{i}. {trade['timestamp'].strftime('%Y-%m-%d')} "
-                f"{trade['side'].value:4s} {trade['quantity']:5d} shares "
-                f"@ ¥{float(trade['price']):6.2f}"
-            )
+        lines = ["\nTRADE HISTORY:", "-" * 60]
+        lines.extend(
+            f"{i}. {trade['timestamp']:%Y-%m-%d} "
+            f"{trade['side'].value:4s} {trade['quantity']:5d} shares "
+            f"@ ¥{float(trade['price']):6.2f}"
+            for i, trade in enumerate(results['trades'][:10], 1)  # Show first 10
+        )
         if len(results['trades']) > 10:
-            print(f"... and {len(results['trades']) - 10} more trades")
+            lines.append(f"... and {len(results['trades']) - 10} more trades")
+        print("\n".join(lines))
 
     # Display final positions
     if results['positions']:
-        print(f"\nFINAL POSITIONS:")
-        print("-" * 60)
-        for symbol, qty in results['positions'].items():
-            if qty > 0:
-                print(f"{symbol}: {qty} shares")
+        lines = ["\nFINAL POSITIONS:", "-" * 60]
+        lines.extend(
+            f"{held_symbol}: {qty} shares"
+            for held_symbol, qty in results['positions'].items() if qty > 0
+        )
+        print("\n".join(lines))
 
     print("="*60 + "\n")
 
     return results
 
 
+def _run_backtest_worker(strategy, symbol: str, days: int, test_df: pd.DataFrame):
+    """Run one backtest in a worker process.
+
+    Returns:
+        Tuple of (results, captured report text)
+    """
+    report = io.StringIO()
+    with redirect_stdout(report):
+        results = asyncio.run(run_backtest(strategy, symbol, days, test_df=test_df))
+    return results, report.getvalue()
+
+
 async def main():
     """Main function."""
     parser = argparse.ArgumentParser(description="Backtest trading strategies")
@@ -221,6 +249,11 @@ async def main():
         action='store_true',
         help='Use simulated data instead of real market data'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Parallel backtest processes (default: CPU count, 1 = sequential)'
+    )
 
     args = parser.parse_args()
 
@@ -259,15 +292,37 @@ async def main():
     # Run backtests
     print(f"\nBacktesting {len(strategies)} strategy(ies)...")
 
+    # Every strategy backtests the same symbol and window: fetch once
+    test_df = None if args.use_simulated else load_real_data(args.symbol, args.days)
+    workers = min(len(strategies), args.workers or os.cpu_count() or 1)
+
     results_list = []
-    for strategy in strategies:
-        result = await run_backtest(
-            strategy,
-            args.symbol,
-            args.days,
-            use_real_data=not args.use_simulated
-        )
-        results_list.append((strategy.name, result))
+    if workers <= 1:
+        for strategy in strategies:
+            result = await run_backtest(strategy, args.symbol, args.days, test_df=test_df)
+            results_list.append((strategy.name, result))
+    else:
+        # Backtests are independent and CPU-bound: one process per strategy,
+        # reports printed in strategy order once each one finishes
+        loop = asyncio.get_running_loop()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                loop.run_in_executor(
+                    pool, _run_backtest_worker, strategy, args.symbol, args.days, test_df
+                )
+                for strategy in strategies
+            ]
+            try:
+                for strategy, future in zip(strategies, futures):
+                    result, report = await future
+                    print(report, end='')
+                    results_list.append((strategy.name, result))
+            except BaseException:
+                # Fail fast: drop backtests that have not started yet instead
+                # of letting the pool run them before the error surfaces
+                for future in futures:
+                    future.cancel()
+                raise
 
     # Compare results if multiple strategies
     if len(results_list) > 1:
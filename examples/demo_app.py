@@ -1,14 +1,27 @@
 # demo_app.py - Simplified demo version for stock query
 import json
+import os
 import random
-from datetime import datetime, timedelta
+import sys
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
 from flask import Flask, jsonify, request
 from flask_cors import CORS
 import pandas as pd
 import numpy as np
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.json_provider import ORJSON_AVAILABLE, OrjsonProvider
+
 app = Flask(__name__)
 CORS(app)
+if ORJSON_AVAILABLE:
+    # jsonify() encodes in one orjson pass
+    app.json = OrjsonProvider(app)
+
+_rng = np.random.default_rng()
 
 # Mock stock database (A-share + HK stocks)
 MOCK_STOCKS = {
@@ -88,50 +101,135 @@ MOCK_STOCKS = {
     }
 }
 
-def generate_mock_price_data(stock_code, days=30):
-    """Generate mock historical price data"""
-    if stock_code not in MOCK_STOCKS:
-        return []
+# Immutable per-stock fields served by get_stock_info, built once at import
+_STATIC_INFO = {
+    code: {key: stock[key] for key in ('code', 'name', 'exchange', 'industry', 'market_cap')}
+    for code, stock in MOCK_STOCKS.items()
+}
+
+RECOMMENDATION_ACTIONS = ('buy', 'hold', 'sell')
+
+# Hand-written analysis for featured stocks: stock_code -> (action, confidence, reasoning)
+_SPECIFIC_RECOS = {
+    # SERES
+    "601127.SH": ("buy", 0.72, """技术分析显示：1) 新能源汽车行业景气度高，政策支持持续; 2) 公司与华为深度合作，智能化优势明显; 3) 近期成交量放大，资金关注度提升; 4) RSI指标显示超跌反弹机会; 5) 20日均线支撑有效，技术形态良好。建议关注新车型交付情况及华为合作进展。"""),
+    # Inspur
+    "000977.SZ": ("hold", 0.68, """综合分析显示：1) AI服务器龙头地位稳固，受益于人工智能产业发展; 2) 与OpenAI、百度等头部AI公司深度合作，订单饱满; 3) 但估值相对偏高，短期调整压力较大; 4) 技术指标显示震荡整理，突破方向待定; 5) 建议等待更好买入时机。重点关注AI算力需求变化及新产品发布。"""),
+    # Yangtze Power
+    "600900.SH": ("buy", 0.75, """价值分析显示：1) 水电龙头企业，拥有三峡、葛洲坝等优质水电资产，现金流稳定; 2) 股息率约4.5%，分红政策稳定，适合价值投资; 3) 受益于碳中和政策，清洁能源地位突出; 4) 技术面显示长期上升趋势完好，回调提供买入机会; 5) 防御性强，在市场波动中表现稳健。建议长期持有，关注来水情况及电价政策。"""),
+}
+
+PRICE_FIELDS = ('timestamp', 'open', 'high', 'low', 'close', 'volume', 'change_pct')
+
+def generate_mock_price_columns(stock_code, days=30):
+    """Generate mock historical price data as one list per field"""
+    stock = MOCK_STOCKS.get(stock_code)
+    if stock is None:
+        return None
     
-    base_price = MOCK_STOCKS[stock_code]["base_price"]
-    data = []
+    base_price = stock["base_price"]
     
-    for i in range(days):
-        date = datetime.now() - timedelta(days=days-i-1)
-        
-        # Generate realistic price movements
-        change_pct = random.uniform(-5, 5)
-        price = base_price * (1 + change_pct/100)
-        
-        data.append({
-            'timestamp': date.isoformat(),
+    # Draw the whole random walk at once; each close carries forward from the previous day
+    change_pct = _rng.uniform(-5, 5, days)
+    close = base_price * np.cumprod(1 + change_pct / 100)
+    volume = _rng.integers(1000000, 50000000, days, endpoint=True)
+    dates = pd.date_range(end=pd.Timestamp.now(), periods=days, freq='D')
+    
+    return {
+        # One C-level pass instead of a Timestamp.isoformat() call per day
+        'timestamp': np.datetime_as_string(dates.to_numpy(), unit='us').tolist(),
+        'open': (close * 0.998).tolist(),
+        'high': (close * 1.025).tolist(),
+        'low': (close * 0.975).tolist(),
+        'close': close.tolist(),
+        'volume': volume.tolist(),
+        'change_pct': change_pct.tolist()
+    }
+
+def generate_mock_price_data(stock_code, days=30):
+    """Generate mock historical price data"""
+    if days == 1:
+        # Latest-quote path used by get_stock_info and scan_stocks: skip the array machinery
+        stock = MOCK_STOCKS.get(stock_code)
+        if stock is None:
+            return []
+        change_pct = float(_rng.uniform(-5, 5))
+        price = stock["base_price"] * (1 + change_pct / 100)
+        return [{
+            'timestamp': datetime.now().isoformat(),
             'open': price * 0.998,
-            'high': price * 1.025, 
+            'high': price * 1.025,
             'low': price * 0.975,
             'close': price,
-            'volume': random.randint(1000000, 50000000),
+            'volume': int(_rng.integers(1000000, 50000000, endpoint=True)),
             'change_pct': change_pct
-        })
-        
-        base_price = price  # Carry forward for next day
+        }]
+    
+    columns = generate_mock_price_columns(stock_code, days)
+    if columns is None:
+        return []
     
-    return data
+    return [
+        dict(zip(PRICE_FIELDS, row))
+        for row in zip(*(columns[field] for field in PRICE_FIELDS))
+    ]
 
-def calculate_technical_indicators(stock_code):
-    """Calculate mock technical indicators"""
-    # Generate mock technical indicators for demo
-    return {
-        'price_momentum_5d': random.uniform(-10, 10),
-        'price_momentum_20d': random.uniform(-15, 15), 
-        'ma_5_ratio': random.uniform(0.95, 1.05),
-        'ma_20_ratio': random.uniform(0.90, 1.10),
-        'rsi': random.uniform(20, 80),
-        'macd': random.uniform(-2, 2),
-        'bb_position': random.uniform(0, 1),
-        'volume_ratio': random.uniform(0.5, 2.0),
-        'volatility': random.uniform(2, 8),
-        'avg_volume': random.randint(5000000, 30000000)
+# Streamed timelines (?stream=1) are sent in batches of STREAM_BATCH_ROWS points
+STREAM_BATCH_ROWS = 64
+
+def stream_timeline(stock_code, range_param, columns):
+    """Yield the timeline JSON in chunks, building row dicts one batch at a time"""
+    dumps = app.json.dumps
+    rows = zip(*(columns[field] for field in PRICE_FIELDS))
+    # Envelope keys are written alphabetically, as jsonify() orders them while
+    # the provider's sort_keys is on (the default); rows go through the provider
+    yield '{"data":['
+    separator = ''
+    while True:
+        batch = [dumps(dict(zip(PRICE_FIELDS, row))) for row in islice(rows, STREAM_BATCH_ROWS)]
+        if not batch:
+            break
+        yield separator + ','.join(batch)
+        separator = ','
+    yield f'],"range":{dumps(range_param)},"stock_code":{dumps(stock_code)}}}\n'
+
+def calculate_technical_indicators(stock_code, days=60):
+    """Calculate technical indicators over a mock price series"""
+    columns = generate_mock_price_columns(stock_code, days)
+    close = pd.Series(columns['close'])
+    volume = pd.Series(columns['volume'])
+    last = close.iloc[-1]
+    
+    # Each indicator is one vectorized pandas pass over the whole series
+    ma_5 = close.rolling(5).mean().iloc[-1]
+    ma_20 = close.rolling(20).mean()
+    std_20 = close.rolling(20).std()
+    
+    delta = close.diff()
+    gain = delta.clip(lower=0).ewm(alpha=1/14, adjust=False).mean().iloc[-1]
+    loss = (-delta.clip(upper=0)).ewm(alpha=1/14, adjust=False).mean().iloc[-1]
+    rsi = 100.0 if loss == 0 else 100 - 100 / (1 + gain / loss)
+    
+    macd = (close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()).iloc[-1]
+    
+    bb_upper = ma_20.iloc[-1] + 2 * std_20.iloc[-1]
+    bb_lower = ma_20.iloc[-1] - 2 * std_20.iloc[-1]
+    avg_volume = volume.iloc[-20:].mean()
+    
+    features = {
+        'price_momentum_5d': (last / close.iloc[-6] - 1) * 100,
+        'price_momentum_20d': (last / close.iloc[-21] - 1) * 100,
+        'ma_5_ratio': last / ma_5,
+        'ma_20_ratio': last / ma_20.iloc[-1],
+        'rsi': rsi,
+        'macd': macd,
+        'bb_position': (last - bb_lower) / (bb_upper - bb_lower),
+        'volume_ratio': volume.iloc[-5:].mean() / avg_volume,
+        'volatility': close.pct_change().iloc[-20:].std() * 100
     }
+    features = {name: float(value) for name, value in features.items()}
+    features['avg_volume'] = int(avg_volume)
+    return features
 
 def generate_recommendation(stock_code):
     """Generate mock investment recommendation"""
@@ -139,24 +237,11 @@ def generate_recommendation(stock_code):
         return None
     
     # Mock ML recommendation based on stock characteristics
-    if "赛力斯" in MOCK_STOCKS[stock_code]["name"]:
-        # Specific analysis for SERES
-        action = "buy"  
-        confidence = 0.72
-        reasoning = """技术分析显示：1) 新能源汽车行业景气度高，政策支持持续; 2) 公司与华为深度合作，智能化优势明显; 3) 近期成交量放大，资金关注度提升; 4) RSI指标显示超跌反弹机会; 5) 20日均线支撑有效，技术形态良好。建议关注新车型交付情况及华为合作进展。"""
-    elif "浪潮信息" in MOCK_STOCKS[stock_code]["name"]:
-        # Specific analysis for Inspur
-        action = "hold"
-        confidence = 0.68
-        reasoning = """综合分析显示：1) AI服务器龙头地位稳固，受益于人工智能产业发展; 2) 与OpenAI、百度等头部AI公司深度合作，订单饱满; 3) 但估值相对偏高，短期调整压力较大; 4) 技术指标显示震荡整理，突破方向待定; 5) 建议等待更好买入时机。重点关注AI算力需求变化及新产品发布。"""
-    elif "长江电力" in MOCK_STOCKS[stock_code]["name"]:
-        # Specific analysis for Yangtze Power
-        action = "buy"
-        confidence = 0.75
-        reasoning = """价值分析显示：1) 水电龙头企业，拥有三峡、葛洲坝等优质水电资产，现金流稳定; 2) 股息率约4.5%，分红政策稳定，适合价值投资; 3) 受益于碳中和政策，清洁能源地位突出; 4) 技术面显示长期上升趋势完好，回调提供买入机会; 5) 防御性强，在市场波动中表现稳健。建议长期持有，关注来水情况及电价政策。"""
+    specific = _SPECIFIC_RECOS.get(stock_code)
+    if specific:
+        action, confidence, reasoning = specific
     else:
-        actions = ['buy', 'hold', 'sell']
-        action = random.choice(actions)
+        action = random.choice(RECOMMENDATION_ACTIONS)
         confidence = random.uniform(0.5, 0.9)
         reasoning = f"基于多因子模型分析，当前技术指标偏向{action}，置信度{confidence:.2f}"
     
@@ -172,21 +257,17 @@ def generate_recommendation(stock_code):
 @app.route('/api/stocks/<stock_code>')
 def get_stock_info(stock_code):
     """Get stock information"""
-    if stock_code not in MOCK_STOCKS:
+    static_info = _STATIC_INFO.get(stock_code)
+    if static_info is None:
         return jsonify({'error': '股票代码不存在'}), 404
     
-    stock = MOCK_STOCKS[stock_code]
     latest_prices = generate_mock_price_data(stock_code, 1)
     latest_price = latest_prices[0] if latest_prices else None
     
     recommendation = generate_recommendation(stock_code)
     
     return jsonify({
-        'code': stock['code'],
-        'name': stock['name'], 
-        'exchange': stock['exchange'],
-        'industry': stock['industry'],
-        'market_cap': stock['market_cap'],
+        **static_info,
         'current_price': latest_price['close'] if latest_price else None,
         'change_pct': latest_price['change_pct'] if latest_price else None,
         'volume': latest_price['volume'] if latest_price else None,
@@ -212,7 +293,18 @@ def get_stock_timeline(stock_code):
     }
     
     days = range_days.get(range_param, 30)
-    price_data = generate_mock_price_data(stock_code, days)
+    # ?format=columnar returns {field: [values...]} instead of a list of points
+    if request.args.get('format') == 'columnar':
+        price_data = generate_mock_price_columns(stock_code, days)
+    else:
+        # ?stream=1 opts in to a chunked response; the default stays one jsonify() body
+        if request.args.get('stream') == '1':
+            columns = generate_mock_price_columns(stock_code, days)
+            return app.response_class(
+                stream_timeline(stock_code, range_param, columns),
+                mimetype=app.json.mimetype
+            )
+        price_data = generate_mock_price_data(stock_code, days)
     
     return jsonify({
         'stock_code': stock_code,
@@ -242,18 +334,21 @@ def scan_stocks():
     industry = request.args.get('industry')
     action_filter = request.args.get('action')
     
+    # Cheap metadata filter first; prices are only generated for stocks that survive every filter
+    candidates = [
+        (code, stock) for code, stock in MOCK_STOCKS.items()
+        if not industry or stock['industry'] == industry
+    ]
+    
     results = []
-    for code, stock in MOCK_STOCKS.items():
-        if industry and stock['industry'] != industry:
+    for code, stock in candidates:
+        recommendation = generate_recommendation(code)
+        if action_filter and recommendation['action'] != action_filter:
             continue
             
         latest_prices = generate_mock_price_data(code, 1)
         latest_price = latest_prices[0] if latest_prices else {}
         
-        recommendation = generate_recommendation(code)
-        if action_filter and recommendation['action'] != action_filter:
-            continue
-            
         results.append({
             'code': stock['code'],
             'name': stock['name'],
@@ -302,4 +397,15 @@ def index():
     })
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    # FLASK_DEBUG=1 keeps the reloading debug server; otherwise serve without
+    # debug instrumentation. Multi-process alternative (from examples/):
+    #   gunicorn -w 4 -b 0.0.0.0:5000 demo_app:app
+    if os.getenv('FLASK_DEBUG') == '1':
+        app.run(host='0.0.0.0', port=5000, debug=True)
+    else:
+        try:
+            from waitress import serve
+        except ImportError:
+            app.run(host='0.0.0.0', port=5000, debug=False, threaded=True)
+        else:
+            serve(app, host='0.0.0.0', port=5000, threads=8)
\ No newline at end of file
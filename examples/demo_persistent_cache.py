@@ -2,21 +2,22 @@
 """Demo script to show persistent cache functionality"""
 import sys
 import time
-from src.cache.persistent_cache import get_persistent_cache
+from concurrent.futures import ThreadPoolExecutor
+from src.cache.persistent_cache import PersistentCacheManager, get_persistent_cache
 
-def demo_basic_usage():
+def demo_basic_usage(cache):
     """Demonstrate basic cache operations"""
     print("=" * 60)
     print("DEMO 1: Basic Cache Operations")
     print("=" * 60)
 
-    cache = get_persistent_cache("demo_cache.db")
-
     # Set some values
     print("\n1. Setting cache values...")
-    cache.set("stock:600036.SH", {"name": "招商银行", "price": 45.5}, ttl=60)
-    cache.set("stock:000977.SZ", {"name": "浪潮信息", "price": 75.96}, ttl=60)
-    cache.set("stock:159920.SZ", {"name": "恒生ETF", "price": 1.61}, ttl=60)
+    cache.set_many({
+        "stock:600036.SH": {"name": "招商银行", "price": 45.5},
+        "stock:000977.SZ": {"name": "浪潮信息", "price": 75.96},
+        "stock:159920.SZ": {"name": "恒生ETF", "price": 1.61},
+    }, ttl=60)
     print("   ✓ Cached 3 stocks")
 
     # Get values
@@ -46,7 +47,10 @@ def demo_expiration():
     print("DEMO 2: Cache Expiration")
     print("=" * 60)
 
-    cache = get_persistent_cache("demo_cache.db")
+    # A private manager on the same database with a hand-driven clock, so
+    # the TTL can be crossed without sleeping
+    now = [time.time()]
+    cache = PersistentCacheManager("demo_cache.db", clock=lambda: now[0])
 
     # Set with short TTL
     print("\n1. Setting value with 2-second TTL...")
@@ -59,20 +63,18 @@ def demo_expiration():
     print(f"   Retrieved: {value}")
 
     # Wait and retry
-    print("\n3. Waiting 2.5 seconds...")
-    time.sleep(2.5)
+    print("\n3. Advancing the clock 2.5 seconds...")
+    now[0] += 2.5
     value = cache.get("temp:test")
     print(f"   After expiration: {value}")
 
 
-def demo_invalidation():
+def demo_invalidation(cache):
     """Demonstrate cache invalidation"""
     print("\n" + "=" * 60)
     print("DEMO 3: Cache Invalidation")
     print("=" * 60)
 
-    cache = get_persistent_cache("demo_cache.db")
-
     # Set multiple values
     print("\n1. Setting multiple values...")
     cache.set("fund:600036.SH", {"pe": 5.5}, ttl=3600, data_type="fundamental", stock_code="600036.SH")
@@ -104,7 +106,19 @@ def demo_invalidation():
     print(f"   sent:600036.SH after invalidation: {sent1}")
 
 
-def demo_real_world():
+def fetch_analysis(fundamental_provider, sentiment_provider, stock_code):
+    """Fetch fundamental and sentiment data for a stock concurrently
+
+    The two providers crawl different sites, so a cold fetch takes as long
+    as the slower one rather than the sum of both.
+    """
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        fundamental = executor.submit(fundamental_provider.get_fundamental_analysis, stock_code)
+        sentiment = executor.submit(sentiment_provider.get_sentiment_analysis, stock_code)
+        return fundamental.result(), sentiment.result()
+
+
+def demo_real_world(cache):
     """Demonstrate real-world usage with stock analysis"""
     print("\n" + "=" * 60)
     print("DEMO 4: Real-World Usage - Stock Analysis Cache")
@@ -121,8 +135,7 @@ def demo_real_world():
     # First request (will crawl/fetch)
     print(f"\n1. First request for {stock_code} (cold cache)...")
     start = time.time()
-    fundamental = fundamental_provider.get_fundamental_analysis(stock_code)
-    sentiment = sentiment_provider.get_sentiment_analysis(stock_code)
+    fundamental, sentiment = fetch_analysis(fundamental_provider, sentiment_provider, stock_code)
     first_time = time.time() - start
     print(f"   ✓ Completed in {first_time:.2f}s")
     if fundamental:
@@ -133,14 +146,12 @@ def demo_real_world():
     # Second request (from cache)
     print(f"\n2. Second request for {stock_code} (hot cache)...")
     start = time.time()
-    fundamental = fundamental_provider.get_fundamental_analysis(stock_code)
-    sentiment = sentiment_provider.get_sentiment_analysis(stock_code)
+    fundamental, sentiment = fetch_analysis(fundamental_provider, sentiment_provider, stock_code)
     second_time = time.time() - start
     print(f"   ✓ Completed in {second_time:.2f}s")
     print(f"   Speedup: {first_time/second_time:.1f}x faster")
 
     # Cache stats
-    cache = get_persistent_cache()
     stats = cache.get_stats()
     print(f"\n3. Final cache statistics:")
     print(f"   Total entries: {stats['total_entries']}")
@@ -148,24 +159,25 @@ def demo_real_world():
     print(f"   Database size: {stats['db_size_mb']} MB")
 
 
-def cleanup():
+def cleanup(cache):
     """Cleanup demo cache"""
     print("\n" + "=" * 60)
     print("Cleanup")
     print("=" * 60)
-    cache = get_persistent_cache("demo_cache.db")
     cache.clear_all()
     print("✓ All demo cache cleared")
 
 
 if __name__ == "__main__":
+    # Created first, so the providers in demo_real_world share this instance
+    cache = get_persistent_cache("demo_cache.db")
     try:
-        demo_basic_usage()
+        demo_basic_usage(cache)
         demo_expiration()
-        demo_invalidation()
-        demo_real_world()
+        demo_invalidation(cache)
+        demo_real_world(cache)
     finally:
-        cleanup()
+        cleanup(cache)
         print("\n" + "=" * 60)
         print("Demo completed!")
         print("=" * 60)
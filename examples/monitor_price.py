@@ -107,8 +107,8 @@ async def monitor_stock(
             else:
                 print("⚠️ Data fetch failed")
 
-            # Wait for next check
-            await asyncio.sleep(check_interval)
+            # Wait for next check; a newly created alert triggers it early
+            await alert_manager.wait_for_new_alert(check_interval)
 
     except KeyboardInterrupt:
         print("\n\n✓ Monitoring stopped")
@@ -7,12 +7,14 @@ Usage:
 """
 
 import asyncio
+import os
 import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
 from datetime import date, timedelta
 from pathlib import Path
 import argparse
 import pandas as pd
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import itertools
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -21,15 +23,11 @@ from src.backtest.engine import BacktestEngine
 from src.strategies import MovingAverageCrossover, MeanReversion, Momentum
 
 
-async def backtest_with_params(strategy_class, params: Dict, symbol: str, df: pd.DataFrame, days: int):
-    """Run backtest with specific parameters."""
+def create_engine(days: int) -> BacktestEngine:
+    """Create a backtest engine over the last `days` days."""
     end_date = date.today()
     start_date = end_date - timedelta(days=days)
 
-    # Create strategy with custom params
-    strategy = strategy_class(config=params)
-
-    # Create backtest engine
     config = {
         'costs': {
             'commission_rate': 0.0001,
@@ -43,15 +41,38 @@ async def backtest_with_params(strategy_class, params: Dict, symbol: str, df: pd
         }
     }
 
-    engine = BacktestEngine(
+    return BacktestEngine(
         start_date=start_date,
         end_date=end_date,
         initial_capital=1000000.0,
         config=config
     )
 
-    # Load market data
-    engine.load_market_data(symbol, df)
+
+def load_market(symbol: str, df: pd.DataFrame, days: int) -> BacktestEngine:
+    """Load the market data once into an engine that grid points share it from."""
+    market = create_engine(days)
+    market.load_market_data(symbol, df)
+    return market
+
+
+async def backtest_with_params(strategy_class, params: Dict, symbol: str, df: pd.DataFrame, days: int,
+                               market: Optional[BacktestEngine] = None):
+    """Run backtest with specific parameters.
+
+    Args:
+        market: Engine from load_market() with `df` already loaded; its
+            prepared rows are reused instead of loading `df` again
+    """
+    # Create strategy with custom params
+    strategy = strategy_class(config=params)
+
+    # Fresh engine (cash, positions, queue) per run; market data is shared
+    engine = create_engine(days)
+    if market is not None:
+        engine.share_market_data(market)
+    else:
+        engine.load_market_data(symbol, df)
 
     # Add strategy
     engine.add_strategy(strategy)
@@ -62,7 +83,49 @@ async def backtest_with_params(strategy_class, params: Dict, symbol: str, df: pd
     return results
 
 
-async def optimize_moving_average(symbol: str, df: pd.DataFrame, days: int):
+# Market data of a pool worker process, set once by _init_worker
+_worker_data: Optional[Tuple[str, pd.DataFrame, int, BacktestEngine]] = None
+
+
+def _init_worker(symbol: str, df: pd.DataFrame, days: int):
+    """Receive and load the market data once per worker instead of once per grid point."""
+    global _worker_data
+    _worker_data = (symbol, df, days, load_market(symbol, df, days))
+
+
+def _run_backtest_worker(strategy_class, params: Dict) -> Dict:
+    """Run one grid point in a worker process."""
+    symbol, df, days, market = _worker_data
+    return asyncio.run(backtest_with_params(strategy_class, params, symbol, df, days, market))
+
+
+async def run_grid(strategy_class, param_grid: List[Dict], symbol: str, df: pd.DataFrame, days: int,
+                   executor: Optional[Executor] = None) -> List[Dict]:
+    """Backtest every parameter set concurrently; results follow grid order.
+
+    Args:
+        executor: Process pool set up by _init_worker with the same market data;
+            without one the grid runs on the current event loop
+    """
+    if executor is not None:
+        loop = asyncio.get_running_loop()
+        return await asyncio.gather(*(
+            loop.run_in_executor(executor, _run_backtest_worker, strategy_class, params)
+            for params in param_grid
+        ))
+
+    market = load_market(symbol, df, days)
+    semaphore = asyncio.Semaphore(os.cpu_count() or 1)
+
+    async def bounded(params: Dict):
+        async with semaphore:
+            return await backtest_with_params(strategy_class, params, symbol, df, days, market)
+
+    return await asyncio.gather(*(bounded(params) for params in param_grid))
+
+
+async def optimize_moving_average(symbol: str, df: pd.DataFrame, days: int,
+                                  executor: Optional[Executor] = None):
     """Optimize Moving Average Crossover strategy parameters."""
     print("\n" + "="*70)
     print("OPTIMIZING MOVING AVERAGE CROSSOVER STRATEGY")
@@ -72,41 +135,31 @@ async def optimize_moving_average(symbol: str, df: pd.DataFrame, days: int):
     fast_periods = [3, 5, 8, 10]
     slow_periods = [10, 15, 20, 30]
 
-    best_result = None
-    best_params = None
-    best_return = -999999
-
-    results_list = []
-
-    total_combinations = len(fast_periods) * len(slow_periods)
-    current = 0
-
-    for fast, slow in itertools.product(fast_periods, slow_periods):
-        if fast >= slow:
-            continue
-
-        current += 1
-        params = {
+    param_grid = [
+        {
             'fast_period': fast,
             'slow_period': slow,
             'signal_strength': 0.8
         }
+        for fast, slow in itertools.product(fast_periods, slow_periods)
+        if fast < slow
+    ]
+    total_combinations = len(fast_periods) * len(slow_periods)
 
-        print(f"\nTesting [{current}/{total_combinations}]: MA({fast},{slow})...", end='')
-
-        result = await backtest_with_params(
-            MovingAverageCrossover,
-            params,
-            symbol,
-            df,
-            days
-        )
+    results = await run_grid(MovingAverageCrossover, param_grid, symbol, df, days, executor)
 
+    results_list = []
+    for current, (params, result) in enumerate(zip(param_grid, results), 1):
+        fast = params['fast_period']
+        slow = params['slow_period']
         total_return = result['total_return']
         sharpe = result['sharpe_ratio']
         trades = result['total_trades']
 
-        print(f" Return={total_return:>7.2%}, Sharpe={sharpe:>6.3f}, Trades={trades:>3d}")
+        print(
+            f"\nTesting [{current}/{total_combinations}]: MA({fast},{slow})..."
+            f" Return={total_return:>7.2%}, Sharpe={sharpe:>6.3f}, Trades={trades:>3d}"
+        )
 
         results_list.append({
             'params': f"MA({fast},{slow})",
@@ -118,10 +171,8 @@ async def optimize_moving_average(symbol: str, df: pd.DataFrame, days: int):
             'max_dd': result['max_drawdown']
         })
 
-        if total_return > best_return:
-            best_return = total_return
-            best_params = params
-            best_result = result
+    # First grid point wins ties, as in a sequential scan
+    best_params, best_result = max(zip(param_grid, results), key=lambda pr: pr[1]['total_return'])
 
     # Display results
     print("\n" + "="*70)
@@ -153,7 +204,8 @@ async def optimize_moving_average(symbol: str, df: pd.DataFrame, days: int):
     return best_params, best_result
 
 
-async def optimize_mean_reversion(symbol: str, df: pd.DataFrame, days: int):
+async def optimize_mean_reversion(symbol: str, df: pd.DataFrame, days: int,
+                                  executor: Optional[Executor] = None):
     """Optimize Mean Reversion strategy parameters."""
     print("\n" + "="*70)
     print("OPTIMIZING MEAN REVERSION STRATEGY")
@@ -164,18 +216,8 @@ async def optimize_mean_reversion(symbol: str, df: pd.DataFrame, days: int):
     bb_std_devs = [1.5, 2.0, 2.5]
     rsi_oversolds = [25, 30, 35]
 
-    best_result = None
-    best_params = None
-    best_return = -999999
-
-    results_list = []
-
-    total_combinations = len(bb_periods) * len(bb_std_devs) * len(rsi_oversolds)
-    current = 0
-
-    for bb_period, bb_std, rsi_os in itertools.product(bb_periods, bb_std_devs, rsi_oversolds):
-        current += 1
-        params = {
+    param_grid = [
+        {
             'bb_period': bb_period,
             'bb_std_dev': bb_std,
             'rsi_period': 14,
@@ -183,22 +225,25 @@ async def optimize_mean_reversion(symbol: str, df: pd.DataFrame, days: int):
             'rsi_overbought': 70,
             'signal_strength': 0.7
         }
+        for bb_period, bb_std, rsi_os in itertools.product(bb_periods, bb_std_devs, rsi_oversolds)
+    ]
+    total_combinations = len(param_grid)
 
-        print(f"\nTesting [{current}/{total_combinations}]: BB({bb_period},{bb_std:.1f}), RSI<{rsi_os}...", end='')
-
-        result = await backtest_with_params(
-            MeanReversion,
-            params,
-            symbol,
-            df,
-            days
-        )
+    results = await run_grid(MeanReversion, param_grid, symbol, df, days, executor)
 
+    results_list = []
+    for current, (params, result) in enumerate(zip(param_grid, results), 1):
+        bb_period = params['bb_period']
+        bb_std = params['bb_std_dev']
+        rsi_os = params['rsi_oversold']
         total_return = result['total_return']
         sharpe = result['sharpe_ratio']
         trades = result['total_trades']
 
-        print(f" Return={total_return:>7.2%}, Sharpe={sharpe:>6.3f}, Trades={trades:>3d}")
+        print(
+            f"\nTesting [{current}/{total_combinations}]: BB({bb_period},{bb_std:.1f}), RSI<{rsi_os}..."
+            f" Return={total_return:>7.2%}, Sharpe={sharpe:>6.3f}, Trades={trades:>3d}"
+        )
 
         results_list.append({
             'params': f"BB({bb_period},{bb_std:.1f}),RSI<{rsi_os}",
@@ -208,10 +253,7 @@ async def optimize_mean_reversion(symbol: str, df: pd.DataFrame, days: int):
             'max_dd': result['max_drawdown']
         })
 
-        if total_return > best_return:
-            best_return = total_return
-            best_params = params
-            best_result = result
+    best_params, best_result = max(zip(param_grid, results), key=lambda pr: pr[1]['total_return'])
 
     # Display results
     print("\n" + "="*70)
@@ -262,6 +304,11 @@ async def main():
         default=120,
         help='Number of days to backtest (recommended: 90-180)'
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Parallel backtest processes (default: CPU count, 1 = in-process)'
+    )
 
     args = parser.parse_args()
 
@@ -287,15 +334,28 @@ async def main():
         print(f"✗ Error fetching data: {e}")
         return 1
 
-    # Run optimization
-    if args.strategy == 'moving_average':
-        best_params, best_result = await optimize_moving_average(args.symbol, df, args.days)
-    elif args.strategy == 'mean_reversion':
-        best_params, best_result = await optimize_mean_reversion(args.symbol, df, args.days)
-    else:
+    optimizers = {
+        'moving_average': optimize_moving_average,
+        'mean_reversion': optimize_mean_reversion,
+    }
+    optimize = optimizers.get(args.strategy)
+    if optimize is None:
         print(f"Optimization not yet implemented for {args.strategy}")
         return 1
 
+    # Run optimization: grid points are independent and CPU-bound, so spread
+    # them over processes that each receive the market data once
+    workers = args.workers or os.cpu_count() or 1
+    if workers <= 1:
+        best_params, best_result = await optimize(args.symbol, df, args.days)
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(args.symbol, df, args.days)
+        ) as executor:
+            best_params, best_result = await optimize(args.symbol, df, args.days, executor)
+
     print("\nOptimization completed successfully!")
     print("\nRecommended configuration for config/strategies.yaml:")
     print("-" * 70)
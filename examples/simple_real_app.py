@@ -1,7 +1,11 @@
 # simple_real_app.py - Simple stock app with real Sina Finance data
 import asyncio
 import aiohttp
+import atexit
 import json
+import threading
+from operator import itemgetter
+import time
 from datetime import datetime
 from flask import Flask, jsonify, request
 from flask_cors import CORS
@@ -16,6 +20,26 @@ SINA_HEADERS = {
     'Referer': 'https://finance.sina.com.cn/',
     'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8'
 }
+SINA_TIMEOUT = 5  # seconds
+SINA_ENCODING = 'gb18030'  # Sina serves GBK; GB18030 is its superset
+SINA_CACHE_TTL = 2.0  # seconds; collapses refresh bursts into one upstream call
+
+# Quote layouts: (minimum field count, picker returning name, open,
+# previous close, current, high, low, volume)
+_A_SHARE_FIELDS = (32, itemgetter(0, 1, 2, 3, 4, 5, 8))
+_HK_FIELDS = (15, itemgetter(1, 2, 3, 6, 4, 5, 12))
+
+# One event loop for the whole app, run by a daemon thread. Flask handlers
+# submit coroutines to it instead of building a loop per request, and the
+# session it owns keeps connections to Sina alive between requests.
+_LOOP = asyncio.new_event_loop()
+threading.Thread(target=_LOOP.run_forever, name='sina-loop', daemon=True).start()
+_session = None
+
+# Recent quotes: stock code -> (time.monotonic() when fetched, parsed data).
+# Only touched from the background loop, so no thread locking is needed.
+_quote_cache = {}
+_quote_locks = {}
 
 # Stock database
 STOCK_DATABASE = {
@@ -38,78 +62,171 @@ STOCK_DATABASE = {
     '1810.HK': {'name': '小米集团-W', 'sina_code': 'rt_hk01810', 'currency': 'HKD', 'industry': '科技'},
 }
 
+# Per-code lookups resolved once instead of on every request
+_SINA_URLS = {code: SINA_BASE_URL + info['sina_code'] for code, info in STOCK_DATABASE.items()}
+_QUOTE_LAYOUTS = {
+    code: _A_SHARE_FIELDS if code.endswith(('.SZ', '.SH')) else _HK_FIELDS
+    for code in STOCK_DATABASE if code.endswith(('.SZ', '.SH', '.HK'))
+}
+
+
+async def _get_session() -> aiohttp.ClientSession:
+    """Shared client session, created lazily on the background loop"""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=SINA_TIMEOUT),
+            headers=SINA_HEADERS,
+            connector=aiohttp.TCPConnector(limit=100, keepalive_timeout=30)
+        )
+    return _session
+
+
+def run_async(coro):
+    """Run a coroutine on the background loop and wait for its result"""
+    return asyncio.run_coroutine_threadsafe(coro, _LOOP).result(timeout=SINA_TIMEOUT + 1)
+
+
+async def _close_session():
+    if _session is not None and not _session.closed:
+        await _session.close()
+
+
+# The loop thread is a daemon, so close the session while it is still running
+atexit.register(lambda: run_async(_close_session()))
+
+
+def parse_sina_line(stock_code: str, data_line: str):
+    """Parse the quoted field string of one Sina quote line"""
+    if not data_line.strip():
+        return None
+    
+    layout = _QUOTE_LAYOUTS.get(stock_code)
+    if layout is None:
+        return None
+    
+    min_fields, pick = layout
+    fields = data_line.split(',')
+    if len(fields) < min_fields:
+        return None
+    
+    name, open_price, previous_close, current_price, high, low, volume = pick(fields)
+    stock_info = STOCK_DATABASE[stock_code]
+    return {
+        'code': stock_code,
+        'name': name,
+        'current_price': float(current_price) if current_price else 0,
+        'previous_close': float(previous_close) if previous_close else 0,
+        'open_price': float(open_price) if open_price else 0,
+        'high_price': float(high) if high else 0,
+        'low_price': float(low) if low else 0,
+        'volume': int(volume) if volume else 0,
+        'currency': stock_info['currency'],
+        'industry': stock_info['industry'],
+        'timestamp': datetime.now().isoformat()
+    }
+
+
+def _cached_quote(stock_code: str):
+    entry = _quote_cache.get(stock_code)
+    if entry is not None and time.monotonic() - entry[0] < SINA_CACHE_TTL:
+        return entry[1]
+    return None
+
 
 async def fetch_sina_data(stock_code: str):
-    """Fetch real data from Sina Finance"""
+    """Fetch real data from Sina Finance, reusing quotes younger than SINA_CACHE_TTL"""
     if stock_code not in STOCK_DATABASE:
         return None
     
-    stock_info = STOCK_DATABASE[stock_code]
-    sina_code = stock_info['sina_code']
+    stock_data = _cached_quote(stock_code)
+    if stock_data is not None:
+        return stock_data
     
+    # Single flight: concurrent misses for a code wait for one upstream call
+    lock = _quote_locks.setdefault(stock_code, asyncio.Lock())
+    async with lock:
+        stock_data = _cached_quote(stock_code)
+        if stock_data is None:
+            stock_data = await _fetch_sina_quote(stock_code)
+            if stock_data:
+                _quote_cache[stock_code] = (time.monotonic(), stock_data)
+        return stock_data
+
+
+async def _fetch_sina_quote(stock_code: str):
     try:
-        timeout = aiohttp.ClientTimeout(total=5)
-        async with aiohttp.ClientSession(timeout=timeout, headers=SINA_HEADERS) as session:
-            async with session.get(f"{SINA_BASE_URL}{sina_code}") as response:
-                if response.status != 200:
-                    return None
-                
-                content = await response.text()
-                
-                if 'hq_str_' not in content or '"' not in content:
-                    return None
-                
-                data_line = content.split('"')[1]
-                if not data_line.strip():
-                    return None
-                
-                fields = data_line.split(',')
-                
-                if stock_code.endswith(('.SZ', '.SH')):
-                    # A-share format
-                    if len(fields) < 32:
-                        return None
-                    
-                    return {
-                        'code': stock_code,
-                        'name': fields[0],
-                        'current_price': float(fields[3]) if fields[3] else 0,
-                        'previous_close': float(fields[2]) if fields[2] else 0,
-                        'open_price': float(fields[1]) if fields[1] else 0,
-                        'high_price': float(fields[4]) if fields[4] else 0,
-                        'low_price': float(fields[5]) if fields[5] else 0,
-                        'volume': int(fields[8]) if fields[8] else 0,
-                        'currency': stock_info['currency'],
-                        'industry': stock_info['industry'],
-                        'timestamp': datetime.now().isoformat()
-                    }
-                
-                elif stock_code.endswith('.HK'):
-                    # HK stock format
-                    if len(fields) < 15:
-                        return None
-                    
-                    return {
-                        'code': stock_code,
-                        'name': fields[1],
-                        'current_price': float(fields[6]) if fields[6] else 0,
-                        'previous_close': float(fields[3]) if fields[3] else 0,
-                        'open_price': float(fields[2]) if fields[2] else 0,
-                        'high_price': float(fields[4]) if fields[4] else 0,
-                        'low_price': float(fields[5]) if fields[5] else 0,
-                        'volume': int(fields[12]) if fields[12] else 0,
-                        'currency': stock_info['currency'],
-                        'industry': stock_info['industry'],
-                        'timestamp': datetime.now().isoformat()
-                    }
-                
+        session = await _get_session()
+        async with session.get(_SINA_URLS[stock_code]) as response:
+            if response.status != 200:
                 return None
-                
+            
+            raw = await response.read()
+            
+            # var hq_str_sh600036="field,field,...";  only the quoted part is decoded
+            start = raw.find(b'"')
+            if start < 0 or b'hq_str_' not in raw[:start]:
+                return None
+            end = raw.find(b'"', start + 1)
+            payload = raw[start + 1:end] if end >= 0 else raw[start + 1:]
+            
+            return parse_sina_line(stock_code, payload.decode(SINA_ENCODING))
+            
     except Exception as e:
         print(f"Error fetching {stock_code}: {e}")
         return None
 
 
+async def fetch_sina_batch(stock_codes):
+    """Fetch several stocks with one Sina request (``list=code1,code2,...``)
+
+    Quotes younger than SINA_CACHE_TTL are served from the cache and only the
+    remaining codes are requested; fresh results are cached in turn.
+
+    Returns:
+        Dict of stock code -> parsed data; codes without data are left out
+    """
+    results = {}
+    by_sina_code = {}
+    for code in stock_codes:
+        if code not in STOCK_DATABASE:
+            continue
+        stock_data = _cached_quote(code)
+        if stock_data is not None:
+            results[code] = stock_data
+        else:
+            by_sina_code[STOCK_DATABASE[code]['sina_code']] = code
+    if not by_sina_code:
+        return results
+    
+    try:
+        session = await _get_session()
+        async with session.get(f"{SINA_BASE_URL}{','.join(by_sina_code)}") as response:
+            if response.status != 200:
+                return results
+            content = (await response.read()).decode(SINA_ENCODING)
+    except Exception as e:
+        print(f"Error fetching {', '.join(by_sina_code.values())}: {e}")
+        return results
+    
+    # One line per code: var hq_str_sh600036="field,field,...";
+    fetched_at = time.monotonic()
+    for line in content.splitlines():
+        name, quote, rest = line.partition('="')
+        stock_code = by_sina_code.get(name.rpartition('hq_str_')[2])
+        if not quote or stock_code is None:
+            continue
+        try:
+            stock_data = parse_sina_line(stock_code, rest.partition('"')[0])
+        except ValueError as e:
+            print(f"Error parsing {stock_code}: {e}")
+            continue
+        if stock_data:
+            results[stock_code] = stock_data
+            _quote_cache[stock_code] = (fetched_at, stock_data)
+    return results
+
+
 def generate_recommendation(stock_data):
     """Generate simple investment recommendation"""
     if not stock_data or stock_data['current_price'] == 0:
@@ -170,12 +287,8 @@ def get_stock_info(stock_code):
     if stock_code not in STOCK_DATABASE:
         return jsonify({'error': f'Stock {stock_code} not supported'}), 404
     
-    # Create async loop for the request
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        stock_data = loop.run_until_complete(fetch_sina_data(stock_code))
-        loop.close()
+        stock_data = run_async(fetch_sina_data(stock_code))
     except Exception as e:
         return jsonify({'error': f'Failed to fetch data: {str(e)}'}), 500
     
@@ -234,26 +347,22 @@ def get_batch_stocks():
     results = []
     
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        for code in codes[:10]:  # Limit to 10 stocks
-            if code in STOCK_DATABASE:
-                stock_data = loop.run_until_complete(fetch_sina_data(code))
-                if stock_data:
-                    change_pct = ((stock_data['current_price'] - stock_data['previous_close']) / 
-                                  stock_data['previous_close'] * 100) if stock_data['previous_close'] > 0 else 0
-                    
-                    results.append({
-                        'code': code,
-                        'name': stock_data['name'],
-                        'current_price': stock_data['current_price'],
-                        'change_pct': change_pct,
-                        'volume': stock_data['volume'],
-                        'currency': stock_data['currency']
-                    })
-        
-        loop.close()
+        codes = codes[:10]  # Limit to 10 stocks
+        batch = run_async(fetch_sina_batch(codes))
+        for code in codes:
+            stock_data = batch.get(code)
+            if stock_data:
+                change_pct = ((stock_data['current_price'] - stock_data['previous_close']) / 
+                              stock_data['previous_close'] * 100) if stock_data['previous_close'] > 0 else 0
+                
+                results.append({
+                    'code': code,
+                    'name': stock_data['name'],
+                    'current_price': stock_data['current_price'],
+                    'change_pct': change_pct,
+                    'volume': stock_data['volume'],
+                    'currency': stock_data['currency']
+                })
         
     except Exception as e:
         return jsonify({'error': f'Batch fetch failed: {str(e)}'}), 500
@@ -272,4 +381,13 @@ if __name__ == '__main__':
     print("🌐 Server: http://localhost:5002")
     print("-" * 50)
     
-    app.run(host='0.0.0.0', port=5002, debug=False)
\ No newline at end of file
+    # Handlers only hand work to the shared fetch loop, so a threaded WSGI
+    # server is enough. Multi-process alternative (from examples/, without
+    # --preload so each worker starts its own loop):
+    #   gunicorn -w 4 -b 0.0.0.0:5002 simple_real_app:app
+    try:
+        from waitress import serve
+    except ImportError:
+        app.run(host='0.0.0.0', port=5002, debug=False, threaded=True)
+    else:
+        serve(app, host='0.0.0.0', port=5002, threads=8)
\ No newline at end of file
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# scripts/build_aot.py - Ahead-of-time build of the indicator kernels
+"""Compile src/utils/indicator_kernels.py loops into src/utils/stock_indicators.
+
+CLI scripts such as analyze_nonferrous.py are short-lived, so even cached
+Numba JIT kernels pay a load/compile cost on every run. The extension built
+here is picked up automatically by ``src.utils.indicator_kernels``; delete it
+to go back to JIT.
+
+Usage:
+    python scripts/build_aot.py
+
+Requires Numba with ``numba.pycc`` (deprecated upstream, still shipped in
+current releases) and a C compiler. The output is platform specific and is
+not committed.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import warnings
+
+from src.utils.indicator_kernels import (
+    EMA_SIGNATURE,
+    OBV_SIGNATURE,
+    RSI_SIGNATURE,
+    TRUE_RANGE_SIGNATURE,
+    ema_loop_py,
+    obv_loop_py,
+    rsi_loop_py,
+    true_range_loop_py,
+)
+
+
+def build():
+    """Build the stock_indicators extension next to indicator_kernels.py"""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        from numba.pycc import CC
+
+    cc = CC("stock_indicators")
+    cc.output_dir = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "utils"
+    )
+    cc.export("ema_loop", EMA_SIGNATURE)(ema_loop_py)
+    cc.export("rsi_loop", RSI_SIGNATURE)(rsi_loop_py)
+    cc.export("true_range_loop", TRUE_RANGE_SIGNATURE)(true_range_loop_py)
+    cc.export("obv_loop", OBV_SIGNATURE)(obv_loop_py)
+    cc.compile()
+    print(f"Built {os.path.join(cc.output_dir, cc.output_file)}")
+
+
+if __name__ == "__main__":
+    build()
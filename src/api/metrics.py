@@ -180,12 +180,12 @@ def debug_info():
 # Metrics collection middleware functions
 def before_request_metrics():
     """Record request start time"""
-    request.start_time = time.time()
+    request.start_time = time.perf_counter()
 
 
 def after_request_metrics(response):
     """Record request completion metrics"""
     if hasattr(request, 'start_time'):
-        duration_ms = (time.time() - request.start_time) * 1000
+        duration_ms = (time.perf_counter() - request.start_time) * 1000
         record_request(duration_ms, response.status_code)
     return response
\ No newline at end of file
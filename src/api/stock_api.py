@@ -1,7 +1,12 @@
 # src/api/stock_api.py - Stock query API endpoints with offline mode support
 import asyncio
-from datetime import datetime, timedelta
+import functools
+import os
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
 from typing import Dict, List, Optional
+import numpy as np
 from flask import Blueprint, jsonify, g
 from flask import request as flask_request
 from sqlalchemy.orm import sessionmaker
@@ -14,12 +19,14 @@ from src.services.mock_data import mock_data_service
 from src.services.fundamental_provider import fundamental_data_provider
 from src.services.sentiment_provider import sentiment_data_provider
 import requests
+from requests.adapters import HTTPAdapter
 from src.middleware.validator import require_stock_code, InputValidator
 from src.database import get_db_session
 from src.utils.exceptions import DatabaseError, ValidationError
 from src.utils.sql_security import sql_injection_protection, SafeQueryBuilder
 from src.cache import initialize_cache, get_cache_manager, cached
 from src.monitoring import monitor_performance, monitor_db_operation
+from src.utils.indicator_kernels import ema_loop as _ema_loop, rsi_loop as _rsi_loop
 from config.settings import settings
 import logging
 
@@ -77,6 +84,12 @@ def get_data_source(prefer_mock: bool = False):
     return None  # Use database/external APIs
 
 
+# Shared keep-alive session for outbound quote/history requests so repeated
+# calls (and concurrent worker threads) reuse pooled TCP/TLS connections.
+_http_session = requests.Session()
+_http_session.mount('https://', HTTPAdapter(pool_connections=8, pool_maxsize=32))
+
+
 def _convert_to_sina_code(stock_code: str) -> str:
     """Convert standard code like 600580.SH to sh600580 for Sina."""
     try:
@@ -99,7 +112,7 @@ def fetch_sina_realtime_sync(stock_code: str) -> Optional[dict]:
             'Referer': 'https://finance.sina.com.cn',
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36'
         }
-        resp = requests.get(url, headers=headers, timeout=settings.EXTERNAL_API_TIMEOUT)
+        resp = _http_session.get(url, headers=headers, timeout=settings.EXTERNAL_API_TIMEOUT)
         if resp.status_code != 200:
             return None
         resp.encoding = 'gbk'
@@ -181,6 +194,8 @@ def _try_fetch_history_yahoo(stock_code: str, days: int = 120) -> Optional['pd.D
         data.rename(columns={
             'Date':'date','Open':'open','High':'high','Low':'low','Close':'close','Volume':'volume'
         }, inplace=True)
+        data['date'] = pd.to_datetime(data['date'])
+        data = data.sort_values('date').reset_index(drop=True)
         return data.tail(days)
     except Exception as e:
         logger.warning(f"Yahoo history fetch failed for {stock_code}: {e}")
@@ -191,7 +206,6 @@ def _try_fetch_history_sina_kline(stock_code: str, days: int = 120) -> Optional[
     """Fetch daily K-line from Sina openapi (real data)"""
     try:
         import pandas as pd
-        import requests
         # Convert to sina code
         sina_code = _convert_to_sina_code(stock_code)
         url = 'https://quotes.sina.cn/cn/api/openapi.php/CN_MarketDataService.getKLineData'
@@ -202,7 +216,7 @@ def _try_fetch_history_sina_kline(stock_code: str, days: int = 120) -> Optional[
             'datalen': str(max(60, days + 20))
         }
         headers = {'Referer': 'https://finance.sina.com.cn', 'User-Agent': 'Mozilla/5.0'}
-        resp = requests.get(url, params=params, headers=headers, timeout=settings.EXTERNAL_API_TIMEOUT)
+        resp = _http_session.get(url, params=params, headers=headers, timeout=settings.EXTERNAL_API_TIMEOUT)
         if resp.status_code != 200:
             return None
         data = resp.json()
@@ -223,8 +237,53 @@ def _try_fetch_history_sina_kline(stock_code: str, days: int = 120) -> Optional[
         return None
 
 
+def _history_cache_path(stock_code: str, days: int, day: date) -> Path:
+    return Path(settings.HISTORY_CACHE_DIR) / f"{stock_code}_{days}_{day.isoformat()}.parquet"
+
+
+def _disk_cached_history(fetch):
+    """Cache fetched history as zstd parquet keyed by (stock_code, days, today).
+    Bars before today are immutable, so a new day simply misses the cache.
+    Requires pyarrow; without it (or on any I/O error) the cache is bypassed.
+    """
+    @functools.wraps(fetch)
+    def wrapper(stock_code: str, days: int = 120):
+        if not settings.HISTORY_CACHE_ENABLED:
+            return fetch(stock_code, days)
+        import pandas as pd
+        today = date.today()
+        path = _history_cache_path(stock_code, days, today)
+        if path.exists():
+            try:
+                return pd.read_parquet(path)
+            except Exception as e:
+                logger.debug(f"History cache read failed for {stock_code}: {e}")
+
+        df = fetch(stock_code, days)
+        if df is not None and not df.empty:
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                df.to_parquet(tmp_path, compression='zstd', index=False)
+                os.replace(tmp_path, path)
+                # Drop entries from previous days for the same key
+                for stale in path.parent.glob(f"{stock_code}_{days}_*.parquet"):
+                    if stale != path:
+                        stale.unlink(missing_ok=True)
+            except Exception as e:
+                tmp_path.unlink(missing_ok=True)
+                logger.debug(f"History cache write skipped for {stock_code}: {e}")
+        return df
+    return wrapper
+
+
+@_disk_cached_history
 def fetch_history_df(stock_code: str, days: int = 120) -> Optional['pd.DataFrame']:
-    """Fetch real historical OHLCV with priority: Tushare -> Yahoo. Returns ascending by date."""
+    """Fetch real historical OHLCV with priority: Tushare -> Yahoo -> Sina.
+
+    Every source returns a datetime64 'date' column sorted ascending, so
+    callers can slice with tail()/iloc directly without re-parsing or sorting.
+    """
     df = _try_fetch_history_tushare(stock_code, days)
     if df is not None and not df.empty:
         return df
@@ -235,46 +294,109 @@ def fetch_history_df(stock_code: str, days: int = 120) -> Optional['pd.DataFrame
     return df
 
 
-def _ema(series, span):
-    return series.ewm(span=span, adjust=False).mean()
+@dataclass(frozen=True)
+class HistoryArrays:
+    """Daily OHLCV history as typed NumPy arrays (ascending by date)."""
+    date: np.ndarray  # datetime64[D]
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
 
+    def __len__(self) -> int:
+        return len(self.close)
 
-def compute_indicators(df: 'pd.DataFrame') -> dict:
-    """Compute MA/RSI/MACD from historical close series.
-    df columns: date, open, high, low, close, volume
+    @property
+    def empty(self) -> bool:
+        return len(self.close) == 0
+
+    @classmethod
+    def from_df(cls, df: 'pd.DataFrame') -> 'HistoryArrays':
+        import pandas as pd
+        n = len(df)
+
+        def column(name):
+            if name in df.columns:
+                return np.array(df[name], dtype=np.float64)
+            return np.full(n, np.nan)
+
+        return cls(
+            date=pd.to_datetime(df['date']).to_numpy().astype('datetime64[D]'),
+            open=column('open'),
+            high=column('high'),
+            low=column('low'),
+            close=column('close'),
+            volume=column('volume'),
+        )
+
+
+def fetch_history_arrays(stock_code: str, days: int = 120) -> Optional[HistoryArrays]:
+    """Fetch daily history like fetch_history_df, converted once to HistoryArrays
+    for callers that only need the numeric columns."""
+    df = fetch_history_df(stock_code, days)
+    if df is None or df.empty:
+        return None
+    return HistoryArrays.from_df(df)
+
+
+def _ema(values: np.ndarray, span: int) -> np.ndarray:
+    """EMA matching pandas ewm(span=span, adjust=False)."""
+    return _ema_loop(values, 2.0 / (span + 1.0))
+
+
+def _to_float(value) -> Optional[float]:
+    """Convert a NumPy scalar to float, mapping NaN/inf to None."""
+    return float(value) if np.isfinite(value) else None
+
+
+ALL_INDICATORS = frozenset({'ma5', 'ma20', 'ma60', 'rsi14', 'macd'})
+_MA_WINDOWS = (('ma5', 5), ('ma20', 20), ('ma60', 60))
+
+
+def _indicator_kernel(close: np.ndarray, indicators=ALL_INDICATORS) -> dict:
+    """Compute MA/RSI/MACD scalars from a float64 close-price array.
+    Only the latest value of each indicator is needed, so MAs and RSI are
+    taken from the trailing window directly instead of a full rolling pass.
+    Blocks not named in ``indicators`` are skipped entirely.
     """
-    import pandas as pd
-    s = df['close'].astype(float).copy()
+    n = len(close)
     out = {}
     # MA
-    out['ma5'] = float(s.rolling(5).mean().iloc[-1]) if len(s) >= 5 else None
-    out['ma20'] = float(s.rolling(20).mean().iloc[-1]) if len(s) >= 20 else None
-    out['ma60'] = float(s.rolling(60).mean().iloc[-1]) if len(s) >= 60 else None
-    # RSI(14)
-    if len(s) >= 15:
-        delta = s.diff()
-        gain = delta.clip(lower=0.0)
-        loss = -delta.clip(upper=0.0)
-        roll_up = gain.rolling(14).mean()
-        roll_down = loss.rolling(14).mean()
-        rs = roll_up / (roll_down.replace(0, pd.NA))
-        rsi = 100 - (100 / (1 + rs))
-        out['rsi14'] = float(rsi.iloc[-1]) if pd.notna(rsi.iloc[-1]) else None
-    else:
-        out['rsi14'] = None
-    # MACD (12,26,9)
-    if len(s) >= 26:
-        ema12 = _ema(s, 12)
-        ema26 = _ema(s, 26)
-        macd_line = ema12 - ema26
-        signal = _ema(macd_line, 9)
-        hist = macd_line - signal
-        out['macd'] = float(macd_line.iloc[-1]) if pd.notna(macd_line.iloc[-1]) else None
-        out['macd_signal'] = float(signal.iloc[-1]) if pd.notna(signal.iloc[-1]) else None
-        out['macd_hist'] = float(hist.iloc[-1]) if pd.notna(hist.iloc[-1]) else None
-    else:
-        out['macd'] = out['macd_signal'] = out['macd_hist'] = None
+    for name, window in _MA_WINDOWS:
+        if name in indicators:
+            out[name] = float(close[-window:].mean()) if n >= window else None
+    # RSI(14) - simple average of the last 14 gains/losses
+    if 'rsi14' in indicators:
+        out['rsi14'] = _to_float(_rsi_loop(close, 14)) if n >= 15 else None
+    # MACD (12,26,9) - also yields macd_signal and macd_hist
+    if 'macd' in indicators:
+        if n >= 26:
+            macd_line = _ema(close, 12) - _ema(close, 26)
+            signal = _ema(macd_line, 9)
+            out['macd'] = _to_float(macd_line[-1])
+            out['macd_signal'] = _to_float(signal[-1])
+            out['macd_hist'] = _to_float(macd_line[-1] - signal[-1])
+        else:
+            out['macd'] = out['macd_signal'] = out['macd_hist'] = None
     return out
+
+
+def compute_indicators(df, indicators=None) -> dict:
+    """Compute MA/RSI/MACD from historical close series.
+    df: DataFrame with columns date, open, high, low, close, volume,
+    or a HistoryArrays instance
+    indicators: optional subset of ALL_INDICATORS to compute (default: all);
+    'macd' also produces 'macd_signal' and 'macd_hist'.
+    """
+    if isinstance(df, HistoryArrays):
+        close = df.close
+    else:
+        # np.array copies, giving the JIT kernels a writable contiguous buffer
+        close = np.array(df['close'], dtype=np.float64)
+    return _indicator_kernel(close, ALL_INDICATORS if indicators is None else indicators)
+
+
 def get_current_session():
     """Get database session for current request"""
     if not hasattr(g, 'db_session'):
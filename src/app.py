@@ -96,14 +96,14 @@ def create_app():
     # Request timing and metrics middleware
     @app.before_request
     def before_request():
-        g.start_time = time.time()
+        g.start_time = time.perf_counter()
         RequestLogger.log_request(logger, request)
         before_request_metrics()
     
     @app.after_request
     def after_request(response):
         if hasattr(g, 'start_time'):
-            duration_ms = (time.time() - g.start_time) * 1000
+            duration_ms = (time.perf_counter() - g.start_time) * 1000
             RequestLogger.log_response(logger, response, duration_ms)
             response.headers['X-Response-Time'] = f"{duration_ms:.2f}ms"
         
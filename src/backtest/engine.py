@@ -440,6 +440,7 @@ class BacktestEngine:
         self.current_time = None
         self.is_running = False
         self.market_data = {}  # symbol -> DataFrame
+        self._date_rows = {}  # symbol -> (DataFrame, {date: first row as dict})
         
         self._register_handlers()
     
@@ -468,10 +469,46 @@ class BacktestEngine:
     
     def load_market_data(self, symbol: str, data: pd.DataFrame):
         """Load market data for a symbol"""
-        # Ensure data is sorted by date
-        data = data.sort_values('date' if 'date' in data.columns else data.index)
+        # Ensure data is sorted by date; already-sorted input (the usual case)
+        # is stored by reference so engines sharing one frame don't copy it
+        if 'date' in data.columns:
+            if not data['date'].is_monotonic_increasing:
+                data = data.sort_values('date')
+        elif not data.index.is_monotonic_increasing:
+            data = data.sort_index()
         self.market_data[symbol] = data
+        self._date_rows[symbol] = (data, self._rows_by_date(data))
         logger.info(f"Loaded {len(data)} records for {symbol}")
+
+    def share_market_data(self, source: 'BacktestEngine'):
+        """Reuse the market data another engine has already loaded
+
+        Engines backtesting the same data (e.g. a parameter grid) skip
+        re-validating and re-indexing it. The per-date rows are only read;
+        every market event still gets its own copy.
+        """
+        self.market_data.update(source.market_data)
+        self._date_rows.update(source._date_rows)
+
+    @staticmethod
+    def _rows_by_date(data: pd.DataFrame) -> Dict[date, Dict]:
+        """Map each calendar date to its first row as a dict"""
+        if data.empty:
+            return {}
+        if 'date' in data.columns:
+            dates = data['date']
+            # Handle both date and datetime objects
+            keys = dates.dt.date if hasattr(dates.iloc[0], 'date') else dates
+            records = data.to_dict('records')
+        else:
+            # Assume index is date
+            keys = data.index.date if hasattr(data.index[0], 'date') else data.index
+            records = data.reset_index(drop=True).to_dict('records')
+
+        rows = {}
+        for key, record in zip(keys, records):
+            rows.setdefault(key, record)
+        return rows
     
     async def run(self):
         """Run the backtest"""
@@ -508,24 +545,16 @@ class BacktestEngine:
     async def _generate_market_events(self, date: date):
         """Generate market data events for given date"""
         for symbol, data in self.market_data.items():
-            # Find data for current date
-            if 'date' in data.columns:
-                # Handle both date and datetime objects
-                if hasattr(data['date'].iloc[0], 'date'):
-                    # datetime objects - use .dt accessor
-                    day_data = data[data['date'].dt.date == date]
-                else:
-                    # date objects - direct comparison
-                    day_data = data[data['date'] == date]
-            else:
-                # Assume index is date
-                if hasattr(data.index[0], 'date'):
-                    day_data = data[data.index.date == date]
-                else:
-                    day_data = data[data.index == date]
-
-            if not day_data.empty:
-                price_data = day_data.iloc[0].to_dict()
+            # Rows are converted and keyed by date once at load time instead
+            # of masking the whole frame every simulated day
+            cached = self._date_rows.get(symbol)
+            if cached is None or cached[0] is not data:
+                # market_data was assigned directly, not via load_market_data
+                cached = self._date_rows[symbol] = (data, self._rows_by_date(data))
+            row = cached[1].get(date)
+
+            if row is not None:
+                price_data = dict(row)
                 event = MarketDataEvent(
                     timestamp=self.current_time,
                     symbol=symbol,
@@ -3,6 +3,7 @@ import logging
 from datetime import datetime, time
 from typing import Dict, Optional, List
 from decimal import Decimal
+from operator import itemgetter
 import pandas as pd
 from dataclasses import dataclass
 
@@ -47,11 +48,11 @@ class OrderBook:
         if order.side == OrderSide.BUY:
             self.buy_orders.append((order.price, order.quantity, order.created_at))
             # Sort buy orders by price descending (highest first)
-            self.buy_orders.sort(key=lambda x: x[0], reverse=True)
+            self.buy_orders.sort(key=itemgetter(0), reverse=True)
         else:
             self.sell_orders.append((order.price, order.quantity, order.created_at))
             # Sort sell orders by price ascending (lowest first)
-            self.sell_orders.sort(key=lambda x: x[0])
+            self.sell_orders.sort(key=itemgetter(0))
     
     def get_best_bid(self) -> Optional[Decimal]:
         """Get best bid price"""
@@ -8,6 +8,7 @@ from .cache_manager import (
     get_cache_manager,
     cached
 )
+from .memo_cache import LRUMemoCache
 from .persistent_cache import (
     PersistentCacheManager,
     get_persistent_cache
@@ -21,6 +22,7 @@ __all__ = [
     'initialize_cache',
     'get_cache_manager',
     'cached',
+    'LRUMemoCache',
     'PersistentCacheManager',
     'get_persistent_cache'
 ]
\ No newline at end of file
@@ -0,0 +1,50 @@
+"""In-process LRU memo cache
+
+Small bounded mapping used in front of the persistent cache so repeated
+lookups inside one process skip the SQLite read and JSON decode. Freshness
+is encoded in the key (e.g. ``(stock_code, date)``), so entries never need
+a TTL of their own: a new day/minute simply produces a new key and stale
+entries age out through LRU eviction.
+"""
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Hashable, Optional
+
+
+class LRUMemoCache:
+    """Thread-safe bounded LRU cache keyed by hashable tuples"""
+
+    def __init__(self, maxsize: int = 256):
+        """Initialize memo cache
+
+        Args:
+            maxsize: Maximum number of entries kept before evicting the LRU one
+        """
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return cached value (marking it most recently used) or None"""
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return None
+            return self._data[key]
+
+    def set(self, key: Hashable, value: Any):
+        """Store value, evicting the least recently used entry if full"""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Drop all entries"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
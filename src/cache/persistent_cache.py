@@ -5,32 +5,124 @@ and improve performance.
 """
 import json
 import logging
+import math
+import os
 import sqlite3
+import threading
 import time
 from pathlib import Path
-from typing import Any, Optional, List
+from typing import Any, Callable, Dict, Optional, List
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    logger.debug("orjson not available. Using stdlib json for cache values.")
+    ORJSON_AVAILABLE = False
+
+
+def _has_non_finite(value: Any) -> bool:
+    """Whether a cache value holds NaN/Infinity anywhere (orjson writes null)"""
+    if isinstance(value, float):
+        return not math.isfinite(value)
+    if isinstance(value, dict):
+        return any(_has_non_finite(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_has_non_finite(v) for v in value)
+    if hasattr(value, "tolist"):  # NumPy scalars/arrays
+        return _has_non_finite(value.tolist())
+    return False
+
+
+def _json_default(value: Any) -> Any:
+    """Fallback encoder for values orjson would have handled natively"""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _dumps(value: Any) -> str:
+    """Serialize a cache value to JSON text (orjson when installed)
+
+    orjson also handles NumPy scalars/arrays and datetimes. Values it rejects
+    (e.g. integers beyond 64 bits) and values holding NaN/Infinity, which
+    orjson would turn into null, go through stdlib json as before.
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            data = orjson.dumps(
+                value, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            )
+        except orjson.JSONEncodeError:
+            pass
+        else:
+            # Only a payload containing null can have lost a NaN/Infinity
+            if b"null" not in data or not _has_non_finite(value):
+                return data.decode()
+    return json.dumps(value, ensure_ascii=False, default=_json_default)
+
+
+def _loads(text: str) -> Any:
+    """Deserialize a cache value; rows holding NaN/Infinity need stdlib json"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text)
+
 
 class PersistentCacheManager:
     """SQLite-based persistent cache for crawled data"""
 
-    def __init__(self, db_path: str = "cache.db"):
+    def __init__(self, db_path: str = "cache.db", clock: Callable[[], float] = time.time):
         """Initialize persistent cache with SQLite backend
 
         Args:
             db_path: Path to SQLite database file
+            clock: Source of the current Unix time; inject a fake clock to
+                step over TTLs in tests and demos without sleeping
         """
+        self._clock = clock
+        self._local = threading.local()
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._init_database()
         logger.info(f"Persistent cache initialized: {self.db_path}")
 
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use
+
+        Reusing the connection keeps its page cache warm across calls, so hot
+        reads are served from memory (or the mmap) instead of re-reading the
+        file on every get. Connections are per thread and per process since
+        sqlite3 objects must not cross either boundary.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        # WAL (set once per file) makes NORMAL sync safe
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA mmap_size=268435456")   # 256 MB
+        conn.execute("PRAGMA cache_size=-20000")     # ~20 MB
+        conn.execute("PRAGMA temp_store=MEMORY")
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
     def _init_database(self):
         """Initialize database schema"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
+            # Persistent per database file: readers no longer block the writer
+            # and commits append to the log instead of rewriting pages
+            conn.execute("PRAGMA journal_mode=WAL")
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS cache_store (
                     cache_key TEXT PRIMARY KEY,
@@ -66,8 +158,7 @@ class PersistentCacheManager:
             Cached value or None if not found/expired
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._connect() as conn:
                 cursor = conn.execute(
                     """
                     SELECT cache_value, created_at, expires_at
@@ -82,7 +173,7 @@ class PersistentCacheManager:
                     logger.debug(f"Cache miss: {key}")
                     return None
 
-                current_time = int(time.time())
+                current_time = int(self._clock())
 
                 # Check expiration
                 if row['expires_at'] <= current_time:
@@ -97,7 +188,7 @@ class PersistentCacheManager:
                     return None
 
                 # Deserialize value
-                value = json.loads(row['cache_value'])
+                value = _loads(row['cache_value'])
                 logger.debug(f"Cache hit: {key} (age={age}s)")
                 return value
 
@@ -117,13 +208,13 @@ class PersistentCacheManager:
             stock_code: Associated stock code
         """
         try:
-            current_time = int(time.time())
+            current_time = int(self._clock())
             expires_at = current_time + ttl
 
             # Serialize value
-            serialized_value = json.dumps(value, ensure_ascii=False)
+            serialized_value = _dumps(value)
 
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.execute(
                     """
                     INSERT OR REPLACE INTO cache_store
@@ -139,6 +230,43 @@ class PersistentCacheManager:
         except Exception as e:
             logger.error(f"Cache set error for {key}: {e}")
 
+    def set_many(self, items: Dict[str, Any], ttl: int = 3600,
+                 data_type: str = None, stock_code: str = None):
+        """Set several cache values in a single transaction
+
+        One commit (and fsync) for the whole batch instead of one per key;
+        prefer it over repeated set() calls when ingesting data in bulk.
+
+        Args:
+            items: Mapping of cache key to value (values must be JSON serializable)
+            ttl: Time to live in seconds, shared by all entries
+            data_type: Type of data (e.g., 'fundamental', 'sentiment')
+            stock_code: Associated stock code
+        """
+        try:
+            current_time = int(self._clock())
+            expires_at = current_time + ttl
+            rows = [
+                (key, _dumps(value), current_time, expires_at, data_type, stock_code)
+                for key, value in items.items()
+            ]
+
+            with self._connect() as conn:
+                conn.executemany(
+                    """
+                    INSERT OR REPLACE INTO cache_store
+                    (cache_key, cache_value, created_at, expires_at, data_type, stock_code)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    rows
+                )
+                conn.commit()
+
+            logger.debug(f"Cache set_many: {len(rows)} keys (ttl={ttl}s)")
+
+        except Exception as e:
+            logger.error(f"Cache set_many error: {e}")
+
     def delete(self, key: str):
         """Delete cache entry
 
@@ -146,7 +274,7 @@ class PersistentCacheManager:
             key: Cache key
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.execute("DELETE FROM cache_store WHERE cache_key = ?", (key,))
                 conn.commit()
                 logger.debug(f"Cache deleted: {key}")
@@ -163,7 +291,7 @@ class PersistentCacheManager:
             data_type: Data type to invalidate
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 if pattern:
                     conn.execute(
                         "DELETE FROM cache_store WHERE cache_key LIKE ?",
@@ -197,8 +325,8 @@ class PersistentCacheManager:
             Number of entries removed
         """
         try:
-            current_time = int(time.time())
-            with sqlite3.connect(self.db_path) as conn:
+            current_time = int(self._clock())
+            with self._connect() as conn:
                 cursor = conn.execute(
                     "DELETE FROM cache_store WHERE expires_at <= ?",
                     (current_time,)
@@ -221,15 +349,14 @@ class PersistentCacheManager:
             Dictionary with cache statistics
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._connect() as conn:
 
                 # Total entries
                 cursor = conn.execute("SELECT COUNT(*) as total FROM cache_store")
                 total = cursor.fetchone()['total']
 
                 # Expired entries
-                current_time = int(time.time())
+                current_time = int(self._clock())
                 cursor = conn.execute(
                     "SELECT COUNT(*) as expired FROM cache_store WHERE expires_at <= ?",
                     (current_time,)
@@ -270,7 +397,7 @@ class PersistentCacheManager:
     def clear_all(self):
         """Clear all cache entries (use with caution)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connect() as conn:
                 conn.execute("DELETE FROM cache_store")
                 conn.commit()
             logger.warning("All cache entries cleared")
@@ -1,13 +1,15 @@
 # src/core/analyzer_factory.py - 分析器工厂
 import asyncio
 import numpy as np
-from typing import Optional, List, Dict, Any
+from typing import Any, Callable, Dict, List, Optional
 from .base_analyzer import BaseStockAnalyzer, StockQuote, TechnicalIndicators, AnalysisSignal
 from .stock_config import get_stock_config, StockConfig
 from .data_sources import data_source_manager
 from .technical_analysis import AdvancedTechnicalAnalyzer, AdvancedTechnicalIndicators, calculate_advanced_indicators, analyze_technical_strength
-from .fundamental_analysis import FundamentalAnalyzer, FundamentalData, get_fundamental_data, analyze_fundamental_strength
-from .sentiment_analysis import SentimentAnalyzer, SentimentData, get_sentiment_data, analyze_sentiment_strength
+from .fundamental_analysis import FundamentalData, fundamental_analyzer, get_fundamental_data, analyze_fundamental_strength
+from .sentiment_analysis import SentimentData, sentiment_analyzer, get_sentiment_data, analyze_sentiment_strength
+from config.settings import settings
+from src.utils.indicator_kernels import ema_loop
 
 
 class StandardStockAnalyzer(BaseStockAnalyzer):
@@ -15,8 +17,9 @@ class StandardStockAnalyzer(BaseStockAnalyzer):
     
     def __init__(self, symbol: str, config: Dict[str, Any]):
         super().__init__(symbol, config)
-        self.fundamental_analyzer = FundamentalAnalyzer()
-        self.sentiment_analyzer = SentimentAnalyzer()
+        # 子分析器无状态，共享模块级实例，避免每次创建分析器时重建关键词表等
+        self.fundamental_analyzer = fundamental_analyzer
+        self.sentiment_analyzer = sentiment_analyzer
     
     async def fetch_real_time_data(self) -> Optional[StockQuote]:
         """获取实时行情数据"""
@@ -139,13 +142,7 @@ class StandardStockAnalyzer(BaseStockAnalyzer):
     def _calculate_ema(self, prices: np.ndarray, period: int) -> np.ndarray:
         """计算指数移动平均"""
         alpha = 2 / (period + 1)
-        ema = np.zeros_like(prices)
-        ema[0] = prices[0]
-        
-        for i in range(1, len(prices)):
-            ema[i] = alpha * prices[i] + (1 - alpha) * ema[i - 1]
-        
-        return ema
+        return ema_loop(np.asarray(prices, dtype=np.float64), alpha)
     
     def _calculate_bollinger_bands(self, prices: List[float], period: int = 20, std_dev: float = 2) -> tuple[float, float, float]:
         """计算布林带"""
@@ -593,47 +590,91 @@ async def analyze_stock(symbol: str) -> Optional[Dict[str, Any]]:
     return await StockAnalyzerFactory.analyze_stock(symbol)
 
 
-async def batch_analyze_stocks(symbols: List[str]) -> Dict[str, Any]:
-    """批量分析股票"""
-    tasks = [StockAnalyzerFactory.analyze_stock(symbol) for symbol in symbols]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-    
-    return {
-        symbol: result if not isinstance(result, Exception) else {'error': str(result)}
-        for symbol, result in zip(symbols, results)
-    }
+async def batch_analyze_stocks(symbols: List[str],
+                               max_concurrency: Optional[int] = None,
+                               on_result: Optional[Callable[[str, Any], None]] = None) -> Dict[str, Any]:
+    """批量分析股票
+
+    Args:
+        symbols: 股票代码列表
+        max_concurrency: 同时进行的分析数上限，默认 settings.MAX_CONCURRENT_FETCHES
+        on_result: 可选回调，每只股票分析完成时立即以 (symbol, result) 调用
+
+    Returns:
+        按输入顺序排列的 {symbol: result}，失败项为 {'error': ...}
+    """
+    sem = asyncio.Semaphore(max_concurrency or settings.MAX_CONCURRENT_FETCHES)
 
+    async def _guarded(symbol: str):
+        async with sem:
+            try:
+                result = await StockAnalyzerFactory.analyze_stock(symbol)
+            except Exception as e:
+                result = {'error': str(e)}
+        return symbol, result
+
+    # 按完成顺序逐个处理，慢任务不会阻塞已完成结果的回调
+    completed = {}
+    for fut in asyncio.as_completed([_guarded(symbol) for symbol in symbols]):
+        symbol, result = await fut
+        completed[symbol] = result
+        if on_result:
+            on_result(symbol, result)
+
+    return {symbol: completed[symbol] for symbol in symbols}
 
 if __name__ == "__main__":
+    import functools
+    import io
+    import sys
+
+    from src.utils.async_runner import run
+
     # 测试分析器工厂
+    async def analyze_and_print(symbol: str, title: str, details: bool = True) -> str:
+        """分析单只股票，输出写入缓冲区以免并发时交错；details=False 时只输出建议"""
+        buf = io.StringIO()
+        out = functools.partial(print, file=buf)
+        out(f"\n--- 分析{title} ---")
+        result = await analyze_stock(symbol)
+        if result:
+            out(f"股票: {result['symbol']} - {result['company_name']}")
+            out(f"建议: {result['recommendation']} (置信度: {result['confidence']:.2f})")
+            if details:
+                out(f"风险等级: {result['risk_level']}")
+                if result['quote']:
+                    quote = result['quote']
+                    out(f"价格: ¥{quote['current_price']:.2f} ({quote['change_pct']:+.2f}%)")
+        return buf.getvalue()
+
     async def test_analyzer():
         print("=== 测试股票分析器工厂 ===")
-        
-        # 测试赛力斯
-        print("\n--- 分析赛力斯 ---")
-        result = await analyze_stock("601127.SH")
-        if result:
-            print(f"股票: {result['symbol']} - {result['company_name']}")
-            print(f"建议: {result['recommendation']} (置信度: {result['confidence']:.2f})")
-            print(f"风险等级: {result['risk_level']}")
-            if result['quote']:
-                quote = result['quote']
-                print(f"价格: ¥{quote['current_price']:.2f} ({quote['change_pct']:+.2f}%)")
-        
-        # 测试理想汽车
-        print("\n--- 分析理想汽车 ---")
-        result = await analyze_stock("2015.HK")
-        if result:
-            print(f"股票: {result['symbol']} - {result['company_name']}")
-            print(f"建议: {result['recommendation']} (置信度: {result['confidence']:.2f})")
+
+        # 赛力斯、理想汽车并发分析，完成后按顺序输出
+        outputs = await asyncio.gather(
+            analyze_and_print("601127.SH", "赛力斯"),
+            analyze_and_print("2015.HK", "理想汽车", details=False),
+            return_exceptions=True,
+        )
+        sys.stdout.write("".join(
+            f"\n分析失败: {output}\n" if isinstance(output, Exception) else output
+            for output in outputs
+        ))
         
         # 批量测试
         print("\n--- 批量分析测试 ---")
-        batch_result = await batch_analyze_stocks(["601127.SH", "2015.HK", "600418.SH"])
-        for symbol, data in batch_result.items():
-            if 'error' not in data:
+        succeeded = 0
+
+        def print_batch_result(symbol, data):
+            nonlocal succeeded
+            if data and 'error' not in data:
+                succeeded += 1
                 print(f"{symbol}: {data['recommendation']}")
             else:
-                print(f"{symbol}: 错误 - {data['error']}")
+                print(f"{symbol}: 错误 - {data['error'] if data else '不支持的股票'}")
+
+        symbols = ["601127.SH", "2015.HK", "600418.SH"]
+        await batch_analyze_stocks(symbols, on_result=print_batch_result)
+        print(f"成功 {succeeded}/{len(symbols)}")
     
-    asyncio.run(test_analyzer())
\ No newline at end of file
+    run(test_analyzer())
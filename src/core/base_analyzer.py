@@ -286,8 +286,11 @@ class BaseStockAnalyzer(ABC):
             
             # 3. 分析各类信号
             technical_signals = self.analyze_technical_signals(quote, indicators)
-            fundamental_signals = await self.analyze_fundamental_signals(quote)
-            sentiment_signals = await self.analyze_sentiment_signals(quote)
+            # 基本面与情绪数据来自不同数据源，互不依赖，并发获取
+            fundamental_signals, sentiment_signals = await asyncio.gather(
+                self.analyze_fundamental_signals(quote),
+                self.analyze_sentiment_signals(quote),
+            )
             
             all_signals = technical_signals + fundamental_signals + sentiment_signals
             
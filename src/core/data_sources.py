@@ -2,9 +2,10 @@
 import asyncio
 import aiohttp
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple, Iterable
 from datetime import datetime
 from .base_analyzer import StockQuote
+from config.settings import settings
 
 
 class DataSourceException(Exception):
@@ -424,6 +425,36 @@ class DataSourceManager:
                     break
         
         return None
+    
+    async def probe_sources(self, symbol: str, config: Dict[str, Any],
+                            source_names: Optional[Iterable[str]] = None,
+                            timeout: Optional[float] = None
+                            ) -> List[Tuple[str, Optional[StockQuote], Optional[Exception]]]:
+        """并发探测各数据源可用性（不重试、不故障转移）
+
+        Args:
+            symbol: 测试股票代码
+            config: 股票配置字典
+            source_names: 要探测的数据源，默认全部
+            timeout: 单个数据源超时秒数，默认 settings.EXTERNAL_API_TIMEOUT
+
+        Returns:
+            按 source_names 顺序的 (数据源, 行情或None, 异常或None) 列表
+        """
+        names = list(source_names) if source_names is not None else list(self.sources)
+        limit = timeout if timeout is not None else settings.EXTERNAL_API_TIMEOUT
+
+        async def probe(source_name: str):
+            source = self.sources.get(source_name)
+            if source is None:
+                return source_name, None, KeyError(source_name)
+            try:
+                quote = await asyncio.wait_for(source.fetch_quote(symbol, config), timeout=limit)
+                return source_name, quote, None
+            except Exception as e:
+                return source_name, None, e
+
+        return await asyncio.gather(*(probe(name) for name in names))
 
 
 # 全局数据源管理器
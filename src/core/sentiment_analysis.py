@@ -7,6 +7,9 @@ from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 
+# 分析师评级对应的情绪分值
+ANALYST_SENTIMENT_SCORES = {'positive': 0.5, 'neutral': 0.0, 'negative': -0.5}
+
 
 @dataclass
 class SentimentData:
@@ -260,9 +263,7 @@ class SentimentAnalyzer:
         
         # 分析师情绪转数值
         if sentiment_data.analyst_sentiment:
-            analyst_score = {'positive': 0.5, 'neutral': 0.0, 'negative': -0.5}.get(
-                sentiment_data.analyst_sentiment, 0.0
-            )
+            analyst_score = ANALYST_SENTIMENT_SCORES.get(sentiment_data.analyst_sentiment, 0.0)
             scores.append(analyst_score)
             weights.append(0.2)
         
@@ -1,7 +1,8 @@
 # src/core/stock_config.py - 股票配置统一管理
 import json
 import os
-from typing import Dict, List, Optional, Any
+from collections import defaultdict
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
@@ -60,6 +61,8 @@ class StockConfigManager:
     def __init__(self, config_file: Optional[str] = None):
         self.config_file = config_file or "stock_configs.json"
         self._configs: Dict[str, StockConfig] = {}
+        # 按行业/市场的代码索引，首次查询时构建，增删配置时失效
+        self._indexes: Optional[Tuple[Dict[IndustryType, List[str]], Dict[MarketType, List[str]]]] = None
         self._load_default_configs()
         self._load_from_file()
     
@@ -240,6 +243,7 @@ class StockConfigManager:
     def add_config(self, config: StockConfig):
         """添加股票配置"""
         self._configs[config.symbol.upper()] = config
+        self._indexes = None
         self.save_to_file()
     
     def remove_config(self, symbol: str):
@@ -247,21 +251,33 @@ class StockConfigManager:
         symbol = symbol.upper()
         if symbol in self._configs:
             del self._configs[symbol]
+            self._indexes = None
             self.save_to_file()
     
     def get_all_symbols(self) -> List[str]:
         """获取所有股票代码"""
         return list(self._configs.keys())
     
+    def _get_indexes(self) -> Tuple[Dict[IndustryType, List[str]], Dict[MarketType, List[str]]]:
+        """单次遍历构建行业、市场索引"""
+        if self._indexes is None:
+            by_industry: Dict[IndustryType, List[str]] = defaultdict(list)
+            by_market: Dict[MarketType, List[str]] = defaultdict(list)
+            for symbol, config in self._configs.items():
+                by_industry[config.industry].append(symbol)
+                by_market[config.market].append(symbol)
+            self._indexes = (by_industry, by_market)
+        return self._indexes
+    
     def get_symbols_by_market(self, market: MarketType) -> List[str]:
         """按市场获取股票代码"""
-        return [symbol for symbol, config in self._configs.items() 
-                if config.market == market and config.is_active]
+        return [symbol for symbol in self._get_indexes()[1].get(market, ())
+                if self._configs[symbol].is_active]
     
     def get_symbols_by_industry(self, industry: IndustryType) -> List[str]:
         """按行业获取股票代码"""
-        return [symbol for symbol, config in self._configs.items() 
-                if config.industry == industry and config.is_active]
+        return [symbol for symbol in self._get_indexes()[0].get(industry, ())
+                if self._configs[symbol].is_active]
     
     def search_stocks(self, keyword: str) -> List[StockConfig]:
         """搜索股票"""
@@ -320,8 +336,8 @@ def get_supported_symbols() -> List[str]:
 
 
 if __name__ == "__main__":
-    # 测试配置管理器
-    manager = StockConfigManager()
+    # 测试配置管理器（复用全局实例，无需重新构建配置表）
+    manager = stock_config_manager
     
     print("=== 股票配置管理器测试 ===")
     print(f"支持的股票数量: {len(manager.get_all_symbols())}")
@@ -5,6 +5,8 @@ from typing import List, Dict, Tuple, Optional, Any
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 
+from src.utils.indicator_kernels import ema_loop, obv_loop, true_range_loop
+
 
 @dataclass
 class AdvancedTechnicalIndicators:
@@ -62,6 +64,13 @@ class AdvancedTechnicalIndicators:
         return {k: v for k, v in self.__dict__.items()}
 
 
+def _true_ranges(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray) -> np.ndarray:
+    """逐日真实波幅（比输入少一项）"""
+    return true_range_loop(np.asarray(highs, dtype=np.float64),
+                           np.asarray(lows, dtype=np.float64),
+                           np.asarray(closes, dtype=np.float64))
+
+
 class AdvancedTechnicalAnalyzer:
     """高级技术分析器"""
     
@@ -192,12 +201,12 @@ class AdvancedTechnicalAnalyzer:
         
         # 计算MACD信号线
         if len(prices) >= slow + signal:
-            macd_values = []
-            for i in range(slow-1, len(prices)):
-                fast_ema = self._calculate_ema(prices[:i+1], fast)
-                slow_ema = self._calculate_ema(prices[:i+1], slow)
-                if fast_ema and slow_ema:
-                    macd_values.append(fast_ema - slow_ema)
+            # EMA递推的第i项即prices[:i+1]的EMA，一次算出全部前缀值
+            values = np.asarray(prices, dtype=np.float64)
+            fast_series = ema_loop(values, 2.0 / (fast + 1))[slow-1:]
+            slow_series = ema_loop(values, 2.0 / (slow + 1))[slow-1:]
+            valid = (fast_series != 0) & (slow_series != 0)
+            macd_values = (fast_series - slow_series)[valid]
             
             if len(macd_values) >= signal:
                 signal_line = np.mean(macd_values[-signal:])
@@ -212,12 +221,7 @@ class AdvancedTechnicalAnalyzer:
             return None
         
         alpha = 2 / (period + 1)
-        ema = prices[0]
-        
-        for price in prices[1:]:
-            ema = alpha * price + (1 - alpha) * ema
-        
-        return float(ema)
+        return float(ema_loop(np.asarray(prices, dtype=np.float64), alpha)[-1])
     
     def _calculate_rsi(self, prices: np.ndarray, period=14) -> Optional[float]:
         """计算RSI相对强弱指标"""
@@ -288,12 +292,7 @@ class AdvancedTechnicalAnalyzer:
         if len(closes) < period + 1:
             return None
 
-        true_ranges = []
-        for idx in range(1, len(closes)):
-            tr1 = highs[idx] - lows[idx]
-            tr2 = abs(highs[idx] - closes[idx - 1])
-            tr3 = abs(lows[idx] - closes[idx - 1])
-            true_ranges.append(max(tr1, tr2, tr3))
+        true_ranges = _true_ranges(highs, lows, closes)
 
         if len(true_ranges) < period:
             return None
@@ -346,13 +345,7 @@ class AdvancedTechnicalAnalyzer:
             return None, None, None
         
         # 计算TR（真实波幅）
-        tr_list = []
-        for i in range(1, len(closes)):
-            tr1 = highs[i] - lows[i]
-            tr2 = abs(highs[i] - closes[i-1])
-            tr3 = abs(lows[i] - closes[i-1])
-            tr = max(tr1, tr2, tr3)
-            tr_list.append(tr)
+        tr_list = _true_ranges(highs, lows, closes)
         
         if len(tr_list) < period:
             return None, None, None
@@ -398,15 +391,9 @@ class AdvancedTechnicalAnalyzer:
         if len(prices) < 2:
             return None
         
-        obv = 0
-        for i in range(1, len(prices)):
-            if prices[i] > prices[i-1]:
-                obv += volumes[i]
-            elif prices[i] < prices[i-1]:
-                obv -= volumes[i]
-            # 价格相等时OBV不变
-        
-        return float(obv)
+        # 价格相等时OBV不变
+        return float(obv_loop(np.asarray(prices, dtype=np.float64),
+                              np.asarray(volumes, dtype=np.float64)))
     
     def _calculate_support_resistance(self, highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, lookback=20) -> Tuple[Optional[float], Optional[float]]:
         """计算支撑阻力位"""
@@ -36,7 +36,7 @@ class MetricsMiddleware:
     
     def _before_request(self):
         """Record request start time and metadata"""
-        g.request_start_time = time.time()
+        g.request_start_time = time.perf_counter()
         g.request_size = len(request.get_data()) if request.get_data() else 0
         
         # Record active connection (approximate)
@@ -54,7 +54,7 @@ class MetricsMiddleware:
         
         try:
             # Calculate request duration
-            duration = time.time() - getattr(g, 'request_start_time', time.time())
+            duration = time.perf_counter() - getattr(g, 'request_start_time', time.perf_counter())
             
             # Get request metadata
             method = request.method
@@ -140,14 +140,14 @@ def monitor_endpoint(endpoint_name: str = None, track_params: bool = False):
             if not collector or not collector.enabled:
                 return func(*args, **kwargs)
             
-            start_time = time.time()
+            start_time = time.perf_counter()
             endpoint = endpoint_name or func.__name__
             
             try:
                 result = func(*args, **kwargs)
                 
                 # Record custom endpoint metrics
-                duration = time.time() - start_time
+                duration = time.perf_counter() - start_time
                 
                 # For stock analysis endpoints, record specific metrics
                 if 'analysis' in endpoint.lower():
@@ -29,6 +29,15 @@ class AlertChannel(Enum):
     WECHAT_WORK = "wechat_work"
 
 
+# Python logging level used when an alert is sent to the log channel
+_LOG_LEVELS = {
+    AlertLevel.INFO: logging.INFO,
+    AlertLevel.WARNING: logging.WARNING,
+    AlertLevel.ERROR: logging.ERROR,
+    AlertLevel.CRITICAL: logging.CRITICAL
+}
+
+
 class Alert:
     """Alert message."""
 
@@ -214,12 +223,7 @@ class AlertManager:
 
     def _send_log(self, alert: Alert):
         """Send alert to log."""
-        log_level = {
-            AlertLevel.INFO: logging.INFO,
-            AlertLevel.WARNING: logging.WARNING,
-            AlertLevel.ERROR: logging.ERROR,
-            AlertLevel.CRITICAL: logging.CRITICAL
-        }.get(alert.level, logging.INFO)
+        log_level = _LOG_LEVELS.get(alert.level, logging.INFO)
 
         logger.log(
             log_level,
@@ -294,11 +294,11 @@ class MetricsContext:
         self.start_time = None
 
     def __enter__(self):
-        self.start_time = time.time()
+        self.start_time = time.perf_counter()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        duration = time.time() - self.start_time
+        duration = time.perf_counter() - self.start_time
 
         if self.metric_type == "http":
             self.collector.record_http_request(
@@ -461,7 +461,7 @@ def monitor_performance(operation_type: str = None,
             if not metrics_collector or not metrics_collector.enabled:
                 return func(*args, **kwargs)
             
-            start_time = time.time()
+            start_time = time.perf_counter()
             operation = operation_type or func.__name__
             comp = component or func.__module__
             
@@ -469,7 +469,7 @@ def monitor_performance(operation_type: str = None,
                 result = func(*args, **kwargs)
                 
                 # Record successful operation
-                duration = time.time() - start_time
+                duration = time.perf_counter() - start_time
                 
                 if hasattr(metrics_collector, 'performance_tracker'):
                     metrics_collector.performance_tracker.record_response_time(duration)
@@ -502,7 +502,7 @@ def monitor_db_operation(table: str = None, operation: str = None):
             if not metrics_collector or not metrics_collector.enabled:
                 return func(*args, **kwargs)
             
-            start_time = time.time()
+            start_time = time.perf_counter()
             op = operation or func.__name__
             tbl = table or 'unknown'
             
@@ -510,7 +510,7 @@ def monitor_db_operation(table: str = None, operation: str = None):
                 result = func(*args, **kwargs)
                 
                 # Record successful operation
-                duration = time.time() - start_time
+                duration = time.perf_counter() - start_time
                 metrics_collector.record_db_operation(
                     operation=op,
                     table=tbl,
@@ -521,7 +521,7 @@ def monitor_db_operation(table: str = None, operation: str = None):
                 return result
                 
             except Exception as e:
-                duration = time.time() - start_time
+                duration = time.perf_counter() - start_time
                 metrics_collector.record_db_operation(
                     operation=op,
                     table=tbl,
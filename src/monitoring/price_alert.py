@@ -3,14 +3,19 @@
 
 import asyncio
 import logging
+import sys
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Callable
 from dataclasses import dataclass
 from enum import Enum
+from operator import attrgetter
 import json
 
 logger = logging.getLogger(__name__)
 
+# dataclass(slots=True) needs Python 3.10+; older interpreters keep __dict__
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
 
 class AlertType(Enum):
     """Alert trigger types."""
@@ -31,7 +36,7 @@ class AlertStatus(Enum):
     CANCELLED = "cancelled"
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class PriceAlert:
     """Price alert configuration."""
     alert_id: str
@@ -69,6 +74,8 @@ class AlertManager:
         self.alert_history: List[PriceAlert] = []
         self.notification_callbacks: List[Callable] = []
         self._next_alert_id = 1
+        # Created on first wait so it binds to the monitoring loop
+        self._alerts_changed: Optional[asyncio.Event] = None
 
     def create_alert(
         self,
@@ -111,6 +118,8 @@ class AlertManager:
 
         self.alerts[alert_id] = alert
         logger.info(f"Created alert {alert_id}: {symbol} {alert_type.value} {threshold}")
+        if self._alerts_changed is not None:
+            self._alerts_changed.set()
 
         return alert_id
 
@@ -295,6 +304,29 @@ class AlertManager:
 
         return triggered_alerts
 
+    async def wait_for_new_alert(self, timeout: float) -> bool:
+        """Wait until an alert is created or the timeout elapses.
+
+        Lets a monitor loop keep its periodic tick while reacting at once to
+        alerts added in between. Alerts must be created from the same event
+        loop for the wakeup to be delivered.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if woken by a new alert, False on timeout
+        """
+        if self._alerts_changed is None:
+            self._alerts_changed = asyncio.Event()
+        try:
+            await asyncio.wait_for(self._alerts_changed.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._alerts_changed.clear()
+
     def cancel_alert(self, alert_id: str) -> bool:
         """Cancel an active alert.
 
@@ -347,7 +379,7 @@ class AlertManager:
         if symbol:
             history = [a for a in history if a.symbol == symbol]
 
-        return sorted(history, key=lambda a: a.triggered_at, reverse=True)
+        return sorted(history, key=attrgetter('triggered_at'), reverse=True)
 
     def register_notification_callback(self, callback: Callable):
         """Register a notification callback function.
@@ -4,7 +4,7 @@ import json
 import logging
 import re
 import time
-from datetime import datetime
+from datetime import date, datetime
 from io import StringIO
 from pathlib import Path
 from typing import Any, Dict, Optional
@@ -13,6 +13,7 @@ import pandas as pd
 import requests
 
 from config.settings import settings
+from src.cache.memo_cache import LRUMemoCache
 from src.cache.persistent_cache import get_persistent_cache
 
 try:
@@ -24,10 +25,16 @@ except Exception:  # pragma: no cover - PyYAML optional
 class FundamentalDataProvider:
     """Load fundamental metrics from configurable sources."""
 
-    def __init__(self, use_persistent_cache: bool = True):
+    def __init__(
+        self,
+        use_persistent_cache: bool = True,
+        session: Optional[requests.Session] = None,
+    ):
         self.logger = logging.getLogger(__name__)
         self.api_endpoint: Optional[str] = settings.FUNDAMENTAL_DATA_API
         self.local_path = Path(settings.FUNDAMENTAL_DATA_PATH) if settings.FUNDAMENTAL_DATA_PATH else None
+        # Reuse one keep-alive session across calls (injectable for tests/callers)
+        self.session = session or requests.Session()
         self.timeout = settings.FUNDAMENTAL_DATA_TIMEOUT
 
         # Use persistent cache instead of memory cache
@@ -39,6 +46,10 @@ class FundamentalDataProvider:
             self.cache: Dict[str, Dict[str, Any]] = {}
             self.cache_ttl: Dict[str, float] = {}
 
+        # In-process layer keyed by (stock_code, day): fundamentals change at
+        # most daily, so repeat lookups skip the persistent cache entirely
+        self._memo = LRUMemoCache(maxsize=512)
+
         if self.local_path:
             self._load_local_file(self.local_path)
 
@@ -84,7 +95,7 @@ class FundamentalDataProvider:
                 f"stockid/{symbol}/ctrl/{year}/displaytype/4.phtml"
             )
             try:
-                resp = requests.get(url, headers=headers, timeout=self.timeout)
+                resp = self.session.get(url, headers=headers, timeout=self.timeout)
                 if resp.status_code != 200:
                     continue
                 tables = pd.read_html(StringIO(resp.text))
@@ -237,7 +248,7 @@ class FundamentalDataProvider:
         )
 
         try:
-            response = requests.get(url, timeout=self.timeout)
+            response = self.session.get(url, timeout=self.timeout)
             if response.status_code != 200:
                 self.logger.warning(
                     "Fundamental API returned %s for %s", response.status_code, stock_code
@@ -300,7 +311,20 @@ class FundamentalDataProvider:
         self, stock_code: str, price_hint: Optional[float] = None
     ) -> Optional[Dict[str, Any]]:
         stock_code = stock_code.upper()
+        memo_key = (stock_code, date.today().isoformat())
+        memoized = self._memo.get(memo_key)
+        if memoized is not None:
+            return copy.deepcopy(memoized)
+
+        data = self._load_fundamental_analysis(stock_code, price_hint)
+        if data is not None:
+            self._memo.set(memo_key, data)
+            return copy.deepcopy(data)
+        return None
 
+    def _load_fundamental_analysis(
+        self, stock_code: str, price_hint: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
         # Use persistent cache
         if self.use_persistent_cache:
             cache_key = f"fundamental:{stock_code}"
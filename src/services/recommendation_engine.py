@@ -1,4 +1,5 @@
 # src/services/recommendation_engine.py - ML-based recommendation engine
+import heapq
 import json
 import logging
 from datetime import datetime, timedelta
@@ -221,7 +222,7 @@ class RecommendationEngine:
                 feature_importance[feature] = float(shap_vals[i])
             
             # Get top contributing factors
-            top_factors = sorted(feature_importance.items(), key=lambda x: abs(x[1]), reverse=True)[:3]
+            top_factors = heapq.nlargest(3, feature_importance.items(), key=lambda x: abs(x[1]))
             
             reasoning = self._generate_reasoning(action, confidence, top_factors)
             
@@ -1,15 +1,20 @@
 # src/services/sentiment_provider.py - Sentiment data aggregation
+import copy
+import heapq
 import json
 import logging
 import re
 import time
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
+from threading import Lock
 from typing import Dict, Optional, Any, List
 
 import requests
 
 from config.settings import settings
+from src.cache.memo_cache import LRUMemoCache
 from src.cache.persistent_cache import get_persistent_cache
 
 try:
@@ -21,10 +26,16 @@ except Exception:  # pragma: no cover - optional dependency guard
 class SentimentDataProvider:
     """Aggregate sentiment metrics from API or local files."""
 
-    def __init__(self, use_persistent_cache: bool = True):
+    def __init__(
+        self,
+        use_persistent_cache: bool = True,
+        session: Optional[requests.Session] = None,
+    ):
         self.logger = logging.getLogger(__name__)
         self.api_endpoint: Optional[str] = settings.SENTIMENT_DATA_API
         self.local_path = Path(settings.SENTIMENT_DATA_PATH) if settings.SENTIMENT_DATA_PATH else None
+        # Reuse one keep-alive session across calls (injectable for tests/callers)
+        self.session = session or requests.Session()
         self.timeout = settings.SENTIMENT_DATA_TIMEOUT
 
         # Use persistent cache instead of memory cache
@@ -41,6 +52,13 @@ class SentimentDataProvider:
         self.crawl_interval = 5.0  # seconds between crawls for same stock
         self.global_last_crawl = 0.0  # global rate limit
         self.global_crawl_interval = 2.0  # seconds between any crawls
+        self.max_crawl_wait = 0.5  # longest wait for a global slot before skipping
+        # Guards the timestamps above; callers crawl from worker threads
+        self._crawl_lock = Lock()
+
+        # In-process layer keyed by (stock_code, minute bucket) in front of
+        # the persistent cache
+        self._memo = LRUMemoCache(maxsize=512)
 
         if self.local_path:
             self._load_local_file(self.local_path)
@@ -78,7 +96,7 @@ class SentimentDataProvider:
         )
 
         try:
-            response = requests.get(url, timeout=self.timeout)
+            response = self.session.get(url, timeout=self.timeout)
             if response.status_code != 200:
                 self.logger.warning(
                     "Sentiment API returned %s for %s", response.status_code, stock_code
@@ -114,24 +132,22 @@ class SentimentDataProvider:
             else:
                 level = "neutral"
 
-        normalized_news = {
-            "score": news.get("score") if isinstance(news, dict) else news,
-            "article_count": news.get("article_count") if isinstance(news, dict) else None,
-        }
-        normalized_social = {
-            "score": social.get("score") if isinstance(social, dict) else social,
-            "mention_count": social.get("mention_count") if isinstance(social, dict) else None,
-        }
-
         return {
             "overall_sentiment": overall_value,
             "sentiment_level": level,
-            "news_sentiment": normalized_news,
-            "social_sentiment": normalized_social,
+            "news_sentiment": self._normalize_component(news, "article_count"),
+            "social_sentiment": self._normalize_component(social, "mention_count"),
             "source": source,
             "updated_at": payload.get("updated_at"),
         }
 
+    @staticmethod
+    def _normalize_component(value: Any, count_key: str) -> Dict[str, Any]:
+        """Normalize a news/social entry given either as a dict or a bare score"""
+        if isinstance(value, dict):
+            return {"score": value.get("score"), count_key: value.get(count_key)}
+        return {"score": value, count_key: None}
+
     def _fetch_simple_sentiment(self, stock_code: str) -> Optional[Dict[str, Any]]:
         """Generate sentiment based on technical indicators (simplified approach)
 
@@ -210,27 +226,37 @@ class SentimentDataProvider:
 
     def _should_rate_limit(self, stock_code: str) -> bool:
         """Check if we should rate limit this request"""
-        current_time = time.time()
-
-        # Check global rate limit (avoid hammering server)
-        if current_time - self.global_last_crawl < self.global_crawl_interval:
-            wait_time = self.global_crawl_interval - (current_time - self.global_last_crawl)
+        with self._crawl_lock:
+            current_time = time.time()
+
+            # Check per-stock rate limit
+            last_crawl = self.last_crawl_time.get(stock_code, 0)
+            if current_time - last_crawl < self.crawl_interval:
+                self.logger.info(f"Rate limiting {stock_code}, too soon since last crawl")
+                return True
+
+            # Reserve the next global slot (avoid hammering server). A slot
+            # further out than max_crawl_wait is not worth blocking a worker
+            # thread for; the caller falls back to derived sentiment instead.
+            slot = max(current_time, self.global_last_crawl + self.global_crawl_interval)
+            if slot - current_time > self.max_crawl_wait:
+                self.logger.debug(f"Global crawl slot busy, skipping crawl for {stock_code}")
+                return True
+            self.global_last_crawl = slot
+
+        wait_time = slot - current_time
+        if wait_time > 0:
             self.logger.debug(f"Global rate limit, waiting {wait_time:.1f}s")
             time.sleep(wait_time)
 
-        # Check per-stock rate limit
-        last_crawl = self.last_crawl_time.get(stock_code, 0)
-        if current_time - last_crawl < self.crawl_interval:
-            self.logger.info(f"Rate limiting {stock_code}, too soon since last crawl")
-            return True
-
         return False
 
     def _update_rate_limit(self, stock_code: str):
         """Update rate limit timestamps after successful crawl"""
-        current_time = time.time()
-        self.last_crawl_time[stock_code] = current_time
-        self.global_last_crawl = current_time
+        with self._crawl_lock:
+            current_time = time.time()
+            self.last_crawl_time[stock_code] = current_time
+            self.global_last_crawl = max(self.global_last_crawl, current_time)
 
     def _analyze_guba_sentiment(self, posts: List[Dict]) -> Dict[str, Any]:
         """Analyze sentiment from Guba post titles using keyword matching"""
@@ -303,7 +329,7 @@ class SentimentDataProvider:
             level = 'neutral'
 
         # Top keywords
-        top_keywords = sorted(keyword_counter.items(), key=lambda x: x[1], reverse=True)[:5]
+        top_keywords = heapq.nlargest(5, keyword_counter.items(), key=itemgetter(1))
         keywords = [kw for kw, _ in top_keywords]
 
         return {
@@ -335,7 +361,7 @@ class SentimentDataProvider:
             }
 
             # Fetch page with timeout
-            response = requests.get(url, headers=headers, timeout=self.timeout)
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
             if response.status_code != 200:
                 self.logger.warning(f"Guba returned status {response.status_code} for {stock_code}")
                 return None
@@ -408,7 +434,18 @@ class SentimentDataProvider:
 
     def get_sentiment_analysis(self, stock_code: str) -> Optional[Dict[str, Any]]:
         stock_code = stock_code.upper()
+        memo_key = (stock_code, int(time.time() // 60))
+        memoized = self._memo.get(memo_key)
+        if memoized is not None:
+            return copy.deepcopy(memoized)
+
+        data = self._load_sentiment_analysis(stock_code)
+        if data is not None:
+            self._memo.set(memo_key, data)
+            return copy.deepcopy(data)
+        return None
 
+    def _load_sentiment_analysis(self, stock_code: str) -> Optional[Dict[str, Any]]:
         # Use persistent cache
         if self.use_persistent_cache:
             cache_key = f"sentiment:{stock_code}"
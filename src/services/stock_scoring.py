@@ -0,0 +1,171 @@
+# src/services/stock_scoring.py - Rule-based multi-factor stock scoring
+"""Shared scoring rules for the command-line analysis scripts.
+
+Combines a trend/RSI/MACD technical score with optional fundamental and
+sentiment scores into a 0-10 final score and a 买入/持有/观望 recommendation.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+
+def _sign(a, b) -> int:
+    """Three-way comparison: 1 if a > b, -1 if a < b, 0 if equal"""
+    return (a > b) - (a < b)
+
+
+def _classify(price_vs_ma5: int, ma5_vs_ma20: int, above_ma20: bool) -> str:
+    if price_vs_ma5 == 1 and ma5_vs_ma20 == 1:
+        return "多头排列"
+    if price_vs_ma5 == -1 and ma5_vs_ma20 == -1:
+        return "空头排列"
+    return "震荡偏强" if above_ma20 else "震荡偏弱"
+
+
+# Trend label keyed by (sign(price-ma5), sign(ma5-ma20), price > ma20)
+TREND_LABELS = {
+    (s1, s2, above): _classify(s1, s2, above)
+    for s1 in (-1, 0, 1) for s2 in (-1, 0, 1) for above in (False, True)
+}
+
+# RSI threshold that selects the stronger score for each trend
+TREND_RSI_THRESHOLD = {"多头排列": 70, "空头排列": 30}
+
+# Base technical score keyed by (trend, rsi below the trend's threshold)
+TECH_SCORE = {
+    ("多头排列", True): 7.5,
+    ("多头排列", False): 6.5,
+    ("震荡偏强", False): 6.0,
+    ("震荡偏弱", False): 4.5,
+    ("空头排列", True): 3.0,
+    ("空头排列", False): 2.5,
+}
+
+# Technical score when the trend/RSI combination has no entry above
+NEUTRAL_TECH_SCORE = 5.0
+
+# (minimum final score, recommendation, risk level), highest first
+RECOMMENDATION_LEVELS = (
+    (7.0, "买入", "低风险"),
+    (5.0, "持有", "中等风险"),
+    (float("-inf"), "观望", "高风险"),
+)
+
+
+@dataclass
+class ScoreResult:
+    """Outcome of score_stock"""
+    trend: str
+    tech_score: float
+    fund_score: Optional[float]
+    sentiment_score: Optional[float]
+    final_score: float
+    recommendation: str
+    risk_level: str
+
+
+def classify_trend(price: Optional[float], ma5: Optional[float], ma20: Optional[float]) -> str:
+    """Classify MA alignment; "中性" when any input is missing"""
+    if price and ma5 and ma20:
+        return TREND_LABELS[(_sign(price, ma5), _sign(ma5, ma20), price > ma20)]
+    return "中性"
+
+
+def technical_score(trend: str, rsi: Optional[float], macd: Optional[float],
+                    macd_signal: Optional[float]) -> float:
+    """Base score from trend/RSI, adjusted ±0.5 by MACD confirmation"""
+    threshold = TREND_RSI_THRESHOLD.get(trend)
+    rsi_below = bool(rsi) and threshold is not None and rsi < threshold
+    score = TECH_SCORE.get((trend, rsi_below), NEUTRAL_TECH_SCORE)
+
+    if macd and macd_signal:
+        if macd > macd_signal and macd > 0:
+            score += 0.5
+        elif macd < macd_signal and macd < 0:
+            score -= 0.5
+    return round(score, 1)
+
+
+def fundamental_score(fundamentals: Optional[Dict[str, Any]]) -> Optional[float]:
+    """Score valuation/profitability/growth; None when data is missing or degraded"""
+    if not fundamentals or fundamentals.get('degraded'):
+        return None
+    score = 5.0
+    valuation = fundamentals.get('valuation', {})
+    profitability = fundamentals.get('profitability', {})
+    growth = fundamentals.get('growth', {})
+
+    pe = valuation.get('pe_ratio')
+    if pe:
+        if pe <= 15:
+            score += 1.0
+        elif pe >= 40:
+            score -= 1.0
+
+    roe = profitability.get('roe')
+    if roe:
+        score += max(-1.5, min(1.5, (roe - 0.1) * 30))
+
+    revenue_growth = growth.get('revenue_growth')
+    if revenue_growth:
+        score += max(-1.0, min(1.5, revenue_growth * 10))
+
+    return round(min(max(score, 0.0), 10.0), 1)
+
+
+def sentiment_score(sentiment: Optional[Dict[str, Any]]) -> Optional[float]:
+    """Scale overall sentiment (0-1) to 0-10; None when missing or degraded"""
+    if not sentiment or sentiment.get('degraded'):
+        return None
+    overall = sentiment.get('overall_sentiment')
+    return round(overall * 10, 1) if overall else 5.0
+
+
+def recommend(final_score: float):
+    """Map a final score to (recommendation, risk level)"""
+    for minimum, action, risk in RECOMMENDATION_LEVELS:
+        if final_score >= minimum:
+            return action, risk
+    return RECOMMENDATION_LEVELS[-1][1:]
+
+
+def score_stock(price: Optional[float], indicators: Optional[Dict[str, Any]],
+                fundamentals: Optional[Dict[str, Any]] = None,
+                sentiment: Optional[Dict[str, Any]] = None) -> ScoreResult:
+    """Combine technical, fundamental and sentiment scores for one stock
+
+    Args:
+        price: Current price used for the MA alignment check
+        indicators: Output of compute_indicators (may be empty/None)
+        fundamentals: Fundamental provider payload
+        sentiment: Sentiment provider payload
+    """
+    indicators = indicators or {}
+    trend = classify_trend(price, indicators.get('ma5'), indicators.get('ma20'))
+    if price:
+        tech = technical_score(
+            trend, indicators.get('rsi14'), indicators.get('macd'), indicators.get('macd_signal')
+        )
+    else:
+        # No price means no technical read at all, MACD included
+        tech = NEUTRAL_TECH_SCORE
+    fund = fundamental_score(fundamentals)
+    sent = sentiment_score(sentiment)
+
+    scores = [tech]
+    if fund is not None:
+        scores.append(fund)
+    if sent is not None:
+        scores.append(sent)
+    final = sum(scores) / len(scores)
+    # Thresholds apply to the unrounded average; the rounded value is for display
+    action, risk = recommend(final)
+
+    return ScoreResult(
+        trend=trend,
+        tech_score=tech,
+        fund_score=fund,
+        sentiment_score=sent,
+        final_score=round(final, 1),
+        recommendation=action,
+        risk_level=risk,
+    )
@@ -3,6 +3,7 @@ import logging
 import statistics
 from collections import defaultdict, deque
 from datetime import date, timedelta
+from operator import itemgetter
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
@@ -411,7 +412,7 @@ class HS300EtfRotation(Strategy):
 
             ranked.append((symbol, score))
 
-        ranked.sort(key=lambda item: item[1], reverse=True)
+        ranked.sort(key=itemgetter(1), reverse=True)
         return ranked
 
     def _momentum(self, symbol: str) -> Optional[float]:
@@ -0,0 +1,25 @@
+# src/utils/async_runner.py - Event loop runner for CLI entry points
+"""Run a coroutine on uvloop when it is installed, else on the default loop.
+
+Command-line scripts call ``run(main())`` in place of ``asyncio.run(main())``.
+The libuv-based loop lowers per-await overhead for the I/O-bound fan-outs.
+Behaviour is otherwise identical.
+"""
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    logger.debug("uvloop not available. Using the default asyncio event loop.")
+    UVLOOP_AVAILABLE = False
+
+
+def run(main, *, debug=None):
+    """Drop-in replacement for asyncio.run that prefers uvloop"""
+    if UVLOOP_AVAILABLE:
+        return uvloop.run(main, debug=debug)
+    return asyncio.run(main, debug=debug)
@@ -0,0 +1,93 @@
+# src/utils/indicator_kernels.py - Compiled loops behind compute_indicators
+"""EMA/RSI/ATR/OBV loops used by ``src.api.stock_api.compute_indicators`` and
+the analyzers in ``src.core.technical_analysis``.
+
+The plain-Python definitions are compiled one of two ways:
+
+* ahead of time by ``build_aot.py`` into the ``src.utils.stock_indicators``
+  extension module, which imports without any JIT warmup, or
+* with Numba ``njit`` (cached on disk) when that module has not been built.
+
+With neither available the plain-Python loops are used as-is.
+"""
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Explicit signatures shared by the AOT build and the JIT fallback
+EMA_SIGNATURE = "float64[:](float64[:], float64)"
+RSI_SIGNATURE = "float64(float64[:], int64)"
+TRUE_RANGE_SIGNATURE = "float64[:](float64[:], float64[:], float64[:])"
+OBV_SIGNATURE = "float64(float64[:], float64[:])"
+
+
+def ema_loop_py(values, alpha):
+    """EMA recurrence matching pandas ewm(adjust=False) for smoothing factor alpha."""
+    out = np.empty_like(values)
+    acc = values[0]
+    out[0] = acc
+    for i in range(1, values.shape[0]):
+        acc = alpha * values[i] + (1.0 - alpha) * acc
+        out[i] = acc
+    return out
+
+
+def rsi_loop_py(close, period):
+    """RSI of the trailing window using simple-average gains/losses.
+    Returns NaN when the window has no losses.
+    """
+    n = close.shape[0]
+    gain = 0.0
+    loss = 0.0
+    for i in range(n - period, n):
+        delta = close[i] - close[i - 1]
+        if delta > 0.0:
+            gain += delta
+        else:
+            loss -= delta
+    if loss <= 0.0:
+        return np.nan
+    return 100.0 - 100.0 / (1.0 + gain / loss)
+
+
+def true_range_loop_py(high, low, close):
+    """True range for bars 1..n-1 (one shorter than the inputs)."""
+    n = close.shape[0]
+    out = np.empty(max(n - 1, 0))
+    for i in range(1, n):
+        tr = high[i] - low[i]
+        up = abs(high[i] - close[i - 1])
+        down = abs(low[i] - close[i - 1])
+        if up > tr:
+            tr = up
+        if down > tr:
+            tr = down
+        out[i - 1] = tr
+    return out
+
+
+def obv_loop_py(close, volume):
+    """Final on-balance volume; unchanged closes leave OBV untouched."""
+    obv = 0.0
+    for i in range(1, close.shape[0]):
+        if close[i] > close[i - 1]:
+            obv += volume[i]
+        elif close[i] < close[i - 1]:
+            obv -= volume[i]
+    return obv
+
+
+try:
+    from src.utils.stock_indicators import ema_loop, obv_loop, rsi_loop, true_range_loop
+    AOT_AVAILABLE = True
+except ImportError:
+    logger.debug("AOT indicator module not built. Using JIT kernels.")
+    AOT_AVAILABLE = False
+    # Only pay for importing Numba when the AOT module is missing
+    from src.utils.numba_compat import njit
+    ema_loop = njit(EMA_SIGNATURE, cache=True)(ema_loop_py)
+    rsi_loop = njit(RSI_SIGNATURE, cache=True)(rsi_loop_py)
+    true_range_loop = njit(TRUE_RANGE_SIGNATURE, cache=True)(true_range_loop_py)
+    obv_loop = njit(OBV_SIGNATURE, cache=True)(obv_loop_py)
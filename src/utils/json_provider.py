@@ -0,0 +1,56 @@
+# src/utils/json_provider.py - Optional orjson-backed Flask JSON provider
+"""Serialize API responses with orjson when it is installed.
+
+``examples/demo_app.py`` installs :class:`OrjsonProvider` as ``app.json``, so
+every ``jsonify(...)`` call in the demo routes picks it up unchanged. Output
+matches Flask's default provider (sorted keys, HTTP dates, Decimal/UUID as
+strings, pretty-printed in debug) with two deliberate differences: non-ASCII
+text is emitted as UTF-8 instead of ``\\u`` escapes, and NumPy arrays/scalars
+serialize natively. NaN/Infinity become ``null``, which is valid JSON.
+"""
+import logging
+
+from flask.json.provider import DefaultJSONProvider
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    logger.debug("orjson not available. Using Flask's default JSON provider.")
+    ORJSON_AVAILABLE = False
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes with orjson in a single C pass"""
+
+    def _options(self, indent: bool = False) -> int:
+        option = (
+            orjson.OPT_SERIALIZE_NUMPY
+            | orjson.OPT_NON_STR_KEYS
+            # Keep Flask's HTTP-date format for datetimes via the default hook
+            | orjson.OPT_PASSTHROUGH_DATETIME
+        )
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs) -> str:
+        # Callers asking for stdlib-specific options (cls, indent, ...) keep them
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._options()).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        body = orjson.dumps(obj, default=self.default, option=self._options(indent))
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
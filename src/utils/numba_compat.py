@@ -0,0 +1,25 @@
+# src/utils/numba_compat.py - Optional Numba JIT support
+"""Expose ``njit`` whether or not Numba is installed.
+
+When Numba is missing, ``njit`` becomes a no-op decorator so kernels written
+for nopython mode still run as plain Python/NumPy code.
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    logger.debug("Numba not available. JIT kernels run as plain Python.")
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit supporting both decorator forms"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
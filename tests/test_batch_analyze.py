@@ -0,0 +1,29 @@
+"""Tests for streaming batch stock analysis"""
+import asyncio
+
+import pytest
+
+from src.core import analyzer_factory
+from src.core.analyzer_factory import batch_analyze_stocks
+
+
+@pytest.mark.asyncio
+async def test_batch_analyze_streams_results_and_keeps_input_order(monkeypatch):
+    """Test callbacks fire in completion order while the result keeps input order"""
+    delays = {'SLOW': 0.2, 'FAST': 0.0, 'BAD': 0.1}
+
+    async def fake_analyze(symbol):
+        await asyncio.sleep(delays[symbol])
+        if symbol == 'BAD':
+            raise RuntimeError('boom')
+        return {'symbol': symbol}
+
+    monkeypatch.setattr(analyzer_factory.StockAnalyzerFactory, 'analyze_stock', staticmethod(fake_analyze))
+
+    seen = []
+    results = await batch_analyze_stocks(['SLOW', 'FAST', 'BAD'], on_result=lambda s, r: seen.append(s))
+
+    assert seen == ['FAST', 'BAD', 'SLOW']
+    assert list(results) == ['SLOW', 'FAST', 'BAD']
+    assert results['BAD'] == {'error': 'boom'}
+    assert results['FAST'] == {'symbol': 'FAST'}
@@ -0,0 +1,41 @@
+"""Tests for core data source manager probing"""
+import asyncio
+import time
+
+import pytest
+
+from src.core.data_sources import DataSourceException, DataSourceManager
+
+
+class _FakeSource:
+    def __init__(self, delay=0.0, quote=None, error=None):
+        self.delay = delay
+        self.quote = quote
+        self.error = error
+
+    async def fetch_quote(self, symbol, config):
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.quote
+
+
+@pytest.mark.asyncio
+async def test_probe_sources_runs_concurrently_and_keeps_order():
+    """Test probes run in parallel, are bounded by timeout and keep input order"""
+    manager = DataSourceManager()
+    manager.sources = {
+        'ok': _FakeSource(delay=0.2, quote='quote'),
+        'down': _FakeSource(delay=0.2, error=DataSourceException('down')),
+        'hung': _FakeSource(delay=5.0, quote='late'),
+    }
+
+    start = time.perf_counter()
+    results = await manager.probe_sources('601127.SH', {}, ['ok', 'down', 'hung'], timeout=0.5)
+    elapsed = time.perf_counter() - start
+
+    assert [name for name, _, _ in results] == ['ok', 'down', 'hung']
+    assert results[0][1:] == ('quote', None)
+    assert isinstance(results[1][2], DataSourceException)
+    assert isinstance(results[2][2], asyncio.TimeoutError)
+    assert elapsed < 1.0
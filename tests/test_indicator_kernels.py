@@ -0,0 +1,60 @@
+"""Tests for compiled indicator kernels"""
+import numpy as np
+import pandas as pd
+
+from src.utils.indicator_kernels import (
+    ema_loop,
+    ema_loop_py,
+    obv_loop,
+    obv_loop_py,
+    rsi_loop,
+    rsi_loop_py,
+    true_range_loop,
+    true_range_loop_py,
+)
+
+
+def _prices(n=120):
+    return np.cumsum(np.random.default_rng(7).normal(size=n)) + 50.0
+
+
+def test_ema_loop_matches_pandas():
+    """Test EMA recurrence against pandas ewm(adjust=False)"""
+    close = _prices()
+    expected = pd.Series(close).ewm(span=12, adjust=False).mean().to_numpy()
+
+    np.testing.assert_allclose(ema_loop(close, 2.0 / 13.0), expected)
+    np.testing.assert_allclose(ema_loop_py(close, 2.0 / 13.0), expected)
+
+
+def test_rsi_loop_matches_python():
+    """Test compiled RSI against the plain-Python loop"""
+    close = _prices()
+    assert rsi_loop(close, 14) == rsi_loop_py(close, 14)
+
+
+def test_rsi_loop_without_losses_is_nan():
+    """Test RSI is NaN when the window has no losses"""
+    close = np.arange(1.0, 31.0)
+    assert np.isnan(rsi_loop(close, 14))
+
+
+def test_true_range_loop_matches_python():
+    """Test compiled true range against the plain-Python loop"""
+    close = _prices()
+    high, low = close + 1.5, close - 1.0
+    expected = np.maximum.reduce([
+        high[1:] - low[1:],
+        np.abs(high[1:] - close[:-1]),
+        np.abs(low[1:] - close[:-1]),
+    ])
+
+    np.testing.assert_allclose(true_range_loop(high, low, close), expected)
+    np.testing.assert_allclose(true_range_loop_py(high, low, close), expected)
+
+
+def test_obv_loop_ignores_flat_closes():
+    """Test OBV adds on up-closes, subtracts on down-closes, skips flat ones"""
+    close = np.array([10.0, 11.0, 11.0, 10.5, 12.0])
+    volume = np.array([1.0, 2.0, 4.0, 8.0, 16.0])
+    assert obv_loop(close, volume) == obv_loop_py(close, volume) == 10.0
@@ -0,0 +1,53 @@
+"""Tests for the orjson Flask JSON provider"""
+import datetime
+import decimal
+import json
+
+import numpy as np
+import pytest
+from flask import Flask, jsonify
+
+from src.utils.json_provider import ORJSON_AVAILABLE, OrjsonProvider
+
+pytestmark = pytest.mark.skipif(not ORJSON_AVAILABLE, reason="orjson not installed")
+
+
+def _payload():
+    return {
+        'name': '紫金矿业',
+        'close': 12.34,
+        'volume': 1200,
+        'date': datetime.datetime(2024, 1, 2, 15, 0),
+        'amount': decimal.Decimal('1.50'),
+        'ok': True,
+        'missing': None,
+        'history': [{'b': 2, 'a': 1}],
+    }
+
+
+def test_orjson_response_matches_default_provider():
+    """Test jsonify output decodes to the same value as Flask's default provider"""
+    default_app = Flask('default')
+    orjson_app = Flask('orjson')
+    orjson_app.json = OrjsonProvider(orjson_app)
+
+    with default_app.app_context():
+        expected = jsonify(_payload())
+    with orjson_app.app_context():
+        actual = jsonify(_payload())
+
+    assert actual.mimetype == 'application/json'
+    assert json.loads(actual.get_data()) == json.loads(expected.get_data())
+    # Keys stay sorted like the default provider
+    assert actual.get_data().index(b'"amount"') < actual.get_data().index(b'"close"')
+
+
+def test_orjson_provider_serializes_numpy():
+    """Test NumPy arrays and scalars serialize without conversion"""
+    app = Flask('numpy')
+    app.json = OrjsonProvider(app)
+
+    with app.app_context():
+        data = json.loads(jsonify(prices=np.array([1.5, 2.5]), count=np.int64(2)).get_data())
+
+    assert data == {'count': 2, 'prices': [1.5, 2.5]}
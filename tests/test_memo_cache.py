@@ -0,0 +1,31 @@
+"""Tests for in-process LRU memo cache"""
+import pytest
+from src.cache.memo_cache import LRUMemoCache
+
+
+def test_memo_cache_tuple_keys():
+    """Test in-process memo layer keyed by (stock_code, bucket)"""
+    memo = LRUMemoCache(maxsize=4)
+    memo.set(("600036.SH", "2024-01-02"), {"pe": 8.5})
+
+    assert memo.get(("600036.SH", "2024-01-02")) == {"pe": 8.5}
+    # A new bucket is a different key
+    assert memo.get(("600036.SH", "2024-01-03")) is None
+
+
+def test_memo_cache_lru_eviction():
+    """Test least recently used entry is evicted when full"""
+    memo = LRUMemoCache(maxsize=2)
+    memo.set("a", 1)
+    memo.set("b", 2)
+    memo.get("a")  # "b" becomes least recently used
+    memo.set("c", 3)
+
+    assert len(memo) == 2
+    assert memo.get("b") is None
+    assert memo.get("a") == 1
+    assert memo.get("c") == 3
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
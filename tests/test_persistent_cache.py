@@ -1,5 +1,6 @@
 """Tests for persistent cache manager"""
 import pytest
+import sqlite3
 import time
 import json
 from pathlib import Path
@@ -46,6 +47,20 @@ def test_cache_expiration(cache_manager):
     assert cache_manager.get(key) is None
 
 
+def test_cache_expiration_with_injected_clock(tmp_path):
+    """Test TTL expiry is driven by the injected clock"""
+    now = [1_700_000_000.0]
+    manager = PersistentCacheManager(str(tmp_path / "clock_cache.db"), clock=lambda: now[0])
+
+    manager.set("test:clock", {"data": 1}, ttl=2)
+    now[0] += 1.5
+    assert manager.get("test:clock") == {"data": 1}
+
+    now[0] += 1.0
+    assert manager.get("test:clock") is None
+    assert manager.get_stats()['total_entries'] == 0
+
+
 def test_cache_miss(cache_manager):
     """Test cache miss returns None"""
     result = cache_manager.get("nonexistent:key")
@@ -65,6 +80,19 @@ def test_cache_update(cache_manager):
     assert cache_manager.get(key) == value2
 
 
+def test_cache_set_many(cache_manager):
+    """Test batch set stores every entry with shared metadata"""
+    cache_manager.set("fund:600036.SH", {"pe": 1.0}, ttl=60)
+    cache_manager.set_many({
+        "fund:600036.SH": {"pe": 5.5},
+        "fund:000977.SZ": {"pe": 45.2},
+    }, ttl=60, data_type="fundamental")
+
+    assert cache_manager.get("fund:600036.SH") == {"pe": 5.5}
+    assert cache_manager.get("fund:000977.SZ") == {"pe": 45.2}
+    assert cache_manager.get_stats()['by_type'] == {"fundamental": 2}
+
+
 def test_cache_delete(cache_manager):
     """Test deleting cache entries"""
     key = "test:delete"
@@ -220,6 +248,40 @@ def test_complex_value_serialization(cache_manager):
     assert result == value
 
 
+def test_numpy_values_and_legacy_rows(cache_manager):
+    """Test NumPy scalars serialize and stdlib-json rows still load"""
+    pytest.importorskip("orjson")
+    np = pytest.importorskip("numpy")
+    cache_manager.set("test:numpy", {"pe": np.float64(8.5), "volume": np.int64(100)}, ttl=60)
+    assert cache_manager.get("test:numpy") == {"pe": 8.5, "volume": 100}
+
+    # Rows written by stdlib json may contain NaN, which orjson rejects
+    now = int(time.time())
+    with sqlite3.connect(cache_manager.db_path) as conn:
+        conn.execute(
+            "INSERT INTO cache_store (cache_key, cache_value, created_at, expires_at) VALUES (?, ?, ?, ?)",
+            ("test:legacy", json.dumps({"pe": float("nan"), "name": "招商银行"}, ensure_ascii=False), now, now + 60)
+        )
+    result = cache_manager.get("test:legacy")
+    assert result["name"] == "招商银行"
+    assert result["pe"] != result["pe"]
+
+
+def test_non_finite_values_round_trip(cache_manager):
+    """Test NaN/Infinity survive a set/get instead of becoming None"""
+    np = pytest.importorskip("numpy")
+    cache_manager.set(
+        "test:nan",
+        {"pe": float("nan"), "pb": np.float64("inf"), "history": [1.5, float("-inf")]},
+        ttl=60
+    )
+    result = cache_manager.get("test:nan")
+
+    assert result["pe"] != result["pe"]
+    assert result["pb"] == float("inf")
+    assert result["history"] == [1.5, float("-inf")]
+
+
 def test_clear_all(cache_manager):
     """Test clearing all cache entries"""
     cache_manager.set("test:1", {"data": 1}, ttl=60)
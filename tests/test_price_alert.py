@@ -0,0 +1,32 @@
+"""Tests for price alert manager wakeups"""
+import asyncio
+
+import pytest
+
+from src.monitoring.price_alert import AlertManager
+
+
+@pytest.mark.asyncio
+async def test_wait_for_new_alert_times_out():
+    """Test waiting without new alerts returns False after the timeout"""
+    manager = AlertManager()
+    assert await manager.wait_for_new_alert(0.05) is False
+
+
+@pytest.mark.asyncio
+async def test_wait_for_new_alert_wakes_on_create():
+    """Test creating an alert wakes a pending or later waiter immediately"""
+    manager = AlertManager()
+
+    async def add_alert():
+        await asyncio.sleep(0.01)
+        manager.create_price_target_alert("600036.SH", 40.0, "above")
+
+    task = asyncio.ensure_future(add_alert())
+    assert await manager.wait_for_new_alert(5) is True
+    await task
+
+    # Created between two waits: the next wait returns at once
+    manager.create_price_target_alert("600036.SH", 45.0, "above")
+    assert await asyncio.wait_for(manager.wait_for_new_alert(5), 1) is True
+    assert await manager.wait_for_new_alert(0.01) is False
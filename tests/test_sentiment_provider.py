@@ -0,0 +1,51 @@
+"""Tests for sentiment provider crawl throttling"""
+import threading
+import time
+
+import pytest
+
+from src.services.sentiment_provider import SentimentDataProvider
+
+
+@pytest.fixture
+def provider():
+    """Provider with the in-memory cache so tests don't touch cache.db"""
+    return SentimentDataProvider(use_persistent_cache=False)
+
+
+def test_concurrent_callers_do_not_queue_on_global_slot(provider):
+    """Test N concurrent callers finish quickly instead of chaining 2s slots"""
+    callers = 12
+    allowed = []
+    barrier = threading.Barrier(callers)
+
+    def worker(i):
+        barrier.wait()
+        if not provider._should_rate_limit(f"60000{i}.SH"):
+            allowed.append(i)
+
+    start = time.time()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(callers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.time() - start
+
+    # One caller takes the free slot; the rest skip rather than sleep
+    assert len(allowed) == 1
+    assert elapsed < provider.max_crawl_wait + 0.5
+
+
+def test_near_slot_is_waited_for(provider):
+    """Test a slot within max_crawl_wait is still reserved and waited for"""
+    provider.global_crawl_interval = 0.2
+
+    assert provider._should_rate_limit("600001.SH") is False
+    start = time.time()
+    assert provider._should_rate_limit("600002.SH") is False
+    assert time.time() - start >= 0.15
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
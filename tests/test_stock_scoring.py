@@ -0,0 +1,61 @@
+"""Tests for shared stock scoring rules"""
+from src.services.stock_scoring import classify_trend, score_stock
+
+
+def test_classify_trend():
+    """Test MA alignment labels"""
+    assert classify_trend(11.0, 10.5, 10.0) == "多头排列"
+    assert classify_trend(9.0, 9.5, 10.0) == "空头排列"
+    assert classify_trend(10.5, 11.0, 10.0) == "震荡偏强"
+    assert classify_trend(9.5, 9.0, 10.0) == "震荡偏弱"
+    assert classify_trend(None, 10.0, 10.0) == "中性"
+
+
+def test_score_stock_technical_only():
+    """Test that missing/degraded providers fall back to the technical score"""
+    indicators = {'ma5': 10.5, 'ma20': 10.0, 'rsi14': 50.0, 'macd': 0.2, 'macd_signal': 0.1}
+    result = score_stock(11.0, indicators, {'degraded': True}, None)
+
+    assert result.trend == "多头排列"
+    assert result.tech_score == 8.0
+    assert result.fund_score is None
+    assert result.sentiment_score is None
+    assert result.final_score == 8.0
+    assert result.recommendation == "买入"
+    assert result.risk_level == "低风险"
+
+
+def test_score_stock_combined():
+    """Test averaging of technical, fundamental and sentiment scores"""
+    fundamentals = {
+        'valuation': {'pe_ratio': 50.0},
+        'profitability': {'roe': 0.05},
+        'growth': {'revenue_growth': -0.2},
+    }
+    result = score_stock(None, {}, fundamentals, {'overall_sentiment': 0.3})
+
+    assert result.tech_score == 5.0
+    assert result.fund_score == 1.5
+    assert result.sentiment_score == 3.0
+    assert result.final_score == 3.2
+    assert result.recommendation == "观望"
+
+
+def test_recommendation_uses_unrounded_final_score():
+    """Test a 6.97 average displays as 7.0 but stays below the 买入 threshold"""
+    indicators = {'ma5': 10.5, 'ma20': 10.0, 'rsi14': 50.0}
+    fundamentals = {'valuation': {'pe_ratio': 10.0}, 'profitability': {'roe': 0.113}}
+    result = score_stock(11.0, indicators, fundamentals, {'overall_sentiment': 0.7})
+
+    assert (result.tech_score, result.fund_score, result.sentiment_score) == (7.5, 6.4, 7.0)
+    assert result.final_score == 7.0
+    assert result.recommendation == "持有"
+    assert result.risk_level == "中等风险"
+
+
+def test_macd_ignored_without_price():
+    """Test MACD does not move the technical score when the price is missing"""
+    indicators = {'ma5': 10.5, 'ma20': 10.0, 'macd': 0.2, 'macd_signal': 0.1}
+
+    assert score_stock(None, indicators).tech_score == 5.0
+    assert score_stock(10.2, {'macd': 0.2, 'macd_signal': 0.1}).tech_score == 5.5